@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+AMI SCENARIO ENGINE - Many-variant compliance scenario search over one building
+Python port of the AMI calculator's generateComplianceScenarios / generateOptimalScenario /
+checkAllCompliance (fixed_local_gemini_ami_calculator.html). The calculator tries its four
+strategies once each; this runs every strategy under many seeds across a process pool and
+keeps the best N compliant scenarios:
+  * seed 0 is the calculator's own candidate order; other seeds shuffle the units before
+    the strategy sort, so equal-size units (stacked lines) are taken in a different order
+    and the selection lands on other floors and layouts at the same overage. Seeds only
+    diversify when units share a size: on a rent roll where every size is distinct each
+    strategy picks the same units under every seed (64 variants gave 4 unique scenarios)
+  * the selection target is rounded up to the next 0.1 sf: the calculator rounds it down,
+    which can pick units just under the target that the SF rule then throws away
+  * scenarios over the SF rule (total below target, or more than 15% above) are dropped
+    and duplicate unit sets are evaluated once
+  * compliance is computed for a whole batch of scenarios at a time as NumPy matrix
+    products over unit attributes (bedroom, floor, balcony, unit id one-hots) instead of
+    per-unit some() scans; without NumPy the same checks run per scenario in Python
+NumPy is optional: the pure-Python checks give the same scenarios, only slower.
+
+Requirements use the calculator's ACTION_CALCULATE keys:
+    {"targetSF": 2043.3, "amiLow": 40, "amiAverage": 60, "requiredFloors": [5, 6],
+     "excludedFloors": [], "preferredFloors": [], "bedroomTest": "A", "sizeTest": "B",
+     "customRules": ["focus 2br on lower floors"]}
+
+Usage:
+    python AMI_SCENARIO_ENGINE.py rent_roll.csv --target-sf 2043.3 [--ami-low 40] [--seeds 32] [--top 4]
+    python AMI_SCENARIO_ENGINE.py rent_roll.xlsx --requirements requirements.json [--workers 8]
+"""
+
+import argparse
+import concurrent.futures
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+from AMI_UNIT_SELECTION_ENGINE import (SCALE, assign_ami_levels, calculate_ami_distribution, load_rent_roll,
+                                       scaled_sf, select_indices)
+
+try:
+    import numpy as np  # Optional: batched compliance checks
+except ImportError:
+    np = None
+
+STRATEGIES = {
+    "precise_sf": ("Precise SF Strategy", "Minimal overage, closest to target"),
+    "preserve_large": ("Preserve Large Units", "Small units for affordable"),
+    "balanced": ("Balanced Distribution", "Even across floors/beds"),
+    "cost_optimized": ("Cost Optimized", "Prefer less desirable/smaller units for developer economics"),
+}
+
+MIN_SIZES = {0: 400, 1: 575, 2: 775, 3: 950, 4: 1150}
+MAX_OVERAGE = 0.15          # scenario SF rule: at most 15% over the target
+FLOOR_AREA_EXCESS = 50      # floor area check: at most 50 sf over the target
+CHECKS = ("floorArea", "bedroom", "unitSizes", "verticalDistribution", "horizontalDistribution",
+          "balconyDistribution")
+
+def min_size(bed):
+    """MIN_SIZES[bed] || MIN_SIZES[4]"""
+    return MIN_SIZES.get(bed) or MIN_SIZES[4]
+
+def normalize_requirements(requirements):
+    """Calculator requirements with its defaults filled in; raises ValueError without a positive targetSF"""
+    if not requirements.get("targetSF") or requirements["targetSF"] <= 0:
+        raise ValueError("requirements need a positive targetSF")
+    return dict({"amiLow": None, "amiAverage": 60, "requiredFloors": [], "excludedFloors": [],
+                 "preferredFloors": [], "bedroomTest": "A", "sizeTest": "B", "customRules": []},
+                **{key: value for key, value in requirements.items() if value is not None})
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+def parse_custom_rules(rules):
+    """parseCustomRules: the free-text rules the selection understands"""
+    constraints = {"focus2BRlower": False, "evenBalconies": False}
+    for rule in rules:
+        lower_rule = rule.lower()
+        if 'focus 2br' in lower_rule and 'lower' in lower_rule:
+            constraints["focus2BRlower"] = True
+        if 'distribute balconies' in lower_rule or 'even balconies' in lower_rule:
+            constraints["evenBalconies"] = True
+    return constraints
+
+def apply_constraints(units, order, requirements, constraints):
+    """applyConstraints: drop excluded floors, preferred floors first, 2BR+ on lower floors first"""
+    preferred = set(requirements["preferredFloors"])
+    excluded = set(requirements["excludedFloors"])
+
+    def score(index):
+        unit = units[index]
+        value = -100 if unit["floor"] in preferred else 0
+        if constraints["focus2BRlower"] and unit["bed"] >= 2:
+            value += unit["floor"] * 10
+        return value
+
+    return sorted((index for index in order if units[index]["floor"] not in excluded), key=score)
+
+def strategy_order(units, candidates, strategy):
+    """selectCompliantUnits' sort; ties keep the candidate order (the calculator's tempIndex)"""
+    if strategy == "preserve_large":
+        key = lambda index: (units[index]["bed"], units[index]["sf"])
+    elif strategy == "balanced":
+        key = lambda index: (units[index]["floor"], units[index]["bed"], units[index]["sf"])
+    elif strategy == "cost_optimized":
+        key = lambda index: (-units[index]["sf"], -units[index]["floor"])
+    else:
+        key = lambda index: units[index]["sf"]
+    return sorted(candidates, key=key)
+
+def ensure_required_floors(units, selected, candidates, requirements):
+    """ensureRequiredFloors: add the first candidate on each required floor the selection missed"""
+    selected_floors = {units[index]["floor"] for index in selected}
+    for floor in requirements["requiredFloors"]:
+        if floor not in selected_floors:
+            chosen = set(selected)
+            index = next((index for index in candidates if units[index]["floor"] == floor and index not in chosen), None)
+            if index is not None:
+                selected.append(index)
+    return selected
+
+def generate_scenario(units, requirements, strategy, seed=0):
+    """generateOptimalScenario without the compliance checks: the selected unit indices and copies"""
+    constraints = parse_custom_rules(requirements["customRules"])
+    order = list(range(len(units)))
+    if seed:
+        random.Random(seed).shuffle(order)
+    candidates = strategy_order(units, apply_constraints(units, order, requirements, constraints), strategy)
+    target = math.ceil(requirements["targetSF"] * SCALE)
+    picked = select_indices([scaled_sf(units[index]["sf"]) for index in candidates], target)
+    selected = ensure_required_floors(units, [candidates[position] for position in picked], candidates, requirements)
+    distribution = calculate_ami_distribution(requirements["amiLow"], requirements["amiAverage"])
+    return {
+        "strategy": strategy,
+        "seed": seed,
+        "indices": selected,
+        "units": assign_ami_levels([units[index] for index in selected], distribution, requirements["targetSF"]),
+        "total_sf": sum(units[index]["sf"] for index in selected),
+    }
+
+def within_sf_rule(total_sf, target_sf):
+    """generateComplianceScenarios' filter: at or above target, at most 15% over"""
+    return total_sf >= target_sf and (total_sf - target_sf) / target_sf <= MAX_OVERAGE
+
+def ami_breakdown(units):
+    """calculateAMIBreakdown: unit count and SF per AMI level"""
+    breakdown = {}
+    for unit in units:
+        entry = breakdown.setdefault(unit["amiLevel"], {"count": 0, "totalSF": 0})
+        entry["count"] += 1
+        entry["totalSF"] += unit["sf"]
+    return breakdown
+
+# ============================================================================
+# COMPLIANCE
+# ============================================================================
+
+def check_compliance(units, indices, total_sf, requirements):
+    """checkAllCompliance for one scenario, as {check: passes}"""
+    affordable = [units[index] for index in indices]
+    affordable_ids = {unit["unit"] for unit in affordable}
+    free_market = [unit for unit in units if unit["unit"] not in affordable_ids]
+    target_sf = requirements["targetSF"]
+
+    aff_beds, fm_beds = Counter(u["bed"] for u in affordable), Counter(u["bed"] for u in free_market)
+    aff_total, fm_total = len(affordable), len(free_market)
+    if requirements["bedroomTest"] == "A":
+        bedroom = all(aff_total and fm_total and abs(aff_beds[bed] / aff_total - fm_beds[bed] / fm_total) * 100 <= 1
+                      for bed in set(aff_beds) | set(fm_beds))
+    else:
+        two_plus = sum(count for bed, count in aff_beds.items() if bed >= 2)
+        bedroom = bool(aff_total) and aff_beds[0] / aff_total * 100 <= 25 and two_plus / aff_total * 100 >= 50
+
+    aff_sizes, fm_sizes = {}, {}
+    for unit in affordable:
+        aff_sizes.setdefault(unit["bed"], []).append(unit["sf"])
+    for unit in free_market:
+        fm_sizes.setdefault(unit["bed"], []).append(unit["sf"])
+    if requirements["sizeTest"] == "A":
+        sizes = all(unit["sf"] >= min_size(unit["bed"]) for unit in affordable)
+    elif requirements["sizeTest"] == "B":
+        sizes = all(sum(sf) / len(sf) >= min_size(bed) for bed, sf in aff_sizes.items())
+    else:
+        sizes = all(not fm_sizes.get(bed) or sum(sf) / len(sf) >= sum(fm_sizes[bed]) / len(fm_sizes[bed])
+                    for bed, sf in aff_sizes.items())
+
+    all_floors = {unit["floor"] for unit in units}
+    floor_counts = {}
+    for unit in units:
+        counts = floor_counts.setdefault(unit["floor"], [0, 0])
+        counts[0] += 1
+        counts[1] += unit["unit"] in affordable_ids
+
+    aff_balconies = sum(1 for unit in affordable if unit["hasBalcony"])
+    fm_balconies = sum(1 for unit in free_market if unit["hasBalcony"])
+    balcony = (aff_balconies + fm_balconies == 0 or
+               bool(aff_total and fm_total) and abs(aff_balconies / aff_total - fm_balconies / fm_total) <= 0.05)
+
+    return {
+        "floorArea": total_sf >= target_sf and total_sf - target_sf <= FLOOR_AREA_EXCESS,
+        "bedroom": bool(bedroom),
+        "unitSizes": sizes,
+        "verticalDistribution": bool(all_floors) and len({u["floor"] for u in affordable}) / len(all_floors) >= 0.65,
+        "horizontalDistribution": all(aff / total <= 0.67 for total, aff in floor_counts.values()),
+        "balconyDistribution": bool(balcony),
+    }
+
+def _one_hot(values):
+    """Distinct values and the n x k 0/1 matrix placing each value in its column"""
+    distinct, codes = np.unique(np.asarray(values), return_inverse=True)
+    matrix = np.zeros((len(values), len(distinct)))
+    matrix[np.arange(len(values)), codes] = 1.0
+    return distinct, codes, matrix
+
+def check_compliance_batch(units, selections, totals, requirements):
+    """checkAllCompliance for many scenarios of one building at once: a list of {check: passes}"""
+    if np is None or not units or not selections:
+        return [check_compliance(units, indices, total, requirements) for indices, total in zip(selections, totals)]
+
+    sf = np.array([unit["sf"] for unit in units], dtype=float)
+    balcony = np.array([unit["hasBalcony"] for unit in units], dtype=float)
+    beds, _, bed_hot = _one_hot([unit["bed"] for unit in units])
+    _, _, floor_hot = _one_hot([unit["floor"] for unit in units])
+    _, id_codes, id_hot = _one_hot([unit["unit"] for unit in units])
+
+    # affordable[s, i]: unit i was selected in scenario s; free-market units are the ones whose
+    # unit id no selected unit shares, as the calculator matches on unit ids
+    affordable = np.zeros((len(selections), len(units)), dtype=bool)
+    for row, indices in enumerate(selections):
+        affordable[row, indices] = True
+    aff = affordable.astype(float)
+    marked = (aff @ id_hot)[:, id_codes] > 0
+    fm = (~marked).astype(float)
+
+    total_sf = np.array(totals, dtype=float)
+    target_sf = requirements["targetSF"]
+    aff_beds, fm_beds = aff @ bed_hot, fm @ bed_hot
+    aff_total, fm_total = aff_beds.sum(axis=1), fm_beds.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if requirements["bedroomTest"] == "A":
+            difference = np.abs(aff_beds / aff_total[:, None] - fm_beds / fm_total[:, None]) * 100
+            bedroom = np.all((aff_beds + fm_beds == 0) | (difference <= 1), axis=1)
+        else:
+            studios = aff_beds[:, beds == 0].sum(axis=1)
+            two_plus = aff_beds[:, beds >= 2].sum(axis=1)
+            bedroom = (studios / aff_total * 100 <= 25) & (two_plus / aff_total * 100 >= 50)
+
+        sf_by_bed = bed_hot * sf[:, None]
+        aff_average = (aff @ sf_by_bed) / aff_beds
+        if requirements["sizeTest"] == "A":
+            undersized = sf < np.array([min_size(unit["bed"]) for unit in units])
+            sizes = ~(affordable & undersized).any(axis=1)
+        elif requirements["sizeTest"] == "B":
+            sizes = np.all((aff_beds == 0) | (aff_average >= np.array([min_size(bed) for bed in beds.tolist()])), axis=1)
+        else:
+            fm_average = (fm @ sf_by_bed) / fm_beds
+            sizes = np.all((aff_beds == 0) | (fm_beds == 0) | (aff_average >= fm_average), axis=1)
+
+        vertical = ((aff @ floor_hot) > 0).sum(axis=1) / floor_hot.shape[1] >= 0.65
+        horizontal = ~((marked.astype(float) @ floor_hot) / floor_hot.sum(axis=0) > 0.67).any(axis=1)
+
+        aff_balconies, fm_balconies = aff @ balcony, fm @ balcony
+        balconies = ((aff_balconies + fm_balconies == 0) |
+                     (np.abs(aff_balconies / aff_total - fm_balconies / fm_total) <= 0.05))
+
+    floor_area = (total_sf >= target_sf) & (total_sf - target_sf <= FLOOR_AREA_EXCESS)
+    columns = (floor_area, bedroom, sizes, vertical, horizontal, balconies)
+    return [dict(zip(CHECKS, map(bool, row))) for row in zip(*columns)]
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+def evaluate_variants(units, requirements, variants):
+    """Scenarios for (strategy, seed) variants that pass the SF rule, with their compliance"""
+    scenarios, seen = [], set()
+    for strategy, seed in variants:
+        scenario = generate_scenario(units, requirements, strategy, seed)
+        key = frozenset(scenario["indices"])
+        if key in seen or not within_sf_rule(scenario["total_sf"], requirements["targetSF"]):
+            continue
+        seen.add(key)
+        scenarios.append(scenario)
+    results = check_compliance_batch(units, [s["indices"] for s in scenarios], [s["total_sf"] for s in scenarios],
+                                     requirements)
+    for scenario, compliance in zip(scenarios, results):
+        scenario["compliance"] = compliance
+    return scenarios
+
+def _scenario_summary(scenario, requirements):
+    name, description = STRATEGIES[scenario["strategy"]]
+    failed = [check for check in CHECKS if not scenario["compliance"][check]]
+    seed_rules = [f"Seed: {scenario['seed']}"] if scenario["seed"] else []
+    return {
+        "name": name,
+        "description": description,
+        "strategy": scenario["strategy"],
+        "seed": scenario["seed"],
+        "compliant": not failed,
+        "failed_checks": failed,
+        "compliance": scenario["compliance"],
+        "unit_count": len(scenario["units"]),
+        "total_sf": round(scenario["total_sf"], 1),
+        "overage_sf": round(scenario["total_sf"] - requirements["targetSF"], 1),
+        "amiBreakdown": ami_breakdown(scenario["units"]),
+        "appliedRules": requirements["customRules"] + [f"Strategy: {scenario['strategy']}"] + seed_rules,
+        "units": scenario["units"],
+    }
+
+def search_scenarios(units, requirements, strategies=None, seeds=16, top=4, workers=None, compliant_only=True):
+    """Best `top` scenarios over every strategy x seed variant, most compliant and least overage first
+
+    Variants are split into chunks evaluated in a process pool (inline with workers=1).
+    Returns (scenarios, stats)."""
+    requirements = normalize_requirements(requirements)
+    strategies = list(strategies or STRATEGIES)
+    unknown = [strategy for strategy in strategies if strategy not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"unknown strategies {unknown} - choose from {sorted(STRATEGIES)}")
+    variants = [(strategy, seed) for seed in range(max(1, seeds)) for strategy in strategies]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(variants)))
+
+    started = time.perf_counter()
+    if workers == 1:
+        evaluated = evaluate_variants(units, requirements, variants)
+    else:
+        size = math.ceil(len(variants) / (workers * 4))
+        chunks = [variants[start:start + size] for start in range(0, len(variants), size)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(evaluate_variants, units, requirements, chunk) for chunk in chunks]
+            evaluated = [scenario for future in futures for scenario in future.result()]
+
+    unique, seen = [], set()
+    for scenario in evaluated:
+        key = frozenset(scenario["indices"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(scenario)
+    ranked = sorted(unique, key=lambda s: (sum(not passes for passes in s["compliance"].values()), s["total_sf"]))
+    compliant = [s for s in ranked if all(s["compliance"].values())]
+    chosen = (compliant if compliant_only else ranked)[:top]
+    stats = {
+        "variants": len(variants),
+        "scenarios": len(unique),
+        "compliant": len(compliant),
+        "workers": workers,
+        "vectorized": np is not None,
+        "search_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    return [_scenario_summary(scenario, requirements) for scenario in chosen], stats
+
+def _floors(text):
+    return [int(value) for value in text.split(',') if value.strip()] if text else None
+
+def main():
+    parser = argparse.ArgumentParser(description='Parallel multi-strategy AMI compliance scenario search')
+    parser.add_argument('rent_roll', help='CSV, JSON or xlsx rent roll')
+    parser.add_argument('--requirements', help='JSON file of calculator requirements (targetSF, amiLow, ...)')
+    parser.add_argument('--target-sf', type=float, help='Affordable floor area target in sf')
+    parser.add_argument('--ami-low', type=float, help='Low AMI level for 20%% of the affordable SF')
+    parser.add_argument('--ami-average', type=float, help='Average AMI level (default 60)')
+    parser.add_argument('--required-floors', help='Comma-separated floors that must have affordable units')
+    parser.add_argument('--excluded-floors', help='Comma-separated floors without affordable units')
+    parser.add_argument('--preferred-floors', help='Comma-separated floors to prefer')
+    parser.add_argument('--bedroom-test', choices=['A', 'B'], help='Bedroom mix test (default A)')
+    parser.add_argument('--size-test', choices=['A', 'B', 'C'], help='Unit size test (default B)')
+    parser.add_argument('--rule', action='append', dest='rules', help='Custom rule text (repeatable)')
+    parser.add_argument('--strategies', help=f'Comma-separated subset of {",".join(STRATEGIES)}')
+    parser.add_argument('--seeds', type=int, default=16, help='Seed variants per strategy (seed 0 = calculator order)')
+    parser.add_argument('--top', type=int, default=4, help='Scenarios to return')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count, 1 = inline)')
+    parser.add_argument('--allow-failing', action='store_true',
+                        help='Fill up to --top with the closest non-compliant scenarios')
+    args = parser.parse_args()
+
+    requirements = {}
+    if args.requirements:
+        with open(args.requirements, 'r', encoding='utf-8') as f:
+            requirements = json.load(f)
+    requirements.update({key: value for key, value in {
+        "targetSF": args.target_sf, "amiLow": args.ami_low, "amiAverage": args.ami_average,
+        "requiredFloors": _floors(args.required_floors), "excludedFloors": _floors(args.excluded_floors),
+        "preferredFloors": _floors(args.preferred_floors), "bedroomTest": args.bedroom_test,
+        "sizeTest": args.size_test, "customRules": args.rules,
+    }.items() if value is not None})
+    if not requirements.get("targetSF"):
+        parser.error("--target-sf or a requirements file with targetSF is required")
+
+    scenarios, stats = search_scenarios(load_rent_roll(args.rent_roll), requirements,
+                                        args.strategies.split(',') if args.strategies else None,
+                                        args.seeds, args.top, args.workers, not args.allow_failing)
+    print(json.dumps({"rent_roll": args.rent_roll, "stats": stats, "scenarios": scenarios}, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+AMI UNIT SELECTION ENGINE - Affordable-unit selection for batch runs over rent rolls
+Python port of the AMI calculator's selectUnitsWithDP / assignAMILevels
+(fixed_local_gemini_ami_calculator.html), with the same contract: the subset of
+units, in their given order, whose total SF is the smallest at or above the target
+at 0.1 sf resolution, listed from the last chosen unit back to the first; [] when
+the units cannot reach the target.
+
+Instead of the calculator's (n+1) x (maxSum+1) prev table:
+  * reachable sums are a bitset packed into a Python int, one shift-or per unit
+  * the bitset stops at target + largest unit: the smallest sum at or above the
+    target always lies below that, so width does not grow with building size
+  * only every sqrt(n)-th bitset is kept; the selection is rebuilt block by block
+    from those checkpoints, with the calculator's last-unit-first tie-breaking
+
+Usage:
+    python AMI_UNIT_SELECTION_ENGINE.py rent_roll.csv [more.xlsx ...] --target-sf 2043.3
+                                        [--ami-low 40 --ami-average 60]
+    python AMI_UNIT_SELECTION_ENGINE.py --batch buildings.jsonl   ({"rent_roll": ..., "target_sf": ...} per line)
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+import time
+
+SCALE = 10  # 0.1 sf resolution, as in the calculator
+
+# ============================================================================
+# BITSETS
+# ============================================================================
+
+def add_unit(row, weight, mask):
+    """Reachable sums after one more unit: the old sums, and each of them plus weight"""
+    return (row | (row << weight)) & mask
+
+def lowest_from(row, start):
+    """Smallest reachable sum >= start, or None"""
+    above = row >> start
+    return start + (above & -above).bit_length() - 1 if above else None
+
+# ============================================================================
+# SELECTION
+# ============================================================================
+
+def scaled_sf(sf):
+    """Math.floor(sf * 10), as the calculator scales unit and target SF"""
+    return math.floor(sf * SCALE)
+
+def select_indices(weights, target):
+    """Indices (last first) of the min-sum subset of `weights` with sum >= target, or []"""
+    n = len(weights)
+    target = max(target, 0)
+    mask = (1 << (target + max(weights, default=0) + 1)) - 1
+    block = max(1, math.isqrt(n))
+
+    # Reachability pass, keeping the rows at 0, block, 2*block, ...
+    row = 1
+    checkpoints = [row]
+    for index, weight in enumerate(weights, 1):
+        row = add_unit(row, weight, mask)
+        if index % block == 0:
+            checkpoints.append(row)
+    best = lowest_from(row, target)
+    if best is None:
+        return []
+
+    # Rebuild from the last unit back: take unit i whenever best - w_i was reachable without it
+    selected = []
+    remaining = best
+    end = n
+    while end > 0:
+        start = ((end - 1) // block) * block
+        rows = [checkpoints[start // block]]
+        for index in range(start, end - 1):
+            rows.append(add_unit(rows[-1], weights[index], mask))
+        for index in range(end - 1, start - 1, -1):
+            weight = weights[index]
+            if remaining >= weight and (rows[index - start] >> (remaining - weight)) & 1:
+                selected.append(index)
+                remaining -= weight
+        end = start
+    return selected
+
+def select_units(units, target_sf):
+    """selectUnitsWithDP: units (dicts with "sf") with the smallest total SF >= target_sf"""
+    weights = [scaled_sf(unit["sf"]) for unit in units]
+    return [units[index] for index in select_indices(weights, scaled_sf(target_sf))]
+
+def calculate_ami_distribution(ami_low, ami_average):
+    """calculateAMIDistribution: 20% of the affordable SF at ami_low, the rest averaging out"""
+    if not ami_low:
+        return [{"ami": ami_average, "percentage": 1.0}]
+    ami_high = (ami_average - 0.2 * ami_low) / 0.8
+    return [{"ami": ami_low, "percentage": 0.2}, {"ami": ami_high, "percentage": 0.8}]
+
+def assign_ami_levels(units, ami_distribution, target_sf):
+    """assignAMILevels: low-AMI units (min-overage 20% of target SF) first, then the rest
+    Returns copies of the units with amiLevel set; the input dicts are left alone."""
+    if len(ami_distribution) == 1:
+        return [dict(unit, amiLevel=ami_distribution[0]["ami"]) for unit in units]
+    low_positions = select_indices([scaled_sf(unit["sf"]) for unit in units], scaled_sf(target_sf * 0.2))
+    low = set(low_positions)
+    return ([dict(units[index], amiLevel=ami_distribution[0]["ami"]) for index in low_positions] +
+            [dict(unit, amiLevel=ami_distribution[1]["ami"]) for index, unit in enumerate(units) if index not in low])
+
+# ============================================================================
+# RENT ROLLS
+# ============================================================================
+
+SF_COLUMNS = ['SF', 'sf', 'SQUARE_FEET', 'NET SF', 'sqft', 'Square Feet', 'AREA', 'SIZE', 'NET SF']
+BED_COLUMNS = ['BED', 'bed', 'BEDROOMS', 'BEDS', 'Bedrooms']
+FLOOR_COLUMNS = ['FLOOR', 'floor', 'LEVEL']
+UNIT_COLUMNS = ['UNIT', 'unit', 'APT', 'APARTMENT']
+BALCONY_COLUMNS = ['BALCONY', 'balcony', 'TERRACE', 'SEC. 504']
+
+def _js_int(value):
+    """parseInt: leading integer of the text, else None"""
+    match = re.match(r'\s*([+-]?\d+)', str(value if value is not None else ""))
+    return int(match.group(1)) if match else None
+
+def _js_float(value):
+    """parseFloat: leading number of the text, else None"""
+    match = re.match(r'\s*([+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?)', str(value if value is not None else ""))
+    return float(match.group(1)) if match else None
+
+def _find_column(columns, candidates):
+    return next((column for column in columns
+                 if any(candidate.lower() in column.lower() for candidate in candidates)), None)
+
+def normalize_units(rows):
+    """normalizeAndExtractUnits: rent roll rows (dicts) -> units with sf, bed, floor, unit,
+    hasBalcony, amiLevel and tempIndex; raises ValueError without SF/bed/floor/unit columns"""
+    if not rows:
+        return []
+    columns = list(rows[0].keys())
+    sf_column = _find_column(columns, SF_COLUMNS)
+    bed_column = _find_column(columns, BED_COLUMNS)
+    floor_column = _find_column(columns, FLOOR_COLUMNS)
+    unit_column = _find_column(columns, UNIT_COLUMNS)
+    balcony_column = _find_column(columns, BALCONY_COLUMNS)
+    if not (sf_column and bed_column and floor_column and unit_column):
+        raise ValueError("Missing required columns: SF, Bedrooms, Floor, Unit")
+
+    units = []
+    for row in rows:
+        sf, bed, floor = _js_float(row.get(sf_column)), _js_int(row.get(bed_column)), _js_int(row.get(floor_column))
+        unit_id = "" if row.get(unit_column) is None else str(row.get(unit_column))
+        if sf is not None and sf > 0 and bed is not None and floor is not None and unit_id:
+            units.append({
+                "sf": sf, "bed": bed, "floor": floor, "unit": unit_id,
+                "hasBalcony": bool(row.get(balcony_column)) if balcony_column else False,
+                "amiLevel": _js_int(row["AMI"]) if row.get("AMI") else None,
+                "tempIndex": len(units),
+            })
+    return units
+
+def load_rent_roll(path):
+    """Units from a CSV, JSON (list of rows) or xlsx (first sheet, needs openpyxl) rent roll"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+    elif extension in (".xlsx", ".xlsm"):
+        import openpyxl
+
+        sheet = openpyxl.load_workbook(path, read_only=True, data_only=True).worksheets[0]
+        values = list(sheet.iter_rows(values_only=True))
+        header = [str(name) if name is not None else "" for name in (values[0] if values else [])]
+        rows = [dict(zip(header, row)) for row in values[1:]]
+    else:
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+    return normalize_units(rows)
+
+def solve_building(units, target_sf, ami_low=None, ami_average=60):
+    """Selection plus AMI levels for one building, with timing"""
+    started = time.perf_counter()
+    selected = select_units(units, target_sf)
+    selected = assign_ami_levels(selected, calculate_ami_distribution(ami_low, ami_average), target_sf)
+    total_sf = sum(unit["sf"] for unit in selected)
+    return {
+        "units": selected,
+        "unit_count": len(selected),
+        "total_sf": round(total_sf, 1),
+        "target_sf": target_sf,
+        "overage_sf": round(total_sf - target_sf, 1) if selected else None,
+        "solve_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Minimum-overage affordable-unit selection over rent rolls')
+    parser.add_argument('rent_rolls', nargs='*', help='CSV, JSON or xlsx rent rolls')
+    parser.add_argument('--target-sf', type=float, help='Affordable floor area target in sf')
+    parser.add_argument('--ami-low', type=float, help='Low AMI level for 20%% of the affordable SF')
+    parser.add_argument('--ami-average', type=float, default=60, help='Average AMI level')
+    parser.add_argument('--batch', help='JSONL of {"rent_roll", "target_sf", "ami_low", "ami_average"} per building')
+    args = parser.parse_args()
+
+    jobs = []
+    if args.batch:
+        with open(args.batch, 'r', encoding='utf-8') as f:
+            jobs = [json.loads(line) for line in f if line.strip()]
+    if args.rent_rolls:
+        if args.target_sf is None:
+            parser.error("--target-sf is required with rent roll files")
+        jobs += [{"rent_roll": path, "target_sf": args.target_sf, "ami_low": args.ami_low,
+                  "ami_average": args.ami_average} for path in args.rent_rolls]
+    if not jobs:
+        parser.error("give rent roll files or --batch")
+
+    for job in jobs:
+        result = solve_building(load_rent_roll(job["rent_roll"]), float(job["target_sf"]), job.get("ami_low"),
+                                job.get("ami_average") or 60)
+        print(json.dumps(dict(result, rent_roll=job["rent_roll"])), flush=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
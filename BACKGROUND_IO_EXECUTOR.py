@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+BACKGROUND IO EXECUTOR - One bounded pool for filesystem and process-spawning work
+File searches/opens, download waits and renames, and report writing all go through
+the shared io_executor instead of a raw thread each:
+  * at most max_workers tasks run, at most max_pending more wait in line
+  * submit() blocks when full (back-pressure) or raises ExecutorBusy with block=False
+  * every task returns a Future carrying its result or exception
+  * queued work is cancelled and running work finished at interpreter exit
+Excel download waits have their own download_executor: each browser has at most one
+in flight and the wait mostly sleeps, so report writes and file opens never queue
+behind them (nor they behind report writes).
+"""
+
+import atexit
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+io_logger = logging.getLogger('background_io')
+
+class ExecutorBusy(RuntimeError):
+    """The executor is full (non-blocking submit or timeout) or shut down"""
+
+class BoundedExecutor:
+    def __init__(self, max_workers=4, max_pending=16, name="BackgroundIO"):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self.counts = Counter()  # submitted / completed / failed / rejected
+        self.in_flight = 0
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args, block=True, timeout=None, description=None, **kwargs):
+        """Run fn(*args, **kwargs) in the pool; returns a Future"""
+        description = description or getattr(fn, "__name__", "task")
+        if self.closed:
+            raise ExecutorBusy(f"executor shut down - not running {description}")
+        acquired = self.slots.acquire(timeout=timeout) if block else self.slots.acquire(blocking=False)
+        if not acquired:
+            with self.lock:
+                self.counts["rejected"] += 1
+            raise ExecutorBusy(f"{self.max_workers} running and {self.max_pending} queued - not running {description}")
+        with self.lock:
+            # shutdown() may have run while this call waited for a slot
+            closed = self.closed
+            if not closed:
+                self.counts["submitted"] += 1
+                self.in_flight += 1
+        if closed:
+            self.slots.release()
+            raise ExecutorBusy(f"executor shut down - not running {description}")
+        try:
+            future = self.pool.submit(self._run, fn, args, kwargs, description)
+        except RuntimeError as e:
+            self._release(failed=True)
+            raise ExecutorBusy(str(e))
+        future.add_done_callback(lambda done: self._release(failed=done.cancelled() or done.exception() is not None))
+        return future
+
+    def _run(self, fn, args, kwargs, description):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            io_logger.error(f"❌ Background task {description} failed: {e}")
+            raise
+
+    def _release(self, failed):
+        with self.lock:
+            self.in_flight -= 1
+            self.counts["failed" if failed else "completed"] += 1
+        self.slots.release()
+
+    def shutdown(self, wait=True, cancel_pending=True):
+        """Stop accepting work; cancel queued tasks and (optionally) wait for running ones"""
+        with self.lock:
+            self.closed = True
+        self.pool.shutdown(wait=wait, cancel_futures=cancel_pending)
+
+    def status(self):
+        with self.lock:
+            return {"in_flight": self.in_flight, "max_workers": self.max_workers,
+                    "max_pending": self.max_pending, **self.counts}
+
+io_executor = BoundedExecutor()
+atexit.register(io_executor.shutdown)
+
+download_executor = BoundedExecutor(max_workers=16, max_pending=16, name="Downloads")
+atexit.register(download_executor.shutdown)
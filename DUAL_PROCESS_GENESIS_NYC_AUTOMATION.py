@@ -8,25 +8,72 @@ SOLUTION: Python script never exits, so browser process stays alive indefinitely
 """
 
 import argparse
+import atexit
+import base64
+import contextlib
+import copy
+import csv
+import functools
+import json
 import logging
+import logging.handlers
+import queue
 import time
 import os
 import re
+import shutil
 import threading
 import random
 import urllib.parse
+import uuid
+import weakref
+from collections import deque
 from datetime import datetime
 from difflib import SequenceMatcher
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
 import subprocess  # Added for file explorer opening
+import sys
 import glob  # Added for file pattern matching
 
+from BACKGROUND_IO_EXECUTOR import ExecutorBusy, download_executor, io_executor
+from GENESIS_METRICS import metrics, start_metrics_server
+from GENESIS_PROFILER import JobProfiling
+from GENESIS_REPORT_WRITER import FORMAT_DEPENDENCIES, REPORT_FORMATS, format_available, unique_path, write_report
+
+try:
+    import psutil  # Optional: Chrome memory monitoring for the browser memory governor
+except ImportError:
+    psutil = None
+
+try:
+    import fcntl  # POSIX: lock for the cache files shared by concurrent runs
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt  # Windows: same lock
+except ImportError:
+    msvcrt = None
+
+# Selenium is only imported when a browser is actually needed (see load_selenium),
+# so validation, caching and the file opener start without it
+webdriver = By = WebDriverWait = Select = EC = Service = Options = None
+TimeoutException = NoSuchElementException = ElementNotInteractableException = None
+
+def load_selenium():
+    """NEW - Import selenium on first browser use"""
+    global webdriver, By, WebDriverWait, Select, EC, Service, Options
+    global TimeoutException, NoSuchElementException, ElementNotInteractableException
+    if webdriver is not None:
+        return
+    from selenium import webdriver as _webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait, Select
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
+    webdriver = _webdriver
+
 # Configure logging with UTF-8 encoding
 class UnicodeFormatter(logging.Formatter):
     def format(self, record):
@@ -36,23 +83,137 @@ class UnicodeFormatter(logging.Formatter):
             record.msg = str(record.msg).encode('ascii', 'replace').decode('ascii')
             return super().format(record)
 
+class JsonLogFormatter(logging.Formatter):
+    """NEW - One JSON object per line, carrying the job/record context"""
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "job_id": getattr(record, "job_id", None),
+            "record_id": getattr(record, "record_id", None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:  # traceback formatted by ContextQueueHandler before queuing
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """NEW - QueueHandler that keeps the traceback in exc_text instead of folding it into the
+    message, so the listener's JSON formatter can still emit it as its own field"""
+    def prepare(self, record):
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+class LogContextFilter(logging.Filter):
+    """NEW - Stamps records with the job/record context of the emitting thread"""
+    def filter(self, record):
+        record.job_id = getattr(_log_context, "job_id", None)
+        record.record_id = getattr(_log_context, "record_id", None)
+        return True
+
+_log_context = threading.local()
+
+def set_log_context(job_id=None, record_id=None):
+    """Tag every log line from this thread with a job and Airtable record"""
+    _log_context.job_id = job_id
+    _log_context.record_id = record_id
+
+def with_log_context(task):
+    """NEW - Wrap a background task so its log lines carry the submitting job's context"""
+    job_id, record_id = getattr(_log_context, "job_id", None), getattr(_log_context, "record_id", None)
+
+    def run():
+        set_log_context(job_id, record_id)
+        try:
+            return task()
+        finally:
+            set_log_context()
+    return run
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_formatter = UnicodeFormatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(console_formatter)
-logger.addHandler(console_handler)
+# Per-component loggers - levels can be tuned individually (e.g. --log-level lot=WARNING)
+nyc_logger = logger.getChild("nyc")
+maps_logger = logger.getChild("maps")
+lot_logger = logger.getChild("lot")
+borough_logger = logger.getChild("borough")
+form_logger = logger.getChild("form")
+governor_logger = logger.getChild("governor")
+latency_logger = logger.getChild("latency")
 
-try:
-    file_handler = logging.FileHandler('genesis_automation.log', encoding='utf-8')
-    file_handler.setLevel(logging.INFO)
-    file_formatter = UnicodeFormatter('%(asctime)s - %(levelname)s - %(message)s')
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-except Exception as e:
-    logger.warning(f"Could not setup file logging: {e}")
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+_log_listener = None
+
+def configure_logging(log_file='genesis_automation.log', json_format=False, max_bytes=10 * 1024 * 1024,
+                      backup_count=5, rotate_when=None, levels=None):
+    """
+    NEW - Non-blocking logging: the automation only enqueues records, and a
+    background listener writes them to the console and a rotating log file
+    (size-based by default, time-based when rotate_when is e.g. 'midnight')
+    """
+    global _log_listener
+    if _log_listener:
+        _log_listener.stop()
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+
+    formatter = JsonLogFormatter() if json_format else UnicodeFormatter(LOG_FORMAT)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    output_handlers = [console_handler]
+
+    if log_file:
+        try:
+            if rotate_when:
+                file_handler = logging.handlers.TimedRotatingFileHandler(
+                    log_file, when=rotate_when, backupCount=backup_count, encoding='utf-8')
+            else:
+                file_handler = logging.handlers.RotatingFileHandler(
+                    log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+            file_handler.setFormatter(formatter)
+            output_handlers.append(file_handler)
+        except Exception as e:
+            console_handler.handle(logging.makeLogRecord(
+                {"msg": f"Could not setup file logging: {e}", "levelname": "WARNING", "levelno": logging.WARNING}))
+
+    log_queue = queue.Queue(-1)
+    queue_handler = ContextQueueHandler(log_queue)
+    queue_handler.addFilter(LogContextFilter())
+    logger.addHandler(queue_handler)
+
+    _log_listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+    _log_listener.start()
+
+    for name, level in (levels or {}).items():
+        target = logger if name in ("", "root") else logger.getChild(name)
+        target.setLevel(level.upper())
+
+def stop_logging():
+    """Flush queued log records (registered to run at exit)"""
+    global _log_listener
+    if _log_listener:
+        _log_listener.stop()
+        _log_listener = None
+
+def parse_log_levels(values):
+    """Parse repeated --log-level LEVEL / component=LEVEL options"""
+    levels = {}
+    for value in values or []:
+        name, _, level = value.rpartition("=")
+        levels[name.strip().lower()] = level.strip()
+    return levels
+
+atexit.register(stop_logging)
 
 # ============================================================================
 # NEW: Standalone File Search and Open Function (Fully Decoupled)
@@ -93,22 +254,600 @@ def open_address_file(address):
             logger.error(f"Failed to open folder '{folder_path}': {e}")
 
 # ============================================================================
-# NYC PROPERTY PORTAL AUTOMATION (100% WORKING CODE - NO CHANGES)
+# NEW: Rate Governor - Shared token-bucket pacing per target host
+# ============================================================================
+
+class TokenBucket:
+    """
+    Token bucket with additive-increase / multiplicative-decrease rate control
+    Callers reserve a token under the lock and sleep outside it, so waiting
+    workers are served in arrival order without holding the lock
+    """
+
+    def __init__(self, rate, burst=1, min_rate=None, max_rate=None):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate or rate / 8
+        self.max_rate = max_rate or rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how long the caller must wait for it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def slow_down(self, factor=0.5):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * factor)
+            return self.rate
+
+    def speed_up(self, step_fraction=0.1):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * step_fraction)
+            return self.rate
+
+class RateGovernor:
+    """
+    NEW - Shared anti-bot pacing for every worker in this process
+    One token bucket per target host; each browser action acquires first.
+    Error pages and slow responses halve the rate, successes restore it.
+    """
+
+    # rate = actions per second, slow_seconds = latency treated as a slowdown
+    HOST_LIMITS = {
+        "genesis": {"rate": 0.5, "burst": 2, "slow_seconds": 8.0},
+        "nyc": {"rate": 1.0, "burst": 3, "slow_seconds": 10.0},
+        "google": {"rate": 1.0, "burst": 3, "slow_seconds": 10.0},
+    }
+
+    # Outage pages mean the site itself is down; the rest mean we are being throttled
+    OUTAGE_PAGE_MARKERS = ["service unavailable", "502 bad gateway", "503 service", "504 gateway"]
+    ERROR_PAGE_MARKERS = (["too many requests", "access denied", "rate limit", "rate limited", "unusual traffic"]
+                          + OUTAGE_PAGE_MARKERS)
+    # Matched as whole words like the login problem markers, so page text such as "ratelimited.js" is not an error page
+    ERROR_PAGE_PATTERNS = {marker: re.compile(r"\b" + re.escape(marker) + r"\b") for marker in ERROR_PAGE_MARKERS}
+
+    # Limits that apply per login: a thread bound to an account gets its own bucket
+    PER_ACCOUNT_HOSTS = ("genesis",)
+
+    def __init__(self, host_limits=None, jitter=0.3):
+        self.jitter = jitter
+        self.limits = {host: dict(limits) for host, limits in self.HOST_LIMITS.items()}
+        for host, rate in (host_limits or {}).items():
+            self.limits.setdefault(host, {"rate": rate, "burst": 1, "slow_seconds": 10.0})["rate"] = rate
+        self.buckets = {host: TokenBucket(limits["rate"], limits["burst"])
+                        for host, limits in self.limits.items()}
+        self.total_wait = {host: 0.0 for host in self.buckets}
+        self.bound = threading.local()
+        self.lock = threading.Lock()
+
+    def bind_account(self, account_name):
+        """Pace this thread's per-account hosts on the account's own bucket (None = shared bucket)"""
+        self.bound.account = account_name
+
+    def _key(self, host):
+        account_name = getattr(self.bound, "account", None)
+        if account_name is None or host not in self.PER_ACCOUNT_HOSTS:
+            return host
+        key = f"{host}:{account_name}"
+        with self.lock:
+            if key not in self.buckets:
+                self.limits[key] = dict(self.limits[host])
+                self.buckets[key] = TokenBucket(self.limits[key]["rate"], self.limits[key]["burst"])
+                self.total_wait[key] = 0.0
+        return key
+
+    def acquire(self, host):
+        """Block until this host may be hit again; returns the seconds waited"""
+        host = self._key(host)
+        bucket = self.buckets[host]
+        wait_time = bucket.reserve()
+        if wait_time > 0:
+            wait_time += random.uniform(0, self.jitter * wait_time)
+            governor_logger.debug(f"⏳ Rate governor: waiting {wait_time:.1f}s before next {host} action")
+            time.sleep(wait_time)
+        with self.lock:
+            self.total_wait[host] += wait_time
+        return wait_time
+
+    def report_success(self, host, latency=None):
+        host = self._key(host)
+        if latency is not None and latency > self.limits[host]["slow_seconds"]:
+            self.report_failure(host, f"slow response ({latency:.1f}s)")
+            return
+        self.buckets[host].speed_up()
+
+    def report_failure(self, host, reason="error"):
+        host = self._key(host)
+        new_rate = self.buckets[host].slow_down()
+        governor_logger.warning(f"🐢 Rate governor: {host} {reason} - backing off to {new_rate:.2f} actions/s")
+
+    def check_page(self, driver, host):
+        """Back off if the current page looks like a throttling or error page"""
+        return self.page_error(driver, host) is None
+
+    def page_error(self, driver, host):
+        """NEW - The error page marker the current page shows (after backing off), or None"""
+        try:
+            page_text = driver.execute_script(
+                "return (document.title + ' ' + (document.body ? document.body.innerText.slice(0, 500) : '')).toLowerCase();")
+        except Exception:
+            return None
+        for marker, pattern in self.ERROR_PAGE_PATTERNS.items():
+            if pattern.search(page_text or ""):
+                self.report_failure(host, f"error page ('{marker}')")
+                return marker
+        return None
+
+    def status(self):
+        return {host: {"rate": round(bucket.rate, 3), "total_wait_seconds": round(self.total_wait[host], 1)}
+                for host, bucket in list(self.buckets.items())}
+
+rate_governor = RateGovernor()
+
+def rate_limit_option(value):
+    """NEW - argparse type for --rate-limit host=actions_per_second; bad values go through parser.error"""
+    host, separator, rate = value.partition("=")
+    host = host.strip().lower()
+    if not separator:
+        raise argparse.ArgumentTypeError(f"expected HOST=RATE, got '{value}'")
+    if host not in RateGovernor.HOST_LIMITS:
+        raise argparse.ArgumentTypeError(f"unknown host '{host}' (choose from {', '.join(RateGovernor.HOST_LIMITS)})")
+    try:
+        rate = float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"rate for {host} must be a number, got '{rate.strip()}'")
+    if not 0 < rate < float("inf"):
+        raise argparse.ArgumentTypeError(f"rate for {host} must be a positive number of actions per second")
+    return host, rate
+
+def parse_rate_limits(values):
+    """Parse repeated --rate-limit host=actions_per_second options"""
+    return dict(rate_limit_option(value) if isinstance(value, str) else value for value in values or [])
+
+# ============================================================================
+# NEW: Adaptive Timeouts - Wait ceilings learned from observed page latency
+# ============================================================================
+
+DEFAULT_LATENCY_MODEL_PATH = os.path.join(os.getcwd(), "genesis_reports", "latency_model.json")
+
+class LatencyModel:
+    """
+    NEW - Rolling latency window per (site, operation)
+    Each wait's timeout is multiplier x p95 of recent successful waits, clamped
+    to that operation's bounds, and widened 1.5x per consecutive timeout.
+    Samples far above the median are logged as outliers. The window is saved
+    next to the reports so one-job CLI runs learn from earlier runs.
+    """
+
+    # (site, operation): (default seconds before enough samples, floor, ceiling)
+    BOUNDS = {
+        ("nyc", "element"): (5.0, 3.0, 30.0),
+        ("maps", "element"): (5.0, 3.0, 30.0),
+        ("genesis", "element"): (15.0, 5.0, 60.0),
+        ("genesis", "search"): (15.0, 5.0, 120.0),     # RUN click -> Records Selected count
+        ("genesis", "download"): (30.0, 10.0, 180.0),  # Excel click -> file on disk
+        ("genesis", "lot_validation"): (6.0, 3.0, 15.0),  # lot field blur -> 'Target property does not exist'
+    }
+
+    def __init__(self, state_path=DEFAULT_LATENCY_MODEL_PATH, window=200, percentile=0.95, multiplier=2.0,
+                 min_samples=5, outlier_factor=3.0, save_every=20):
+        self.state_path = state_path
+        self.window = window
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.outlier_factor = outlier_factor
+        self.save_every = save_every
+        self.samples = None  # "site/operation" -> deque of seconds (loaded on first use)
+        self.timeouts = {}   # "site/operation" -> deque of 0/1 per wait
+        self.streaks = {}    # "site/operation" -> consecutive timeouts
+        self.outliers = {}
+        self.unsaved = 0
+        self.lock = threading.Lock()
+
+    def _load(self):
+        self.samples = {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                for key, values in json.load(f).items():
+                    self.samples[key] = deque(values, maxlen=self.window)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            latency_logger.warning(f"Could not read latency model {self.state_path}: {e}")
+
+    def _bounds(self, site, operation):
+        return self.BOUNDS.get((site, operation), (10.0, 2.0, 120.0))
+
+    @staticmethod
+    def _quantile(values, fraction):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def timeout(self, site, operation="element"):
+        """Seconds to wait for this operation right now"""
+        default, floor, ceiling = self._bounds(site, operation)
+        key = f"{site}/{operation}"
+        with self.lock:
+            if self.samples is None:
+                self._load()
+            values = self.samples.get(key)
+            if not values or len(values) < self.min_samples:
+                learned = default
+            else:
+                learned = max(floor, self.multiplier * self._quantile(values, self.percentile))
+            # Portal slower than the window suggests - widen until waits succeed again
+            learned *= 1.5 ** min(self.streaks.get(key, 0), 6)
+        return max(floor, min(ceiling, learned))
+
+    def typical(self, site, operation="element"):
+        """Median observed duration (the default timeout until samples exist)"""
+        key = f"{site}/{operation}"
+        with self.lock:
+            if self.samples is None:
+                self._load()
+            values = self.samples.get(key)
+            if not values or len(values) < self.min_samples:
+                return self._bounds(site, operation)[0]
+            return self._quantile(values, 0.5)
+
+    def observe(self, site, operation, seconds, timed_out=False):
+        key = f"{site}/{operation}"
+        with self.lock:
+            if self.samples is None:
+                self._load()
+            self.timeouts.setdefault(key, deque(maxlen=50)).append(1 if timed_out else 0)
+            self.streaks[key] = self.streaks.get(key, 0) + 1 if timed_out else 0
+            if timed_out:
+                latency_logger.warning(f"⏰ {key} timed out after {seconds:.1f}s")
+                return
+            values = self.samples.setdefault(key, deque(maxlen=self.window))
+            if len(values) >= self.min_samples:
+                median = self._quantile(values, 0.5)
+                if seconds > self.outlier_factor * median and seconds > 1.0:
+                    self.outliers[key] = self.outliers.get(key, 0) + 1
+                    latency_logger.warning(f"🐌 {key} took {seconds:.1f}s (median {median:.1f}s) - portal degrading?")
+            values.append(seconds)
+            self.unsaved += 1
+            save_now = self.unsaved >= self.save_every
+        if save_now:
+            self.save()
+
+    def save(self):
+        with self.lock:
+            if not self.samples or not self.unsaved:
+                return
+            data = {key: list(values) for key, values in self.samples.items()}
+            self.unsaved = 0
+        try:
+            # Other runs and workers save the same file: own temp file, one writer at a time
+            with cache_file_lock(self.state_path):
+                write_json_atomic(self.state_path, data)
+        except Exception as e:
+            latency_logger.warning(f"Could not save latency model: {e}")
+
+    def status(self):
+        with self.lock:
+            keys = sorted(set(self.samples or {}) | set(self.timeouts))
+        report = {}
+        for key in keys:
+            site, operation = key.split("/", 1)
+            values = list((self.samples or {}).get(key, []))
+            recent = list(self.timeouts.get(key, []))
+            report[key] = {
+                "samples": len(values),
+                "p50": round(self._quantile(values, 0.5), 2) if values else None,
+                "p95": round(self._quantile(values, 0.95), 2) if values else None,
+                "timeout": round(self.timeout(site, operation), 1),
+                "recent_timeouts": sum(recent),
+                "outliers": self.outliers.get(key, 0),
+            }
+        return report
+
+latency_model = LatencyModel()
+atexit.register(latency_model.save)
+
+class AdaptiveWait:
+    """NEW - WebDriverWait-compatible wait whose timeout comes from the latency model"""
+
+    def __init__(self, driver, site, operation="element"):
+        self.driver = driver
+        self.site = site
+        self.operation = operation
+
+    def until(self, method, message=''):
+        timeout = latency_model.timeout(self.site, self.operation)
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout).until(method, message)
+        except TimeoutException:
+            latency_model.observe(self.site, self.operation, time.monotonic() - started, timed_out=True)
+            raise
+        latency_model.observe(self.site, self.operation, time.monotonic() - started)
+        return result
+
+# ============================================================================
+# NEW: Circuit Breakers - Fail fast while an external portal is down
+# ============================================================================
+
+class PortalUnavailable(Exception):
+    """NEW - A required portal's circuit is open; the job should be deferred, not failed"""
+
+class AccountUnavailable(PortalUnavailable):
+    """NEW - The session's Genesis account cannot log in; retry the job on another account"""
+
+# Login page text -> account health state reported to the account pool (whole words only:
+# "locked" must not match "blocked" or "unlocked")
+LOGIN_PROBLEM_MARKERS = {
+    "locked_out": ["locked", "too many failed", "too many login attempts", "account has been disabled"],
+    "rate_limited": ["too many requests", "rate limit", "try again later", "unusual traffic"],
+    "bad_credentials": ["invalid login", "invalid password", "incorrect password", "invalid email",
+                        "invalid username"],
+}
+
+LOGIN_PROBLEM_PATTERNS = {state: re.compile(r"\b(?:" + "|".join(map(re.escape, markers)) + r")\b")
+                          for state, markers in LOGIN_PROBLEM_MARKERS.items()}
+
+def classify_login_problem(page_text):
+    """Account health state for a failed login page, or 'login_failed' when the page does not say"""
+    page_text = (page_text or "").lower()
+    for state, pattern in LOGIN_PROBLEM_PATTERNS.items():
+        if pattern.search(page_text):
+            return state
+    return "login_failed"
+
+class CircuitBreaker:
+    """
+    NEW - Per-portal breaker: closed -> open after consecutive failures
+    While open, dependent stages are skipped (NYC, Maps) or jobs are deferred
+    (Genesis). A background thread probes the portal over plain HTTP, with
+    growing intervals; once it answers, one trial job is let through
+    (half-open) and its outcome closes or reopens the circuit.
+    """
+
+    def __init__(self, name, probe_url, failure_threshold=3, probe_interval=30.0, max_probe_interval=300.0):
+        self.name = name
+        self.probe_url = probe_url
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.max_probe_interval = max_probe_interval
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.trips = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """True if a stage may use the portal now (takes the single half-open trial slot)"""
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def is_open(self):
+        with self.lock:
+            return self.state == "open" or (self.state == "half_open" and self.trial_running)
+
+    def record_success(self):
+        with self.lock:
+            if self.state != "closed":
+                logger.info(f"✅ Circuit for {self.name} closed - portal is answering again")
+            self.state, self.failures, self.trial_running = "closed", 0, False
+
+    def record_failure(self, reason="failure"):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                self.state = "open"
+                self.opened_at = time.time()
+                self.trips += 1
+                logger.error(f"🚫 Circuit for {self.name} OPEN after {self.failures} consecutive failures "
+                             f"({reason}) - failing fast and probing in the background")
+                threading.Thread(target=self._probe_loop, name=f"Probe-{self.name}", daemon=True).start()
+
+    def _probe_loop(self):
+        interval = self.probe_interval
+        while True:
+            time.sleep(interval)
+            with self.lock:
+                if self.state != "open":
+                    return
+            if self.probe():
+                with self.lock:
+                    if self.state == "open":
+                        self.state = "half_open"
+                logger.info(f"🔌 {self.name} answered a probe - letting one trial job through")
+                return
+            interval = min(self.max_probe_interval, interval * 2)
+
+    def probe(self):
+        """Lightweight HTTP check of the portal (no browser)"""
+        import urllib.request
+        request = urllib.request.Request(self.probe_url, headers={"User-Agent": "Mozilla/5.0"})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status < 500
+        except urllib.error.HTTPError as e:
+            return e.code < 500
+        except Exception:
+            return False
+
+    def release_trial(self):
+        """Give the half-open trial slot back when the trial job stopped without an outcome"""
+        with self.lock:
+            self.trial_running = False
+
+    def status(self):
+        with self.lock:
+            return {"state": self.state, "consecutive_failures": self.failures, "trips": self.trips,
+                    "open_for_seconds": round(time.time() - self.opened_at) if self.state != "closed" else 0}
+
+circuit_breakers = {
+    "nyc": CircuitBreaker("nyc", "https://propertyinformationportal.nyc.gov/"),
+    "maps": CircuitBreaker("maps", "https://www.google.com/maps"),
+    "genesis": CircuitBreaker("genesis", "https://genesisgenpad.com/"),
+}
+
+# ============================================================================
+# NEW: Shared cache files - Read-merge-write under a cross-process lock
+# ============================================================================
+
+@contextlib.contextmanager
+def cache_file_lock(path):
+    """NEW - Exclusive lock on path + '.lock' held across processes (released if the holder dies)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a+b") as handle:
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        elif msvcrt:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 s; keep waiting
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            elif msvcrt:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+def write_json_atomic(path, data):
+    """NEW - Write through a temp file and os.replace so readers never see a partial file"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+# ============================================================================
+# NEW: NYC Property Record Cache - Structured portal data per BBL
+# ============================================================================
+
+DEFAULT_PROPERTY_CACHE_PATH = os.path.join(os.getcwd(), "genesis_reports", "nyc_property_cache.json")
+
+PROPERTY_FIELD_PATTERNS = {
+    "owner": r"Owner(?: Name)?\s*[:\n]\s*([^\n]+)",
+    "tax_class": r"Tax Class\s*[:\n]\s*([0-4][A-Z0-9]?)\b",
+    "building_class": r"Building Class\s*[:\n]\s*([A-Z][0-9A-Z]?)\b",
+}
+ASSESSED_VALUE_PATTERN = (r"((?:Actual |Billable |Transitional )?(?:Assessed|Market|Taxable) Value)"
+                          r"[^\n$\d]*[:\n]?\s*\$?\s*(\d[\d,]*)")
+
+def extract_property_record(page_text, account_url):
+    """Parse owner, tax class and assessed values out of the Property Tax Account page text"""
+    record = {"account_url": account_url, "assessed_values": {}}
+    for field, pattern in PROPERTY_FIELD_PATTERNS.items():
+        match = re.search(pattern, page_text or "", re.IGNORECASE)
+        record[field] = match.group(1).strip() if match else None
+    for label, value in re.findall(ASSESSED_VALUE_PATTERN, page_text or "", re.IGNORECASE):
+        record["assessed_values"].setdefault(label.strip().title(), int(value.replace(",", "")))
+    return record
+
+class PropertyRecordCache:
+    """
+    NEW - Local cache of NYC Property Information Portal records per BBL
+    Serves repeat lookups instantly and lets the NYC tab open straight on
+    the cached Property Tax Account URL
+    """
+
+    def __init__(self, cache_path=DEFAULT_PROPERTY_CACHE_PATH, ttl_hours=24 * 7):
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.lock = threading.Lock()
+        self.records = self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            nyc_logger.warning(f"Could not read property cache {self.cache_path}: {e}")
+        return {}
+
+    def _save(self, update):
+        """Apply update(records) to the file's current contents under the file lock, so
+        records other processes wrote since we loaded are kept; we then adopt the merge"""
+        update(self.records)
+        try:
+            with cache_file_lock(self.cache_path):
+                records = self._load()
+                update(records)
+                write_json_atomic(self.cache_path, records)
+            self.records = records
+        except Exception as e:
+            nyc_logger.warning(f"Could not write property cache {self.cache_path}: {e}")
+
+    @staticmethod
+    def bbl_key(borough, block, lot):
+        return f"{ResultCache.canonical_borough(borough)}|{str(block).strip()}|{str(lot).strip()}"
+
+    def lookup(self, borough, block, lot):
+        """Return a fresh record for this BBL, or None"""
+        with self.lock:
+            record = self.records.get(self.bbl_key(borough, block, lot))
+        if record and time.time() - record.get("fetched_at", 0) <= self.ttl_seconds:
+            return record
+        return None
+
+    def store(self, borough, block, lot, record):
+        record = dict(record, bbl=self.bbl_key(borough, block, lot), fetched_at=time.time())
+        with self.lock:
+            self._save(lambda records: records.update({record["bbl"]: record}))
+        nyc_logger.info(f"🏢 💾 Cached property record: owner={record.get('owner')}, tax class={record.get('tax_class')}")
+        return record
+
+def normalize_tax_class(tax_class):
+    """'2A', 'Class 2', '2' -> '2' (None if no class digit)"""
+    match = re.search(r'[0-4]', str(tax_class or ""))
+    return match.group(0) if match else None
+
+def effective_search_params(tax_class=None, property_record=None):
+    """Search parameters for a property: portal tax class first, then the Airtable value"""
+    portal_class = normalize_tax_class((property_record or {}).get("tax_class"))
+    resolved_class = portal_class or normalize_tax_class(tax_class)
+    if not resolved_class:
+        return GENESIS_SEARCH_PARAMS
+    return dict(GENESIS_SEARCH_PARAMS, tax_class=resolved_class)
+
+# ============================================================================
+# NYC PROPERTY PORTAL AUTOMATION (ENHANCED - property cache, learned waits, portal errors)
 # ============================================================================
 
 class NYCPropertyPortalAutomation:
     """
-    NYC Property Portal automation that runs FIRST, then GENESIS runs
+    ENHANCED - NYC Property Portal automation that runs FIRST, then GENESIS runs
     Uses the same browser session but completely independent
-    100% WORKING CODE - NO CHANGES
+    A BBL in the property cache opens its Property Tax Account page directly; waits use
+    the learned NYC latency, and portal_error tells portal failures apart for the circuit breaker
     """
     
-    def __init__(self, driver, borough, block, lot):
+    def __init__(self, driver, borough, block, lot, property_cache=None):
         self.driver = driver
         self.borough = borough
         self.block = block
         self.lot = lot
-        self.wait = WebDriverWait(driver, 5)  # Fast timeouts
+        self.property_cache = property_cache
+        load_selenium()
+        self.wait = AdaptiveWait(driver, "nyc")  # Fast timeouts, learned from the portal's latency
+        self.portal_error = None  # NEW: set when a failure was the portal's (timeout, network, error page)
         
         # Borough mapping for NYC Portal
         self.borough_mapping = {
@@ -120,10 +859,10 @@ class NYCPropertyPortalAutomation:
         }
         
     def run_nyc_automation(self):
-        """Run NYC automation FIRST, then return control to GENESIS - 100% WORKING CODE"""
+        """ENHANCED - Run NYC automation FIRST, then return control to GENESIS (cached record when fresh)"""
         try:
-            logger.info("🏢 ===== NYC PROPERTY PORTAL AUTOMATION STARTING FIRST =====")
-            logger.info(f"🏢 Searching for: Borough={self.borough}, Block={self.block}, Lot={self.lot}")
+            nyc_logger.info("🏢 ===== NYC PROPERTY PORTAL AUTOMATION STARTING FIRST =====")
+            nyc_logger.info(f"🏢 Searching for: Borough={self.borough}, Block={self.block}, Lot={self.lot}")
             
             # Open new tab for NYC Portal
             self.driver.execute_script("window.open('');")
@@ -132,12 +871,23 @@ class NYCPropertyPortalAutomation:
             # Switch to NYC tab
             self.driver.switch_to.window(nyc_tab)
             
+            # NEW: Known BBL - open the cached Property Tax Account page directly
+            cached_record = self.property_cache.lookup(self.borough, self.block, self.lot) if self.property_cache else None
+            if cached_record:
+                return self.open_cached_record(cached_record)
+            
             # Navigate to NYC Property Portal
+            rate_governor.acquire("nyc")
+            started = time.monotonic()
             self.driver.get("https://propertyinformationportal.nyc.gov/")
-            logger.info("🏢 Navigated to NYC Property Information Portal")
+            nyc_logger.info("🏢 Navigated to NYC Property Information Portal")
             
             # Wait for page to load
             self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            if rate_governor.check_page(self.driver, "nyc"):
+                rate_governor.report_success("nyc", time.monotonic() - started)
+            else:
+                self.portal_error = "error page"
             time.sleep(1)
             
             # Step 1: Click Select dropdown
@@ -145,14 +895,14 @@ class NYCPropertyPortalAutomation:
                 EC.element_to_be_clickable((By.XPATH, "//button[text()='Select']"))
             )
             select_button.click()
-            logger.info("🏢 Clicked Select dropdown")
+            nyc_logger.info("🏢 Clicked Select dropdown")
             
             # Step 2: Select "Borough / Block / Lot" option
             bbl_option = self.wait.until(
                 EC.element_to_be_clickable((By.XPATH, "//button[text()='Borough / Block / Lot']"))
             )
             bbl_option.click()
-            logger.info("🏢 Selected Borough / Block / Lot option")
+            nyc_logger.info("🏢 Selected Borough / Block / Lot option")
             
             time.sleep(1)
             
@@ -167,9 +917,9 @@ class NYCPropertyPortalAutomation:
             if borough_normalized in self.borough_mapping:
                 borough_value = self.borough_mapping[borough_normalized]
                 select.select_by_value(borough_value)
-                logger.info(f"🏢 Selected borough: {self.borough} (value: {borough_value})")
+                nyc_logger.info(f"🏢 Selected borough: {self.borough} (value: {borough_value})")
             else:
-                logger.error(f"🏢 ❌ Unknown borough: {self.borough}")
+                nyc_logger.error(f"🏢 ❌ Unknown borough: {self.borough}")
                 return False
             
             # Step 4: Enter Block number
@@ -185,7 +935,7 @@ class NYCPropertyPortalAutomation:
             
             block_input.clear()
             block_input.send_keys(str(self.block))
-            logger.info(f"🏢 Entered block: {self.block}")
+            nyc_logger.info(f"🏢 Entered block: {self.block}")
             
             # Step 5: Enter Lot number (EXACT from Airtable)
             lot_inputs = self.driver.find_elements(By.XPATH, "//label[text()='Lot']/following-sibling::input | //label[text()='Lot']/..//input")
@@ -200,14 +950,15 @@ class NYCPropertyPortalAutomation:
             
             lot_input.clear()
             lot_input.send_keys(str(self.lot))
-            logger.info(f"🏢 Entered lot: {self.lot} (EXACT from Airtable)")
+            nyc_logger.info(f"🏢 Entered lot: {self.lot} (EXACT from Airtable)")
             
             # Step 6: Click Search button
             search_button = self.wait.until(
                 EC.element_to_be_clickable((By.XPATH, "//button[text()='Search']"))
             )
+            rate_governor.acquire("nyc")
             search_button.click()
-            logger.info("🏢 Clicked Search button")
+            nyc_logger.info("🏢 Clicked Search button")
             
             # Step 7: Wait for results
             time.sleep(2)
@@ -216,14 +967,17 @@ class NYCPropertyPortalAutomation:
             try:
                 error_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'BBL was not found')]")
                 if error_elements:
-                    logger.warning("🏢 ⚠️ BBL was not found - property does not exist")
+                    nyc_logger.warning("🏢 ⚠️ BBL was not found - property does not exist")
+                    if self.property_cache:
+                        self.property_cache.store(self.borough, self.block, self.lot,
+                                                  {"account_url": None, "not_found": True, "assessed_values": {}})
                     return True
             except:
                 pass
             
             # Step 8: FAST Property Tax Account link detection and click
             try:
-                logger.info("🏢 Looking for Property Tax Account link...")
+                nyc_logger.info("🏢 Looking for Property Tax Account link...")
                 tax_account_link = None
                 
                 # Quick text search
@@ -231,7 +985,7 @@ class NYCPropertyPortalAutomation:
                     tax_account_link = WebDriverWait(self.driver, 3).until(
                         EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Property Tax Account')]"))
                     )
-                    logger.info("🏢 ✅ Found Property Tax Account link")
+                    nyc_logger.info("🏢 ✅ Found Property Tax Account link")
                 except:
                     pass
                 
@@ -241,7 +995,7 @@ class NYCPropertyPortalAutomation:
                         tax_account_link = WebDriverWait(self.driver, 2).until(
                             EC.element_to_be_clickable((By.XPATH, "//p[contains(@class, 'bpptTs') and text()='Property Tax Account']/parent::a"))
                         )
-                        logger.info("🏢 ✅ Found Property Tax Account link (class method)")
+                        nyc_logger.info("🏢 ✅ Found Property Tax Account link (class method)")
                     except:
                         pass
                 
@@ -249,7 +1003,7 @@ class NYCPropertyPortalAutomation:
                 if not tax_account_link:
                     try:
                         tax_account_link = self.driver.find_element(By.XPATH, "/html/body/div/div/div/div[2]/div[1]/div/div[2]/div[2]/div[2]/div[1]/a[4]")
-                        logger.info("🏢 ✅ Found Property Tax Account link (exact XPath)")
+                        nyc_logger.info("🏢 ✅ Found Property Tax Account link (exact XPath)")
                     except:
                         pass
                 
@@ -258,60 +1012,108 @@ class NYCPropertyPortalAutomation:
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", tax_account_link)
                     try:
                         tax_account_link.click()
-                        logger.info("🏢 ✅ IMMEDIATELY clicked Property Tax Account link")
+                        nyc_logger.info("🏢 ✅ IMMEDIATELY clicked Property Tax Account link")
                     except:
                         self.driver.execute_script("arguments[0].click();", tax_account_link)
-                        logger.info("🏢 ✅ IMMEDIATELY clicked Property Tax Account link (JavaScript)")
+                        nyc_logger.info("🏢 ✅ IMMEDIATELY clicked Property Tax Account link (JavaScript)")
                     
                     time.sleep(2)
-                    logger.info("🏢 ✅ Property Tax Account page opened")
+                    nyc_logger.info("🏢 ✅ Property Tax Account page opened")
+                    
+                    # NEW: Keep the key fields for repeat lookups and the Genesis tax class
+                    if self.property_cache:
+                        self.cache_property_record()
                 else:
-                    logger.warning("🏢 ⚠️ Could not find Property Tax Account link")
+                    nyc_logger.warning("🏢 ⚠️ Could not find Property Tax Account link")
                 
             except Exception as e:
-                logger.warning(f"🏢 ⚠️ Error with Property Tax Account link: {e}")
+                nyc_logger.warning(f"🏢 ⚠️ Error with Property Tax Account link: {e}")
             
-            logger.info("🏢 ===== NYC AUTOMATION COMPLETED - RETURNING CONTROL TO GENESIS =====")
+            nyc_logger.info("🏢 ===== NYC AUTOMATION COMPLETED - RETURNING CONTROL TO GENESIS =====")
             
             # CRITICAL: Switch back to the first tab (GENESIS tab) before returning
             if len(self.driver.window_handles) > 1:
                 self.driver.switch_to.window(self.driver.window_handles[0])
-                logger.info("🏢 ✅ Switched back to GENESIS tab for GENESIS automation")
+                nyc_logger.info("🏢 ✅ Switched back to GENESIS tab for GENESIS automation")
             
             return True
             
         except Exception as e:
-            logger.error(f"🏢 ❌ NYC automation failed: {e}")
+            nyc_logger.error(f"🏢 ❌ NYC automation failed: {e}")
+            rate_governor.report_failure("nyc")
+            self.portal_error = self.portal_error or portal_failure(e)
             return False
+            
+    def cache_property_record(self):
+        """NEW - Extract owner, tax class and assessed values from the account page"""
+        try:
+            # The account page may open in its own tab
+            if self.driver.window_handles[-1] != self.driver.current_window_handle:
+                self.driver.switch_to.window(self.driver.window_handles[-1])
+            page_text = self.driver.execute_script("return document.body ? document.body.innerText : '';")
+            record = extract_property_record(page_text, self.driver.current_url)
+            self.property_cache.store(self.borough, self.block, self.lot, record)
+        except Exception as e:
+            nyc_logger.warning(f"🏢 ⚠️ Could not extract property record: {e}")
+            
+    def open_cached_record(self, record):
+        """NEW - Serve a known BBL from the cache: open its account page, skip the search clicks"""
+        nyc_logger.info(f"🏢 💾 CACHED property record: owner={record.get('owner')}, tax class={record.get('tax_class')}")
+        if record.get("account_url"):
+            rate_governor.acquire("nyc")
+            self.driver.get(record["account_url"])
+            nyc_logger.info("🏢 ✅ Opened cached Property Tax Account page")
+        else:
+            nyc_logger.warning("🏢 ⚠️ Cached: BBL was not found - property does not exist")
+        
+        if len(self.driver.window_handles) > 1:
+            self.driver.switch_to.window(self.driver.window_handles[0])
+            nyc_logger.info("🏢 ✅ Switched back to GENESIS tab for GENESIS automation")
+        return True
+
+def portal_failure(error):
+    """NEW - Why an exception means the site itself failed (timeout, network error), else None
+    Per-record problems (unknown borough, a missing field) are not the portal's fault."""
+    if TimeoutException and isinstance(error, TimeoutException):
+        return "timed out"
+    message = str(error).lower()
+    if "net::err_" in message or "timed out" in message or "timeout" in message:
+        return "network error"
+    return None
 
-def run_nyc_first(driver, borough, block, lot):
-    """Run NYC automation FIRST, then return control - 100% WORKING CODE"""
+def run_nyc_first(driver, borough, block, lot, property_cache=None):
+    """ENHANCED - Run NYC automation FIRST, then return control
+    Returns (success, portal error or None) - only portal errors count against the NYC circuit."""
     try:
-        nyc_automation = NYCPropertyPortalAutomation(driver, borough, block, lot)
-        nyc_automation.run_nyc_automation()
+        nyc_automation = NYCPropertyPortalAutomation(driver, borough, block, lot, property_cache)
+        return nyc_automation.run_nyc_automation(), nyc_automation.portal_error
     except Exception as e:
-        logger.error(f"NYC automation failed: {e}")
+        nyc_logger.error(f"NYC automation failed: {e}")
+        return False, None
 
 # ============================================================================
-# GOOGLE MAPS AUTOMATION (100% WORKING CODE - NO CHANGES)
+# GOOGLE MAPS AUTOMATION (ENHANCED - rate governed, learned waits, portal errors)
 # ============================================================================
 
 class GoogleMapsAutomation:
     """
-    Google Maps automation that opens with property address
-    100% WORKING CODE - NO CHANGES
+    ENHANCED - Google Maps automation that opens with property address
+    Page loads go through the rate governor and wait on the learned Maps latency;
+    portal_error tells Google's failures apart for the circuit breaker
     """
     
     def __init__(self, driver, property_address):
         self.driver = driver
         self.property_address = property_address
-        self.wait = WebDriverWait(driver, 5)
+        load_selenium()
+        self.wait = AdaptiveWait(driver, "maps")
+        self.portal_error = None  # NEW: set when a failure was Google's (timeout, network, error page)
         
     def run_google_maps_automation(self):
-        """Open Google Maps with property address - 100% WORKING CODE"""
+        """ENHANCED - Open Google Maps with property address; sets portal_error when Google fails"""
         try:
-            logger.info("🗺️ ===== GOOGLE MAPS AUTOMATION STARTING =====")
-            logger.info(f"🗺️ Opening Google Maps for address: {self.property_address}")
+            maps_logger.info("🗺️ ===== GOOGLE MAPS AUTOMATION STARTING =====")
+            maps_logger.info(f"🗺️ Opening Google Maps for address: {self.property_address}")
             
             # Open new tab for Google Maps
             self.driver.execute_script("window.open('');")
@@ -325,40 +1127,57 @@ class GoogleMapsAutomation:
             maps_url = f"https://www.google.com/maps/search/{encoded_address}"
             
             # Navigate to Google Maps
+            rate_governor.acquire("google")
+            started = time.monotonic()
             self.driver.get(maps_url)
-            logger.info("🗺️ Navigated to Google Maps with property address")
+            maps_logger.info("🗺️ Navigated to Google Maps with property address")
             
             # Wait for page to load
             self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            if rate_governor.check_page(self.driver, "google"):
+                rate_governor.report_success("google", time.monotonic() - started)
+            else:
+                self.portal_error = "error page"
             time.sleep(2)
             
-            logger.info("🗺️ ✅ Google Maps opened successfully")
-            logger.info("🗺️ ===== GOOGLE MAPS AUTOMATION COMPLETED =====")
+            maps_logger.info("🗺️ ✅ Google Maps opened successfully")
+            maps_logger.info("🗺️ ===== GOOGLE MAPS AUTOMATION COMPLETED =====")
             
             # Switch back to Genesis tab for Genesis automation
             if len(self.driver.window_handles) > 0:
                 self.driver.switch_to.window(self.driver.window_handles[0])
-                logger.info("🗺️ ✅ Switched back to GENESIS tab")
+                maps_logger.info("🗺️ ✅ Switched back to GENESIS tab")
             
             return True
             
         except Exception as e:
-            logger.error(f"🗺️ ❌ Google Maps automation failed: {e}")
+            maps_logger.error(f"🗺️ ❌ Google Maps automation failed: {e}")
+            rate_governor.report_failure("google")
+            self.portal_error = self.portal_error or portal_failure(e)
             return False
 
 # ============================================================================
-# ENHANCED LOT VALIDATION WITH SMART CHUNKED STRATEGY (100% WORKING CODE)
+# ENHANCED LOT VALIDATION WITH SMART CHUNKED STRATEGY
 # ============================================================================
 
 class LotValidator:
-    """ENHANCED - Lot validation with smart chunked search strategy - 100% WORKING CODE"""
+    """ENHANCED - Lot validation with smart chunked search strategy
+    Remembers rejected lots (resumed from the job journal) and lots already valid on the
+    block; probes are paced by the rate governor and polled for Genesis' verdict instead
+    of fixed sleeps, with before_probe as a scheduler stage boundary"""
     
     def __init__(self, driver, smart_form_filler):
         self.driver = driver
         self.smart_form_filler = smart_form_filler
+        load_selenium()
+        self.rejected_lots = set()  # NEW: lots already rejected (resumed from the job journal)
+        self.on_rejected = None     # NEW: callback(lot) when Genesis rejects a lot
+        self.before_probe = None    # NEW: callback() before each further probe (scheduler stage boundary)
+        self.valid_lots = set()     # NEW: lots already validated on this block by a neighbouring job
+        self.probes = 0             # NEW: Genesis validation round-trips for the current property
         
     def check_for_target_property_error(self):
-        """Check for red 'Target property does not exist' error message - 100% WORKING CODE"""
+        """ENHANCED - Check for red 'Target property does not exist' error message (logs through lot_logger)"""
         try:
             error_selectors = [
                 "//span[contains(@class, 'text-danger') and contains(text(), 'Target property does not exist')]",
@@ -371,23 +1190,51 @@ class LotValidator:
                 try:
                     error_element = self.driver.find_element(By.XPATH, selector)
                     if error_element.is_displayed():
-                        logger.info("❌ Found 'Target property does not exist' error")
+                        lot_logger.info("❌ Found 'Target property does not exist' error")
                         return True
                 except:
                     continue
                     
-            logger.info("✅ No 'Target property does not exist' error found")
+            lot_logger.info("✅ No 'Target property does not exist' error found")
             return False
             
         except Exception as e:
-            logger.warning(f"Error checking for target property error: {e}")
+            lot_logger.warning(f"Error checking for target property error: {e}")
             return False
             
+    # How often the page is checked for Genesis' verdict while a lot validates
+    VALIDATION_POLL_SECONDS = 0.25
+    
+    def wait_for_target_property_error(self, timeout):
+        """NEW - Poll until Genesis shows the lot error or the learned validation ceiling passes
+        Genesis shows nothing for a valid lot, so no error by the ceiling means the lot exists;
+        the ceiling is 2x p95 of how long rejections took to appear (3-15 s)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if any(element.is_displayed() for element in self.driver.find_elements(
+                        By.XPATH, "//*[contains(text(), 'Target property does not exist')]")):
+                    return True
+            except Exception:
+                pass
+            time.sleep(self.VALIDATION_POLL_SECONDS)
+        return self.check_for_target_property_error()
+    
     def test_lot_number(self, lot_number):
-        """Test a specific lot number with anti-bot measures - 100% WORKING CODE"""
-        logger.info(f"🧪 Testing lot number: {lot_number}")
+        """Test a specific lot number, paced by the shared rate governor"""
+        lot_logger.info(f"🧪 Testing lot number: {lot_number}")
+        
+        if lot_number in self.valid_lots:
+            # NEW: Validated earlier on this block - enter it without waiting for Genesis to re-check
+            lot_logger.info(f"🏘️ Lot {lot_number} already validated on this block - skipping the validation wait")
+            return self.smart_form_filler.set_field_value("TargetLot", str(lot_number), f"Lot {lot_number}")
         
         try:
+            # Anti-bot pacing is shared with every other Genesis worker
+            rate_governor.acquire("genesis")
+            started = time.monotonic()
+            self.probes += 1
+            
             # Step 1: Input the lot number
             if not self.smart_form_filler.set_field_value("TargetLot", str(lot_number), f"Lot {lot_number}"):
                 return False
@@ -397,36 +1244,46 @@ class LotValidator:
                 lot_field = self.driver.find_element(By.ID, "TargetLot")
                 self.driver.execute_script("arguments[0].blur();", lot_field)
                 self.driver.execute_script("document.body.click();")
-                logger.info(f"🔄 Exited lot field for lot {lot_number}")
+                lot_logger.info(f"🔄 Exited lot field for lot {lot_number}")
             except Exception as e:
-                logger.warning(f"Could not trigger blur for lot {lot_number}: {e}")
+                lot_logger.warning(f"Could not trigger blur for lot {lot_number}: {e}")
                 
-            # Step 3: Random wait (anti-bot measure)
-            wait_time = random.uniform(4, 6)  # Random 4-6 seconds
-            logger.info(f"⏳ Waiting {wait_time:.1f} seconds for Genesis to validate lot {lot_number}...")
-            time.sleep(wait_time)
+            # Step 3: Watch for Genesis' verdict, up to the learned validation ceiling
+            timeout = latency_model.timeout("genesis", "lot_validation")
+            lot_logger.info(f"⏳ Watching up to {timeout:.1f} seconds for Genesis to validate lot {lot_number}...")
+            blurred = time.monotonic()
             
             # Step 4: Check for error
-            has_error = self.check_for_target_property_error()
+            has_error = self.wait_for_target_property_error(timeout)
+            validation_seconds = time.monotonic() - blurred
+            if has_error:
+                latency_model.observe("genesis", "lot_validation", validation_seconds)
+            rate_governor.report_success("genesis", time.monotonic() - started - validation_seconds)
             
             if has_error:
-                logger.info(f"❌ Lot {lot_number}: 'Target property does not exist' - continuing search")
+                lot_logger.info(f"❌ Lot {lot_number}: 'Target property does not exist' - continuing search")
+                self.rejected_lots.add(lot_number)
+                if self.on_rejected:
+                    self.on_rejected(lot_number)
                 return False
             else:
-                logger.info(f"✅ Lot {lot_number}: Property exists! No error message found - VALID PROPERTY")
+                lot_logger.info(f"✅ Lot {lot_number}: Property exists! No error message found - VALID PROPERTY")
+                self.valid_lots.add(lot_number)
                 return True
                 
         except Exception as e:
-            logger.error(f"Error testing lot {lot_number}: {e}")
+            lot_logger.error(f"Error testing lot {lot_number}: {e}")
+            rate_governor.report_failure("genesis")
             return False
             
     def find_valid_lot(self, start_lot):
-        """SMART CHUNKED STRATEGY: Search in chunks as requested by user - 100% WORKING CODE"""
-        logger.info(f"🔍 STARTING SMART CHUNKED LOT SEARCH - Original lot: {start_lot}")
+        """ENHANCED - SMART CHUNKED STRATEGY: Search in chunks as requested by user
+        Lots already rejected are skipped and before_probe runs ahead of each further probe"""
+        lot_logger.info(f"🔍 STARTING SMART CHUNKED LOT SEARCH - Original lot: {start_lot}")
         
-        # Test original lot first
-        if self.test_lot_number(start_lot):
-            logger.info(f"🛑 STOPPING SEARCH - Original lot {start_lot} is valid")
+        # Test original lot first (unless a previous run already rejected it)
+        if start_lot not in self.rejected_lots and self.test_lot_number(start_lot):
+            lot_logger.info(f"🛑 STOPPING SEARCH - Original lot {start_lot} is valid")
             return start_lot
         
         # SMART CHUNKED STRATEGY as requested:
@@ -443,51 +1300,42 @@ class LotValidator:
         ]
         
         for start_range, end_range, description in search_chunks:
-            logger.info(f"🔍 Searching chunk: {description} (lots {start_range} to {end_range})")
+            lot_logger.info(f"🔍 Searching chunk: {description} (lots {start_range} to {end_range})")
             
             # Search this chunk
             if start_range <= end_range:  # Forward search
                 for lot in range(start_range, end_range + 1):
-                    if lot <= 0:  # Skip invalid lot numbers
+                    if lot <= 0 or lot in self.rejected_lots:  # Skip invalid or already rejected lot numbers
                         continue
+                    if self.before_probe:
+                        self.before_probe()
                     
-                    logger.info(f"🔍 Trying lot {lot} in chunk '{description}'")
+                    lot_logger.info(f"🔍 Trying lot {lot} in chunk '{description}'")
                     
                     if self.test_lot_number(lot):
-                        logger.info(f"🛑 STOPPING SEARCH - Found valid property at lot {lot}")
-                        logger.info(f"🔍 SMART CHUNKED SEARCH COMPLETE - Using lot: {lot}")
+                        lot_logger.info(f"🛑 STOPPING SEARCH - Found valid property at lot {lot}")
+                        lot_logger.info(f"🔍 SMART CHUNKED SEARCH COMPLETE - Using lot: {lot}")
                         return lot
-                    
-                    # Anti-bot pause every 10 attempts
-                    if (lot - start_range + 1) % 10 == 0:
-                        pause_time = random.uniform(2, 4)
-                        logger.info(f"⏸️ Anti-bot pause: {pause_time:.1f} seconds")
-                        time.sleep(pause_time)
                         
             else:  # Backward search
                 for lot in range(start_range, end_range - 1, -1):
-                    if lot <= 0:  # Skip invalid lot numbers
+                    if lot <= 0 or lot in self.rejected_lots:  # Skip invalid or already rejected lot numbers
                         continue
+                    if self.before_probe:
+                        self.before_probe()
                     
-                    logger.info(f"🔍 Trying lot {lot} in chunk '{description}'")
+                    lot_logger.info(f"🔍 Trying lot {lot} in chunk '{description}'")
                     
                     if self.test_lot_number(lot):
-                        logger.info(f"🛑 STOPPING SEARCH - Found valid property at lot {lot}")
-                        logger.info(f"🔍 SMART CHUNKED SEARCH COMPLETE - Using lot: {lot}")
+                        lot_logger.info(f"🛑 STOPPING SEARCH - Found valid property at lot {lot}")
+                        lot_logger.info(f"🔍 SMART CHUNKED SEARCH COMPLETE - Using lot: {lot}")
                         return lot
-                    
-                    # Anti-bot pause every 10 attempts
-                    if (start_range - lot + 1) % 10 == 0:
-                        pause_time = random.uniform(2, 4)
-                        logger.info(f"⏸️ Anti-bot pause: {pause_time:.1f} seconds")
-                        time.sleep(pause_time)
-            
-            # Pause between chunks
-            logger.info(f"✅ Completed chunk '{description}' - moving to next chunk")
-            time.sleep(random.uniform(1, 2))
+            
+            # Pacing between probes and chunks comes from the rate governor
+            lot_logger.info(f"✅ Completed chunk '{description}' - moving to next chunk")
                 
-        logger.warning(f"⚠️ Could not find valid lot in any chunk around {start_lot}")
-        logger.info(f"🔍 SMART CHUNKED SEARCH COMPLETE - Using original lot: {start_lot}")
+        lot_logger.warning(f"⚠️ Could not find valid lot in any chunk around {start_lot}")
+        lot_logger.info(f"🔍 SMART CHUNKED SEARCH COMPLETE - Using original lot: {start_lot}")
         return start_lot
 
 # ============================================================================
@@ -495,7 +1343,7 @@ class LotValidator:
 # ============================================================================
 
 class EnhancedBoroughDetector:
-    """PRESERVED - Enhanced borough detection system - NO CHANGES"""
+    """ENHANCED - Enhanced borough detection system (logs through borough_logger)"""
     
     BOROUGH_DATA = {
         "brooklyn": {
@@ -551,13 +1399,13 @@ class EnhancedBoroughDetector:
         self.discovered_mappings = {}
         
     def normalize_borough_name(self, borough_name):
-        """PRESERVED - NO CHANGES"""
+        """ENHANCED - Lower-case borough name with '_' and '-' as spaces"""
         if not borough_name:
             return ""
         return borough_name.lower().strip().replace("_", " ").replace("-", " ")
         
     def fuzzy_match_borough(self, input_borough, threshold=0.8):
-        """PRESERVED - NO CHANGES"""
+        """ENHANCED - (borough key, score) of the closest alias at or above threshold (logged to borough_logger)"""
         normalized_input = self.normalize_borough_name(input_borough)
         
         best_match = None
@@ -570,24 +1418,28 @@ class EnhancedBoroughDetector:
                     best_score = score
                     best_match = borough_key
                     
-        logger.info(f"Fuzzy match for '{input_borough}': {best_match} (score: {best_score:.2f})")
+        borough_logger.info(f"Fuzzy match for '{input_borough}': {best_match} (score: {best_score:.2f})")
         return best_match, best_score
         
-    def select_borough_with_enhanced_detection(self, target_borough, property_address=None, block=None):
-        """PRESERVED - Enhanced borough selection - NO CHANGES"""
-        logger.info(f"ENHANCED BOROUGH DETECTION: Selecting {target_borough}")
+    def select_borough_with_enhanced_detection(self, target_borough, property_address=None, block=None,
+                                               preferred_value=None):
+        """ENHANCED - Enhanced borough selection (tries preferred_value first when known)"""
+        borough_logger.info(f"ENHANCED BOROUGH DETECTION: Selecting {target_borough}")
         
         normalized_target = self.normalize_borough_name(target_borough)
         matched_borough, match_confidence = self.fuzzy_match_borough(target_borough, threshold=0.6)
         
         if not matched_borough:
-            logger.error(f"Could not match '{target_borough}' to any known borough")
+            borough_logger.error(f"Could not match '{target_borough}' to any known borough")
             return False
             
-        logger.info(f"Target borough '{target_borough}' matched to '{matched_borough}' (confidence: {match_confidence:.2f})")
+        borough_logger.info(f"Target borough '{target_borough}' matched to '{matched_borough}' (confidence: {match_confidence:.2f})")
         
+        load_selenium()
         borough_data = self.BOROUGH_DATA[matched_borough]
         values_to_try = borough_data["dropdown_values_to_try"]
+        if preferred_value:
+            values_to_try = [preferred_value] + [v for v in values_to_try if v != preferred_value]
         
         try:
             borough_dropdown = self.driver.find_element(By.ID, "Borough")
@@ -595,7 +1447,7 @@ class EnhancedBoroughDetector:
             
             for value in values_to_try:
                 try:
-                    logger.info(f"Testing borough value: {value} for {matched_borough}")
+                    borough_logger.info(f"Testing borough value: {value} for {matched_borough}")
                     
                     select.select_by_value(value)
                     time.sleep(1)
@@ -604,33 +1456,36 @@ class EnhancedBoroughDetector:
                     selected_text = selected_option.text.strip()
                     selected_value = selected_option.get_attribute('value')
                     
-                    logger.info(f"Value '{value}' selected: '{selected_text}' (value: {selected_value})")
+                    borough_logger.info(f"Value '{value}' selected: '{selected_text}' (value: {selected_value})")
                     
                     selected_match, selected_confidence = self.fuzzy_match_borough(selected_text, threshold=0.6)
                     
                     if selected_match == matched_borough and selected_confidence > 0.6:
-                        logger.info(f"SUCCESS: {matched_borough} selected with value '{value}' -> '{selected_text}'")
+                        borough_logger.info(f"SUCCESS: {matched_borough} selected with value '{value}' -> '{selected_text}'")
+                        self.discovered_mappings[matched_borough] = value
                         return True
                     else:
-                        logger.info(f"Value '{value}' selected '{selected_text}' (matched to {selected_match}), not {matched_borough}")
+                        borough_logger.info(f"Value '{value}' selected '{selected_text}' (matched to {selected_match}), not {matched_borough}")
                         
                 except Exception as e:
-                    logger.warning(f"Failed to test borough value '{value}': {str(e)}")
+                    borough_logger.warning(f"Failed to test borough value '{value}': {str(e)}")
                     continue
                     
-            logger.error(f"FAILED: Could not select {matched_borough} with any method")
+            borough_logger.error(f"FAILED: Could not select {matched_borough} with any method")
             return False
             
         except Exception as e:
-            logger.error(f"Error in enhanced borough selection: {str(e)}")
+            borough_logger.error(f"Error in enhanced borough selection: {str(e)}")
             return False
 
 class SmartFormFiller:
-    """PRESERVED - Smart form filling that only updates necessary fields - NO CHANGES"""
+    """ENHANCED - Smart form filling that only updates necessary fields
+    Logs through form_logger; get_select_options reads a select's options in one call"""
     
     def __init__(self, driver):
         self.driver = driver
         self.form_state = {}
+        load_selenium()
         
     def get_field_value(self, field_id):
         """Get current value of a form field"""
@@ -644,13 +1499,24 @@ class SmartFormFiller:
         except:
             return None
             
+    def get_select_options(self, field_id):
+        """NEW - (value, text) pairs of a select in one round trip"""
+        try:
+            return self.driver.execute_script("""
+                var select = document.getElementById(arguments[0]);
+                if (!select) { return []; }
+                return Array.prototype.map.call(select.options, function(o) { return [o.value, o.text.trim()]; });
+            """, field_id) or []
+        except Exception:
+            return []
+            
     def set_field_value(self, field_id, value, field_name):
         """Set field value only if it's different from current value"""
         try:
             current_value = self.get_field_value(field_id)
             
             if current_value == value:
-                logger.info(f"⏭️ {field_name}: Already set to '{value}' - skipping")
+                form_logger.info(f"⏭️ {field_name}: Already set to '{value}' - skipping")
                 return True
                 
             element = self.driver.find_element(By.ID, field_id)
@@ -658,22 +1524,22 @@ class SmartFormFiller:
             if element.tag_name == "select":
                 select = Select(element)
                 select.select_by_value(value)
-                logger.info(f"✅ {field_name}: Changed from '{current_value}' to '{value}'")
+                form_logger.info(f"✅ {field_name}: Changed from '{current_value}' to '{value}'")
             else:
                 element.clear()
                 element.send_keys(value)
-                logger.info(f"✅ {field_name}: Changed from '{current_value}' to '{value}'")
+                form_logger.info(f"✅ {field_name}: Changed from '{current_value}' to '{value}'")
                 
             time.sleep(1)
             return True
             
         except Exception as e:
-            logger.error(f"❌ {field_name}: Failed to set value '{value}': {e}")
+            form_logger.error(f"❌ {field_name}: Failed to set value '{value}': {e}")
             return False
             
     def fill_assessment_field_properly(self):
-        """PRESERVED - Fill Assessment field with proper validation - NO CHANGES"""
-        logger.info("🔧 FIXING Assessment field (ensuring value sticks)")
+        """ENHANCED - Fill Assessment field with proper validation (logs through form_logger)"""
+        form_logger.info("🔧 FIXING Assessment field (ensuring value sticks)")
         
         try:
             # Method 1: Enhanced hidden field approach with validation
@@ -710,13 +1576,13 @@ class SmartFormFiller:
                     # Validate the value stuck
                     final_value = visible_textbox.get_attribute('value')
                     if final_value == "1":
-                        logger.info("✅ Assessment Low: 1 (Method 1 - value validated)")
+                        form_logger.info("✅ Assessment Low: 1 (Method 1 - value validated)")
                         return True
                     else:
-                        logger.warning(f"⚠️ Assessment value didn't stick: got '{final_value}', expected '1'")
+                        form_logger.warning(f"⚠️ Assessment value didn't stick: got '{final_value}', expected '1'")
                         
             except Exception as e1:
-                logger.warning(f"Method 1 failed: {e1}")
+                form_logger.warning(f"Method 1 failed: {e1}")
                 
             # Method 2: Enhanced CSS selector approach with validation
             try:
@@ -750,13 +1616,13 @@ class SmartFormFiller:
                 # Validate the value stuck
                 final_value = assessment_textbox.get_attribute('value')
                 if final_value == "1":
-                    logger.info("✅ Assessment Low: 1 (Method 2 - value validated)")
+                    form_logger.info("✅ Assessment Low: 1 (Method 2 - value validated)")
                     return True
                 else:
-                    logger.warning(f"⚠️ Assessment value didn't stick: got '{final_value}', expected '1'")
+                    form_logger.warning(f"⚠️ Assessment value didn't stick: got '{final_value}', expected '1'")
                     
             except Exception as e2:
-                logger.warning(f"Method 2 failed: {e2}")
+                form_logger.warning(f"Method 2 failed: {e2}")
                 
             # Method 3: JavaScript direct value setting with validation
             try:
@@ -781,75 +1647,1013 @@ class SmartFormFiller:
                 """)
                 
                 if success:
-                    logger.info("✅ Assessment Low: 1 (Method 3 - JavaScript validated)")
+                    form_logger.info("✅ Assessment Low: 1 (Method 3 - JavaScript validated)")
                     return True
                     
             except Exception as e3:
-                logger.warning(f"Method 3 failed: {e3}")
+                form_logger.warning(f"Method 3 failed: {e3}")
                 
-            logger.error("❌ All Assessment field methods failed")
+            form_logger.error("❌ All Assessment field methods failed")
             return False
             
         except Exception as e:
-            logger.error(f"❌ Assessment field completely failed: {e}")
+            form_logger.error(f"❌ Assessment field completely failed: {e}")
             return False
 
-class InfiniteGenesisAutomation:
-    """INFINITE - Genesis automation that keeps Python script running indefinitely"""
-    
-    def __init__(self, username, password):
-        self.username = username
-        self.password = password
-        self.driver = None
-        self.wait = None
-        self.current_distance = 0.5
-        self.borough_detector = None
-        self.smart_form_filler = None
-        self.lot_validator = None
-        self.form_initialized = False
-        
-    def setup_driver(self):
-        """PRESERVED - Initialize Chrome driver - NO CHANGES"""
-        logger.info("====== WebDriver manager ======")
-        
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        download_dir = os.path.join(os.getcwd(), "genesis_reports")
-        prefs = {
-            "download.default_directory": download_dir,
-            "download.prompt_for_download": False,
-            "download.directory_upgrade": True,
-            "safebrowsing.enabled": True
+# ============================================================================
+# NEW: Result Cache - Memoizes search results and reports per property
+# ============================================================================
+
+# Genesis search parameters - shared by the form setup and the result cache key
+GENESIS_SEARCH_PARAMS = {
+    "comparison_type": "2",   # Distance
+    "distance_unit": "2",     # Miles
+    "radius": 0.5,
+    "tax_class": "3",
+    "year_built_low": "2015",
+    "year_built_high": "2022",
+    "assessment_low": "1",
+    "sort_order": "2",
+}
+
+DEFAULT_RESULT_CACHE_PATH = os.path.join(os.getcwd(), "genesis_reports", "genesis_result_cache.json")
+
+class ResultCache:
+    """
+    NEW - Memoizes Genesis search results per property and parameter set
+    Entries hold the record count and report path and expire after a TTL,
+    so re-fired Airtable triggers can skip the whole browser pipeline
+    """
+
+    def __init__(self, cache_path=DEFAULT_RESULT_CACHE_PATH, ttl_hours=24):
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self):
+        """Load cache file, starting empty if it is missing or unreadable"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            data.setdefault("results", {})
+            data.setdefault("lot_aliases", {})
+            return data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not read result cache {self.cache_path}: {e}")
+        return {"results": {}, "lot_aliases": {}}
+
+    def _save(self, update):
+        """Apply update(data) to the file's current contents under the file lock and write it
+        atomically, so concurrent runs merge their entries instead of overwriting each other"""
+        update(self.data)
+        try:
+            with cache_file_lock(self.cache_path):
+                data = self._load()
+                update(data)
+                write_json_atomic(self.cache_path, data)
+            self.data = data
+        except Exception as e:
+            logger.warning(f"Could not write result cache {self.cache_path}: {e}")
+
+    BOROUGH_KEYS = {alias: key for key, borough_data in EnhancedBoroughDetector.BOROUGH_DATA.items()
+                    for alias in borough_data["aliases"]}
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def canonical_borough(borough):
+        """Map any borough spelling to its BOROUGH_DATA key - alias table first, other
+        spellings fuzzy-matched once (quietly) and remembered"""
+        normalized = (borough or "").lower().strip().replace("_", " ").replace("-", " ")
+        if normalized in ResultCache.BOROUGH_KEYS:
+            return ResultCache.BOROUGH_KEYS[normalized]
+        score, key = max((SequenceMatcher(None, normalized, alias).ratio(), key)
+                         for alias, key in ResultCache.BOROUGH_KEYS.items())
+        return key if score >= 0.6 else normalized
+
+    def _bbl_key(self, borough, block, lot):
+        return f"{self.canonical_borough(borough)}|{str(block).strip()}|{str(lot).strip()}"
+
+    def make_key(self, borough, block, lot, search_params=None):
+        """Build the cache key from the property and every form parameter that affects results"""
+        params = search_params or GENESIS_SEARCH_PARAMS
+        param_part = "|".join(f"{name}={params[name]}" for name in sorted(params))
+        return f"{self._bbl_key(borough, block, lot)}|{param_part}"
+
+    def resolve_lot(self, borough, block, lot):
+        """Return the lot a previous run resolved the requested lot to (or the lot itself)"""
+        with self.lock:
+            return self.data["lot_aliases"].get(self._bbl_key(borough, block, lot), str(lot).strip())
+
+    def lookup(self, borough, block, lot, search_params=None):
+        """Return a fresh cached result for this property, or None"""
+        resolved_lot = self.resolve_lot(borough, block, lot)
+        key = self.make_key(borough, block, resolved_lot, search_params)
+
+        with self.lock:
+            entry = self.data["results"].get(key)
+
+        if not entry:
+            return None
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            logger.info(f"💾 Cached result for {key} expired")
+            return None
+        report_path = entry.get("report_path")
+        if report_path and not os.path.exists(report_path):
+            logger.info(f"💾 Cached report no longer exists: {report_path}")
+            return None
+
+        return entry
+
+    def store(self, borough, block, requested_lot, resolved_lot, record_count, report_path,
+              record_id=None, search_params=None):
+        """Remember a completed search and the lot it resolved to"""
+        key = self.make_key(borough, block, resolved_lot, search_params)
+        entry = {
+            "record_count": record_count,
+            "report_path": report_path,
+            "resolved_lot": str(resolved_lot),
+            "record_id": record_id,
+            "created_at": time.time(),
         }
-        chrome_options.add_experimental_option("prefs", prefs)
-        
-        os.makedirs(download_dir, exist_ok=True)
-        
-        # Use local Chrome installation instead of downloading driver
-        service = Service()  # Let Selenium find Chrome automatically
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 15)
-        
-        self.borough_detector = EnhancedBoroughDetector(self.driver)
-        self.smart_form_filler = SmartFormFiller(self.driver)
-        self.lot_validator = LotValidator(self.driver, self.smart_form_filler)
-        
-        logger.info("Chrome driver initialized successfully")
-        
-    def login_to_genesis(self):
-        """PRESERVED - Login to Genesis GenPAD - NO CHANGES"""
-        logger.info("Navigating to Genesis GenPAD and logging in")
-        
-        self.driver.get("https://genesisgenpad.com/comparison/main")
-        time.sleep(3)
+        alias_key = self._bbl_key(borough, block, requested_lot)
+
+        def update(data):
+            data["lot_aliases"][alias_key] = str(resolved_lot)
+            data["results"][key] = entry
+
+        with self.lock:
+            self._save(update)
+        logger.info(f"💾 Cached result: {record_count} records -> {report_path}")
+        return entry
+
+# ============================================================================
+# NEW: Locality - Properties on the same borough/block share form state and lot probes
+# ============================================================================
+
+def locality_key(borough, block):
+    """NEW - (borough, block) shared by neighbouring properties on one tax block"""
+    return (ResultCache.canonical_borough(borough), str(block).strip())
+
+class BlockLotKnowledge:
+    """
+    NEW - Lot probe outcomes per (borough, block), kept on a browser session
+    Whether Genesis knows a lot does not depend on the job asking, so later
+    jobs on the same block skip lots already rejected and the settle wait
+    for lots already validated.
+    """
+    
+    def __init__(self, max_blocks=64):
+        self.max_blocks = max_blocks
+        self.blocks = {}
         
-        try:
+    def for_block(self, locality):
+        """Shared {"valid": set, "rejected": set} for a block; probes update the sets in place"""
+        knowledge = self.blocks.pop(locality, None) or {"valid": set(), "rejected": set()}
+        self.blocks[locality] = knowledge  # most recently used last
+        while len(self.blocks) > self.max_blocks:
+            self.blocks.pop(next(iter(self.blocks)))
+        return knowledge
+
+# ============================================================================
+# NEW: Job Journal - Checkpoints completed stages so interrupted runs resume
+# ============================================================================
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.getcwd(), "genesis_reports", "journal")
+
+class JobPreempted(Exception):
+    """NEW - Raised at a stage boundary when a scheduler hands the browser to a more urgent job"""
+
+class JobJournal:
+    """
+    NEW - Per-job checkpoint journal stored as JSON next to the reports
+    Records the outputs of stages whose result outlives the browser (borough
+    dropdown value, resolved lot, rejected lot probes) so a rerun after a crash
+    or Ctrl+C skips that work. Tabs, login and the results page die with the
+    browser, so NYC, Maps, login and search always run again (NYC opens the
+    cached account page directly). The file is removed once the job completes.
+    """
+
+    STAGES = ["borough", "lot_search"]
+
+    def __init__(self, record_id, borough, block, lot, journal_dir=DEFAULT_JOURNAL_DIR):
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', str(record_id))
+        self.path = os.path.join(journal_dir, f"{safe_id}.json")
+        self.bbl = [str(borough).strip().lower(), str(block).strip(), str(lot).strip()]
+        self.data = self._load(record_id)
+
+    def _load(self, record_id):
+        """Load an unfinished journal for the same property, else start fresh"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("bbl") == self.bbl:
+                done = [stage for stage in self.STAGES if stage in data.get("stages", {})]
+                logger.info(f"📒 Resuming record {record_id} - completed stages: {', '.join(done) or 'none'}")
+                return data
+            logger.info(f"📒 Journal for record {record_id} was for another property - starting fresh")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not read job journal {self.path}: {e}")
+        return {"record_id": str(record_id), "bbl": self.bbl, "stages": {}, "rejected_lots": []}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            write_json_atomic(self.path, self.data)
+        except Exception as e:
+            logger.warning(f"Could not write job journal {self.path}: {e}")
+
+    def is_done(self, stage):
+        return stage in self.data["stages"]
+
+    def get(self, stage):
+        """Outputs recorded for a completed stage ({} if not completed)"""
+        return self.data["stages"].get(stage, {})
+
+    def complete(self, stage, **outputs):
+        outputs["completed_at"] = time.time()
+        self.data["stages"][stage] = outputs
+        self._save()
+
+    def record_rejected_lot(self, lot):
+        if lot not in self.data["rejected_lots"]:
+            self.data["rejected_lots"].append(lot)
+            self._save()
+
+    def rejected_lots(self):
+        return set(self.data["rejected_lots"])
+
+    def finish(self):
+        """Job completed - the journal is no longer needed"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not remove job journal {self.path}: {e}")
+
+def lookup_cached_result(result_cache, property_cache, borough, block, lot, tax_class):
+    """Cached result for a property under the search parameters it would run with"""
+    property_record = property_cache.lookup(borough, block, lot) if property_cache else None
+    return result_cache.lookup(borough, block, lot, effective_search_params(tax_class, property_record))
+
+def open_report_file(report_path):
+    """Open an existing report with its default application"""
+    try:
+        if hasattr(os, "startfile"):
+            os.startfile(report_path)
+        else:
+            subprocess.Popen(["xdg-open", report_path])
+        logger.info(f"📂 Reopened cached report: {report_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to open report '{report_path}': {e}")
+        return False
+
+# ============================================================================
+# NEW: Single-flight - One automation per record/BBL across CLI processes
+# ============================================================================
+
+DEFAULT_INFLIGHT_DIR = os.path.join(os.getcwd(), "genesis_reports", "inflight")
+
+class SingleFlight:
+    """
+    NEW - In-flight markers (one lock file per record_id and per BBL)
+    Duplicate triggers for a property already being processed wait for the
+    running automation and then answer from the result cache instead of
+    starting another Chrome. Locks of dead processes, or older than
+    stale_seconds, are taken over.
+    """
+    
+    def __init__(self, record_id, borough, block, lot, inflight_dir=DEFAULT_INFLIGHT_DIR, stale_seconds=1800):
+        safe = lambda value: re.sub(r'[^A-Za-z0-9_.-]', '_', str(value))
+        self.paths = [os.path.join(inflight_dir, f"record-{safe(record_id)}.lock"),
+                      os.path.join(inflight_dir, f"bbl-{safe(PropertyRecordCache.bbl_key(borough, block, lot))}.lock")]
+        self.record_id = record_id
+        self.stale_seconds = stale_seconds
+        self.held = []
+        self.holder = None
+        os.makedirs(inflight_dir, exist_ok=True)
+        
+    def _read(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+            
+    def _is_stale(self, path):
+        info = self._read(path)
+        if info is None:
+            return True  # half-written or unreadable marker
+        if time.time() - info.get("started", 0) > self.stale_seconds:
+            return True
+        pid = info.get("pid", -1)
+        if psutil is not None:
+            return not psutil.pid_exists(pid)
+        if os.name == "nt":
+            return False  # os.kill(pid, 0) would send CTRL_C_EVENT on Windows; rely on age
+        try:
+            os.kill(pid, 0)
+            return False
+        except ProcessLookupError:
+            return True
+        except OSError:
+            return False
+        
+    def acquire(self):
+        """Create every marker, or none; False (with self.holder set) if another run holds one"""
+        marker = json.dumps({"pid": os.getpid(), "record_id": str(self.record_id), "started": time.time()})
+        for path in self.paths:
+            for _ in range(2):
+                try:
+                    fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        f.write(marker)
+                    self.held.append(path)
+                    break
+                except FileExistsError:
+                    if not self._is_stale(path):
+                        self.holder = self._read(path)
+                        self.release()
+                        return False
+                    logger.warning(f"🔗 Taking over stale in-flight marker {os.path.basename(path)}")
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+            else:
+                self.release()
+                return False
+        atexit.register(self.release)
+        return True
+        
+    def wait(self, timeout=1800, poll_seconds=2):
+        """Block until the other run's markers are gone (or stale); False on timeout"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if all(not os.path.exists(path) or self._is_stale(path) for path in self.paths):
+                return True
+            time.sleep(poll_seconds)
+        return False
+        
+    def release(self):
+        while self.held:
+            try:
+                os.remove(self.held.pop())
+            except FileNotFoundError:
+                pass
+
+# ============================================================================
+# NEW: Browser Memory Governor - Keeps long-lived Chrome sessions flat
+# ============================================================================
+
+class BrowserMemoryGovernor:
+    """
+    NEW - Watches the driver's Chrome process tree and tab count
+    Trims surplus tabs at any time, and recycles the browser between jobs
+    (with session restore) once memory or job-count thresholds are exceeded.
+    Memory monitoring needs psutil; without it only tabs and job count are governed.
+    """
+
+    def __init__(self, automation, max_rss_mb=1500, max_tabs=6, max_jobs_per_browser=200):
+        self.automation = automation
+        self.max_rss_mb = max_rss_mb
+        self.max_tabs = max_tabs
+        self.max_jobs_per_browser = max_jobs_per_browser
+        self.jobs_since_restart = 0
+        self.last_rss_mb = None
+        if psutil is None:
+            logger.info("🧠 psutil not installed - browser memory governor limited to tabs and job count")
+
+    def chrome_rss_mb(self):
+        """Resident memory of chromedriver and every Chrome process it started (None if unknown)"""
+        if psutil is None:
+            return None
+        try:
+            root = psutil.Process(self.automation.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            self.last_rss_mb = total / (1024 * 1024)
+            return self.last_rss_mb
+        except Exception:
+            return None
+
+    def trim_tabs(self):
+        """Close the oldest extra tabs, always keeping the GENESIS tab (first) and the newest ones"""
+        try:
+            driver = self.automation.driver
+            handles = driver.window_handles
+            if len(handles) <= self.max_tabs:
+                return 0
+            current = driver.current_window_handle
+            surplus = handles[1:len(handles) - self.max_tabs + 1]
+            for handle in surplus:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(current if current not in surplus else handles[0])
+            logger.info(f"🧠 Closed {len(surplus)} old tabs ({len(handles) - len(surplus)} open)")
+            return len(surplus)
+        except Exception as e:
+            logger.warning(f"🧠 Could not trim tabs: {e}")
+            return 0
+
+    def check(self, between_jobs=True):
+        """Enforce limits; the browser is only recycled between jobs"""
+        self.trim_tabs()
+        if between_jobs:
+            self.jobs_since_restart += 1
+
+        rss_mb = self.chrome_rss_mb()
+        reason = None
+        if rss_mb is not None and rss_mb > self.max_rss_mb:
+            reason = f"Chrome memory {rss_mb:.0f} MB > {self.max_rss_mb} MB"
+        elif self.max_jobs_per_browser and self.jobs_since_restart >= self.max_jobs_per_browser:
+            reason = f"{self.jobs_since_restart} jobs since last restart"
+
+        if reason is None:
+            return False
+        if not between_jobs:
+            logger.warning(f"🧠 {reason} - will recycle the browser at the next job boundary")
+            return False
+
+        logger.info(f"🧠 Recycling browser: {reason}")
+        if self.automation.restart_browser():
+            self.jobs_since_restart = 0
+            return True
+        return False
+
+# ============================================================================
+# NEW: WebDriver Command Accounting - Count and time every round trip per call site
+# ============================================================================
+
+DEFAULT_COMMAND_REPORT_DIR = os.path.join(os.getcwd(), "genesis_reports", "webdriver_calls")
+
+class WebDriverCommandAccountant:
+    """
+    NEW - Opt-in wrapper around driver.execute
+    Every WebDriver command (element lookups and WebElement calls included) is counted
+    and timed, tagged with the nearest Class.method of ours on the call stack.
+    """
+
+    # Helpers that only forward driver calls - the site is whoever called them
+    TRANSPARENT_CALLERS = {"AdaptiveWait", "WebDriverCommandAccountant"}
+
+    def __init__(self, report_dir=DEFAULT_COMMAND_REPORT_DIR):
+        self.report_dir = report_dir
+        self.calls = {}  # (site, command) -> [count, seconds]
+        self.lock = threading.Lock()
+
+    def install(self, driver):
+        """Shadow driver.execute on this driver instance (call again after a browser restart)"""
+        original = type(driver).execute.__get__(driver)
+
+        def execute(driver_command, params=None):
+            site = self.call_site()
+            started = time.perf_counter()
+            try:
+                return original(driver_command, params)
+            finally:
+                self.record(site, driver_command, time.perf_counter() - started)
+
+        driver.execute = execute
+
+    def call_site(self):
+        frame = sys._getframe(2)
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            code = frame.f_code
+            if not module.startswith("selenium") and not code.co_name.startswith("<"):
+                owner = frame.f_locals.get("self")
+                owner_name = type(owner).__name__ if owner is not None else None
+                if owner_name not in self.TRANSPARENT_CALLERS:
+                    return f"{owner_name}.{code.co_name}" if owner_name else code.co_name
+            frame = frame.f_back
+        return "unknown"
+
+    def record(self, site, command, seconds):
+        with self.lock:
+            entry = self.calls.setdefault((site, command), [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def reset(self):
+        with self.lock:
+            self.calls = {}
+
+    def report(self, top=15):
+        with self.lock:
+            calls = dict(self.calls)
+        sites = {}
+        commands = {}
+        for (site, command), (count, seconds) in calls.items():
+            summary = sites.setdefault(site, {"site": site, "calls": 0, "seconds": 0.0, "commands": {}})
+            summary["calls"] += count
+            summary["seconds"] += seconds
+            summary["commands"][command] = {"calls": count, "seconds": round(seconds, 3)}
+            by_command = commands.setdefault(command, {"calls": 0, "seconds": 0.0})
+            by_command["calls"] += count
+            by_command["seconds"] += seconds
+        ranked = sorted(sites.values(), key=lambda summary: summary["seconds"], reverse=True)
+        for summary in ranked:
+            summary["seconds"] = round(summary["seconds"], 3)
+        return {
+            "total_calls": sum(count for count, _ in calls.values()),
+            "total_seconds": round(sum(seconds for _, seconds in calls.values()), 3),
+            "by_command": {command: {"calls": value["calls"], "seconds": round(value["seconds"], 3)}
+                           for command, value in sorted(commands.items(), key=lambda item: -item[1]["seconds"])},
+            "top_sites": ranked[:top],
+        }
+
+    def write_report(self, record_id, top=15):
+        """Log the most expensive call sites and save the job's report as JSON"""
+        report = self.report(top)
+        report["record_id"] = record_id
+        logger.info(f"📡 WebDriver: {report['total_calls']} commands, {report['total_seconds']:.1f}s for record {record_id}")
+        for summary in report["top_sites"][:5]:
+            busiest = max(summary["commands"], key=lambda command: summary["commands"][command]["seconds"])
+            logger.info(f"📡   {summary['site']}: {summary['calls']} calls, {summary['seconds']:.1f}s "
+                        f"(mostly {busiest})")
+        os.makedirs(self.report_dir, exist_ok=True)
+        path = os.path.join(self.report_dir, f"{record_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        return path
+
+# ============================================================================
+# NEW: Search Response Capture - Genesis results read from Chrome's network log
+# ============================================================================
+
+# Requests after RUN that may carry the search result, and the resource types worth opening
+SEARCH_RESPONSE_URL_PATTERN = re.compile(r"genesisgenpad\.com/.*(search|comparison|result|run)", re.I)
+SEARCH_RESPONSE_TYPES = ("XHR", "Fetch", "Document")
+# JSON keys (lower case, letters only) holding the Records Selected count. A response without
+# one is not a search result: a bare "total" or a row list belongs to any paged Genesis endpoint
+RECORD_COUNT_KEYS = ("recordsselected", "recordcount", "totalrecords", "recordstotal")
+ROW_LIST_KEYS = ("rows", "records", "data", "results", "comparables", "items")
+
+def _letters(key):
+    return re.sub(r'[^a-z]', '', str(key).lower())
+
+def _count_value(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.replace(',', '').strip().isdigit():
+        return int(value.replace(',', ''))
+    return None
+
+def _find_count(data, keys, depth=0):
+    """First count under one of `keys` in nested JSON objects (rows are not searched)"""
+    if not isinstance(data, dict) or depth > 4:
+        return None
+    by_key = {_letters(key): value for key, value in data.items()}
+    for key in keys:
+        count = _count_value(by_key.get(key))
+        if count is not None:
+            return count
+    for value in data.values():
+        count = _find_count(value, keys, depth + 1)
+        if count is not None:
+            return count
+    return None
+
+def _find_rows(data, depth=0):
+    """The result rows: a list of objects, top level or under a rows/records/data... key"""
+    if isinstance(data, list):
+        return data if all(isinstance(row, dict) for row in data) else None
+    if not isinstance(data, dict) or depth > 4:
+        return None
+    by_key = {_letters(key): value for key, value in data.items()}
+    for key in ROW_LIST_KEYS:
+        if key in by_key:
+            rows = _find_rows(by_key[key], depth + 1)
+            if rows is not None:
+                return rows
+    for value in data.values():
+        if isinstance(value, dict):
+            rows = _find_rows(value, depth + 1)
+            if rows is not None:
+                return rows
+    return None
+
+def parse_search_response(body):
+    """(record count, rows) from a search response body - JSON, or HTML carrying the
+    Records Selected box; (None, None) when the body is not a search result"""
+    text = (body or "").strip()
+    if text.startswith(("{", "[")):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None, None
+        count = _find_count(data, RECORD_COUNT_KEYS)
+        if count is None:
+            return None, None
+        return count, _find_rows(data)
+    match = re.search(r'RecordsSelected.{0,600}?left-offset-20[^>]*>\s*([\d,]+)', text, re.S)
+    if match:
+        return int(match.group(1).replace(',', '')), None
+    return None, None
+
+class SearchResponseCapture:
+    """
+    NEW - Watches Chrome's performance log for the Genesis search response
+    setup_driver switches network logging on (goog:loggingPrefs); after RUN each poll
+    drains the log, and every finished Genesis XHR/fetch/page response is read over
+    CDP (Network.getResponseBody) until one parses as a search result. The count is
+    known the moment the server answers, with Chrome's own timestamps as its latency.
+    Needs a local Chrome driver (CDP); otherwise the page is scraped as before.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.available = True
+        self.requests = {}  # requestId -> {"url", "sent", "type", "status"}
+
+    @classmethod
+    def for_driver(cls, driver):
+        if not hasattr(driver, "execute_cdp_cmd"):
+            logger.info("📡 No CDP on this WebDriver - search results are read from the page")
+            return None
+        return cls(driver)
+
+    def _entries(self):
+        try:
+            return self.driver.get_log("performance")
+        except Exception as e:
+            logger.info(f"📡 Network capture unavailable ({e}) - reading search results from the page")
+            self.available = False
+            return []
+
+    def _events(self):
+        entries = self._entries()
+        events = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if message.get("method", "").startswith("Network."):
+                events.append(message)
+        return events
+
+    def drain(self):
+        """Empty Chrome's performance log without reading it; call at every stage boundary so
+        traffic from the NYC and Maps tabs and idle pages does not pile up in the driver"""
+        if self.available:
+            self._entries()
+
+    def clear(self):
+        """Forget traffic from before the search (call right before clicking RUN)"""
+        self.requests = {}
+        self.drain()
+
+    def poll(self):
+        """{"record_count", "rows", "server_seconds", "url"} once the search response has
+        finished loading, else None"""
+        for event in self._events():
+            method, params = event["method"], event.get("params", {})
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                url = params.get("request", {}).get("url", "")
+                if SEARCH_RESPONSE_URL_PATTERN.search(url):
+                    self.requests[request_id] = {"url": url, "sent": params.get("timestamp"),
+                                                 "type": params.get("type")}
+            elif method == "Network.responseReceived" and request_id in self.requests:
+                request = self.requests[request_id]
+                request["type"] = params.get("type") or request["type"]
+                request["status"] = params.get("response", {}).get("status")
+            elif method == "Network.loadingFinished" and request_id in self.requests:
+                request = self.requests.pop(request_id)
+                if request["type"] not in SEARCH_RESPONSE_TYPES or (request.get("status") or 200) >= 400:
+                    continue
+                captured = self._read(request_id, request, params.get("timestamp"))
+                if captured:
+                    return captured
+        return None
+
+    def _read(self, request_id, request, finished):
+        try:
+            response = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception as e:
+            logger.debug(f"📡 Could not read response body of {request['url']}: {e}")
+            return None
+        body = response.get("body", "")
+        if response.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", "replace")
+        count, rows = parse_search_response(body)
+        if count is None:
+            return None
+        server_seconds = finished - request["sent"] if finished and request["sent"] else None
+        return {"record_count": count, "rows": rows, "server_seconds": server_seconds, "url": request["url"]}
+
+# ============================================================================
+# NEW: Background Downloads - Wait for and rename Genesis exports off the browser thread
+# ============================================================================
+
+DEFAULT_REPORT_DIR = os.path.join(os.getcwd(), "genesis_reports")
+DEFAULT_DOWNLOADS_DIR = os.path.join(DEFAULT_REPORT_DIR, "downloads")
+EXPORT_EXTENSIONS = ('.xlsx', '.xls')
+RENAMED_REPORT_MARKER = "_Genesis_Report_"  # our own renamed reports, never a fresh export
+
+def export_files(download_dir):
+    """Finished Genesis exports in download_dir (Chrome's .crdownload parts and our renamed reports excluded)"""
+    try:
+        names = os.listdir(download_dir)
+    except OSError:
+        return set()
+    return {name for name in names if name.endswith(EXPORT_EXTENSIONS) and RENAMED_REPORT_MARKER not in name}
+
+def remote_path_join(directory, name):
+    """directory/name with the remote node's own separator (a Windows node may use backslashes)"""
+    separator = "\\" if "\\" in directory and "/" not in directory else "/"
+    return directory.rstrip("/\\") + separator + name
+
+def collect_excel_download(download_dir, initial_files, custom_filename, clicked_at, report_dir=DEFAULT_REPORT_DIR):
+    """NEW - Wait for a new export in this browser's download_dir, move it to report_dir as custom_filename;
+    returns its path or None. Runs on the download executor; the timeout counts from when the wait
+    starts (not the click), and the folder is always scanned at least once."""
+    # NEW: Download ceiling learned from earlier downloads
+    timeout = latency_model.timeout("genesis", "download")
+    started = time.monotonic()
+    first_scan = True
+    while first_scan or time.monotonic() - started < timeout:
+        # Check if files have content and rename
+        for file in sorted(export_files(download_dir) - initial_files):
+            file_path = os.path.join(download_dir, file)
+            try:
+                if os.path.getsize(file_path) == 0:
+                    continue
+            except OSError:
+                continue
+            if not first_scan:
+                # Arrived while we watched, so click -> file is a real download latency
+                elapsed = time.monotonic() - clicked_at
+                latency_model.observe("genesis", "download", elapsed)
+                metrics.stage_seconds.observe(elapsed, "download")
+            try:
+                # NEW: Move next to the other reports with the custom name, avoiding overwriting existing files
+                os.makedirs(report_dir, exist_ok=True)
+                custom_path = unique_path(report_dir, custom_filename)
+                shutil.move(file_path, custom_path)
+                logger.info(f"SUCCESS: Downloaded and renamed Excel file: {os.path.basename(custom_path)}")
+                return custom_path
+            except Exception as e:
+                logger.warning(f"Could not rename file {file}: {e}")
+                logger.info(f"SUCCESS: Downloaded Excel file: {file}")
+                return file_path
+        first_scan = False
+        time.sleep(0.5)
+                    
+    latency_model.observe("genesis", "download", timeout, timed_out=True)
+    circuit_breakers["genesis"].record_failure("download timed out")
+    logger.error(f"TIMEOUT: No Excel files downloaded within {timeout:.0f} seconds")
+    return None
+
+# ============================================================================
+# NEW: Page Reports - The results table written by us instead of the Excel export
+# ============================================================================
+
+# One script call: the largest visible table on the results page, plus whether it is paged
+RESULTS_TABLE_SCRIPT = """
+    var best = null, bestCount = -1;
+    var tables = document.querySelectorAll('table');
+    for (var i = 0; i < tables.length; i++) {
+        if (!tables[i].offsetParent) continue;
+        var count = tables[i].tBodies.length ? tables[i].tBodies[0].rows.length : tables[i].rows.length;
+        if (count > bestCount) { best = tables[i]; bestCount = count; }
+    }
+    if (!best) return null;
+    var text = function (cell) { return cell.textContent.replace(/\\s+/g, ' ').trim(); };
+    var head = best.tHead && best.tHead.rows.length ? best.tHead.rows[best.tHead.rows.length - 1] : null;
+    var columns = head ? Array.prototype.map.call(head.cells, text) : [];
+    var bodyRows = best.tBodies.length ? best.tBodies[0].rows : best.rows;
+    var rows = [];
+    for (var r = 0; r < bodyRows.length; r++) {
+        if (bodyRows[r] === head || bodyRows[r].offsetParent === null) continue;
+        var cells = Array.prototype.map.call(bodyRows[r].cells, text);
+        if (cells.length === 1 && /no (data|records|results)/i.test(cells[0])) continue;
+        rows.push(cells);
+    }
+    var container = best.closest('.dataTables_wrapper, .table-responsive, .panel, .card') || best.parentElement;
+    var pages = 0, total = null;
+    var pager = container ? container.querySelector('.pagination, .dataTables_paginate, [class*="pager"]') : null;
+    if (pager && pager.offsetParent) {
+        var links = pager.querySelectorAll('a, button');
+        for (var p = 0; p < links.length; p++) { if (/^\\d+$/.test(text(links[p]))) pages++; }
+    }
+    var info = container ? container.querySelector('.dataTables_info, [class*="info"]') : null;
+    if (info) {
+        var match = info.textContent.replace(/,/g, '').match(/of\\s+(\\d+)/i);
+        if (match) total = parseInt(match[1]);
+    }
+    return {columns: columns, rows: rows, paginated: pages > 1, total: total};
+"""
+
+def rows_from_records(records):
+    """(columns, rows) from a captured response's row objects, columns in first-seen order"""
+    columns = []
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns.append(key)
+    return columns, [[record.get(column) for column in columns] for record in records]
+
+def check_report_format(report_format):
+    """False (with a warning) when page reports cannot be written in this format here"""
+    if format_available(report_format):
+        return True
+    logger.warning(f"⚠️ .{report_format} page reports need {FORMAT_DEPENDENCIES[report_format]} - "
+                   f"using the Excel export instead (or pick --report-format csv)")
+    return False
+
+# ============================================================================
+# NEW: Live Metrics - Browser and rate governor gauges, read at scrape time
+# ============================================================================
+
+live_automations = weakref.WeakSet()  # every automation that has started a browser
+
+def active_browsers():
+    return sum(1 for automation in list(live_automations) if automation.driver is not None)
+
+def browser_memory_mb():
+    """Total Chrome resident memory across live browsers (None without psutil)"""
+    if psutil is None:
+        return None
+    sizes = [automation.memory_governor.chrome_rss_mb() for automation in list(live_automations)
+             if automation.driver is not None and automation.memory_governor]
+    return round(sum(size for size in sizes if size is not None), 1)
+
+metrics.add_gauge("genesis_browsers_active", "Chrome sessions currently open", fn=active_browsers)
+metrics.add_gauge("genesis_browser_memory_mb", "Resident memory of all Chrome sessions in MB", fn=browser_memory_mb)
+metrics.add_gauge("genesis_rate_governor_wait_seconds_total", "Seconds spent waiting on the rate governor",
+                  ["host"], lambda: {(host,): round(wait, 3) for host, wait in list(rate_governor.total_wait.items())},
+                  kind="counter")
+
+job_profiling = JobProfiling(log=logger.getChild("profiler"))
+
+metrics.add_gauge("genesis_background_io_tasks", "Background I/O tasks running or queued", fn=lambda: io_executor.status()["in_flight"])
+metrics.add_gauge("genesis_download_waits", "Excel download waits running or queued", fn=lambda: download_executor.status()["in_flight"])
+
+def add_metrics_arguments(parser):
+    """NEW - Optional Prometheus endpoint"""
+    parser.add_argument('--metrics-port', type=int,
+                        help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running')
+
+def start_metrics_from_args(args):
+    if getattr(args, "metrics_port", None):
+        start_metrics_server(args.metrics_port)
+        logger.info(f"📈 Metrics at http://127.0.0.1:{args.metrics_port}/metrics")
+
+def add_profiling_arguments(parser):
+    """NEW - Per-job profiling (also switchable at runtime via genesis_reports/profile_requests.json)"""
+    parser.add_argument('--profile-record', action='append', metavar='RECORD_ID',
+                        help='Profile the job for this record (repeatable)')
+    parser.add_argument('--profile-rate', type=float, help='Fraction of jobs to profile (e.g. 0.02)')
+    parser.add_argument('--profile-mode', choices=['sample', 'cprofile'], help='Sampling (default) or cProfile')
+
+def configure_profiling_from_args(args):
+    for record_id in getattr(args, "profile_record", None) or []:
+        job_profiling.request(record_id=record_id)
+    if getattr(args, "profile_rate", None) is not None or getattr(args, "profile_mode", None):
+        job_profiling.request(rate=args.profile_rate, mode=args.profile_mode)
+
+class InfiniteGenesisAutomation:
+    """INFINITE - Genesis automation that keeps Python script running indefinitely"""
+    
+    def __init__(self, username, password, result_cache=None, resume=True, property_cache=None, remote_url=None,
+                 remote_download_dir=None, account_commands=False, capture_network=True, page_reports=False,
+                 report_format="xlsx", page_report_max_rows=500):
+        self.username = username
+        self.password = password
+        self.remote_url = remote_url
+        self.remote_download_dir = remote_download_dir
+        self.driver = None
+        self.wait = None
+        self.current_distance = 0.5
+        self.borough_detector = None
+        self.smart_form_filler = None
+        self.lot_validator = None
+        self.form_initialized = False
+        self.result_cache = result_cache
+        self.resolved_lot = None
+        self.last_report_path = None
+        self.last_record_count = None
+        self.resume = resume
+        self.journal = None
+        self.property_cache = property_cache
+        self.property_record = None
+        self.search_params = GENESIS_SEARCH_PARAMS
+        self.memory_governor = None
+        self.checkpoint_hook = None  # NEW: callback(stage) -> True when a scheduler wants this browser back
+        self.form_locality = None    # NEW: (borough, block) the Genesis form is currently filled for
+        self.lot_knowledge = BlockLotKnowledge()
+        self.defer_downloads = False  # NEW: return once Excel is clicked; pending_download has the report
+        self.pending_download = None
+        # NEW: This browser's own download folder; one Excel export waited for at a time
+        self.download_id = uuid.uuid4().hex[:12]
+        self.download_dir = os.path.join(DEFAULT_DOWNLOADS_DIR, self.download_id)
+        self.download_idle = threading.Event()
+        self.download_idle.set()
+        self.command_accountant = WebDriverCommandAccountant() if account_commands else None
+        self.capture_network = capture_network
+        # NEW: Write the results table ourselves; the Excel export only when it is paged or truncated
+        self.page_reports = page_reports and check_report_format(report_format)
+        self.report_format = report_format
+        self.page_report_max_rows = page_report_max_rows
+        self.search_capture = None
+        self.last_search_rows = None  # NEW: result rows from the captured search response, when it had them
+        self.record_count_known = False  # NEW: False when the count fell back to "assuming 0 records"
+        self.account_name = None   # NEW: Genesis account this session is logged in with (pooled sessions)
+        self.account_hook = None   # NEW: callback(state, reason) reporting account health to the pool
+        self.logged_in = False
+        self.login_problem = None
+        self.skipped_stages = {}   # NEW: stage -> why it did not run for the current job (reported with the result)
+        
+    def setup_driver(self):
+        """ENHANCED - Initialize Chrome driver, downloading into this session's own folder"""
+        logger.info("====== WebDriver manager ======")
+        load_selenium()
+        
+        chrome_options = Options()
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        
+        # A remote node writes to its own path, which must be shared with this host's genesis_reports
+        remote_dir = self.remote_download_dir and remote_path_join(
+            remote_path_join(self.remote_download_dir, "downloads"), self.download_id)
+        prefs = {
+            "download.default_directory": remote_dir or self.download_dir,
+            "download.prompt_for_download": False,
+            "download.directory_upgrade": True,
+            "safebrowsing.enabled": True
+        }
+        chrome_options.add_experimental_option("prefs", prefs)
+        if self.capture_network:
+            # NEW: Network events in the performance log, so the search response can be read directly
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        
+        os.makedirs(self.download_dir, exist_ok=True)
+        
+        if self.remote_url:
+            # NEW - Remote WebDriver (Selenium Grid / standalone node)
+            logger.info(f"🌐 Connecting to remote WebDriver: {self.remote_url}")
+            self.driver = webdriver.Remote(command_executor=self.remote_url, options=chrome_options)
+        else:
+            # Use local Chrome installation instead of downloading driver
+            service = Service()  # Let Selenium find Chrome automatically
+            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        if self.command_accountant:
+            self.command_accountant.install(self.driver)
+        if self.capture_network:
+            self.search_capture = SearchResponseCapture.for_driver(self.driver)
+        self.wait = AdaptiveWait(self.driver, "genesis")
+        
+        self.borough_detector = EnhancedBoroughDetector(self.driver)
+        self.smart_form_filler = SmartFormFiller(self.driver)
+        self.lot_validator = LotValidator(self.driver, self.smart_form_filler)
+        if self.memory_governor is None:
+            self.memory_governor = BrowserMemoryGovernor(self)
+        live_automations.add(self)
+        
+        logger.info("Chrome driver initialized successfully")
+        
+    def login_to_genesis(self):
+        """ENHANCED - Login to Genesis GenPAD; an outage page is a portal failure, not an account problem"""
+        logger.info("Navigating to Genesis GenPAD and logging in")
+        
+        rate_governor.bind_account(self.account_name)
+        rate_governor.acquire("genesis")
+        self.driver.get("https://genesisgenpad.com/comparison/main")
+        self.form_locality = None  # the reload clears the form
+        time.sleep(3)
+        page_error = rate_governor.page_error(self.driver, "genesis")
+        
+        # NEW: Warm sessions are already logged in - skip the 15s login-field wait
+        if "comparison/main" in self.driver.current_url and not self.driver.find_elements(By.ID, "email-input"):
+            logger.info("Already logged in (warm session) - proceeding to form")
+            return True
+        
+        try:
             email_field = self.wait.until(EC.presence_of_element_located((By.ID, "email-input")))
             logger.info("Login required - filling credentials")
+            if self.logged_in:
+                # NEW: A warm session was logged out under us - often another login on the same account
+                logger.warning(f"🔑 Genesis session expired for account {self.account_name or self.username}")
+                self.report_account("session_expired", "logged out mid-session")
             
             email_field.clear()
             email_field.send_keys(self.username)
@@ -874,22 +2678,53 @@ class InfiniteGenesisAutomation:
         
         if "comparison/main" in current_url:
             logger.info("Successfully on comparison page")
+            self.logged_in, self.login_problem = True, None
+            self.report_account("healthy")
             return True
         else:
             logger.error("Failed to reach comparison page")
+            self.logged_in = False
+            if page_error in RateGovernor.OUTAGE_PAGE_MARKERS:
+                # Genesis itself is down - every account would fail the same way
+                logger.error(f"🚫 Genesis shows an outage page ('{page_error}') - not an account problem")
+                self.login_problem = "portal_unavailable"
+                return False
+            self.login_problem = classify_login_problem(self.login_page_text())
+            self.report_account(self.login_problem, f"login failed at {current_url}")
             return False
             
+    def login_page_text(self):
+        """NEW - Visible text of the page a failed login landed on"""
+        try:
+            return self.driver.execute_script("return document.body ? document.body.innerText.slice(0, 2000) : '';")
+        except Exception:
+            return ""
+            
+    def report_account(self, state, reason=None):
+        """NEW - Pass an account health signal to the account pool (pooled sessions only)"""
+        if self.account_hook:
+            self.account_hook(state, reason)
+            
     def setup_form_initial(self, borough, block, lot, tax_class, property_address):
         """ENHANCED - Initial form setup with lot validation - MINIMAL ADDITION"""
         if self.form_initialized:
             logger.info("⏭️ Form already initialized - skipping initial setup")
             return True
             
+        locality = locality_key(borough, block)
+        if self.form_locality == locality:
+            if self.setup_form_for_neighbour(borough, block, lot):
+                return True
+            logger.warning("⚠️ Could not reuse the filled form - reloading Genesis for a full setup")
+            self.form_locality = None
+            if not self.login_to_genesis():
+                return False
+            
         logger.info("🔧 INITIAL FORM SETUP (one-time only)")
         
         try:
             # Change comparison type to Distance
-            if not self.smart_form_filler.set_field_value("curr-comparison-type", "2", "Comparison Type"):
+            if not self.smart_form_filler.set_field_value("curr-comparison-type", GENESIS_SEARCH_PARAMS["comparison_type"], "Comparison Type"):
                 return False
             time.sleep(3)
             
@@ -902,14 +2737,19 @@ class InfiniteGenesisAutomation:
                 return False
                 
             # Set unit to Miles (only once)
-            if not self.smart_form_filler.set_field_value("UnitFmSelect", "2", "Distance Unit"):
+            if not self.smart_form_filler.set_field_value("UnitFmSelect", GENESIS_SEARCH_PARAMS["distance_unit"], "Distance Unit"):
                 return False
                 
-            # Fill borough (only once)
+            # Fill borough (only once) - a journaled or previously discovered dropdown value is tried first
+            journaled_value = self.journal.get("borough").get("dropdown_value") if self.journal else None
             if not self.borough_detector.select_borough_with_enhanced_detection(
-                borough, property_address, block
+                borough, property_address, block,
+                preferred_value=journaled_value or self.borough_detector.discovered_mappings.get(locality[0])
             ):
                 logger.warning("Enhanced borough selection failed, but continuing")
+            elif self.journal:
+                matched_borough = self.borough_detector.fuzzy_match_borough(borough, threshold=0.6)[0]
+                self.journal.complete("borough", dropdown_value=self.borough_detector.discovered_mappings.get(matched_borough))
             time.sleep(1)
             
             # Fill block (only once)
@@ -917,36 +2757,99 @@ class InfiniteGenesisAutomation:
                 return False
                 
             # NEW: Lot validation logic
-            logger.info("🔍 Starting lot number validation...")
-            valid_lot = self.lot_validator.find_valid_lot(int(lot))
-            logger.info(f"🔍 LOT VALIDATION COMPLETE - Using lot: {valid_lot}")
-            # END NEW SECTION
+            self.validate_lot_on_form(borough, block, lot)
                 
-            # Fill tax class (only once)
-            if not self.smart_form_filler.set_field_value("TaxClassSelect", "3", "Tax Class"):
+            # Fill tax class (only once) - from the NYC portal record or Airtable when Genesis offers it
+            if not self.smart_form_filler.set_field_value("TaxClassSelect", self.resolve_tax_class_value(), "Tax Class"):
                 return False
                 
             # Fill year built fields (only once)
-            if not self.smart_form_filler.set_field_value("YearBuiltLow", "2015", "Year Built Low"):
+            if not self.smart_form_filler.set_field_value("YearBuiltLow", GENESIS_SEARCH_PARAMS["year_built_low"], "Year Built Low"):
                 return False
-            if not self.smart_form_filler.set_field_value("YearBuiltHigh", "2022", "Year Built High"):
+            if not self.smart_form_filler.set_field_value("YearBuiltHigh", GENESIS_SEARCH_PARAMS["year_built_high"], "Year Built High"):
                 return False
                 
             # Fill assessment field properly (only once)
             self.smart_form_filler.fill_assessment_field_properly()
             
             # Fill sort order (only once)
-            if not self.smart_form_filler.set_field_value("sort-order-select", "2", "Sort Order"):
+            if not self.smart_form_filler.set_field_value("sort-order-select", GENESIS_SEARCH_PARAMS["sort_order"], "Sort Order"):
                 return False
                 
             self.form_initialized = True
+            self.form_locality = locality
             logger.info("✅ Initial form setup completed")
             return True
             
+        except JobPreempted:
+            raise
         except Exception as e:
             logger.error(f"❌ Initial form setup failed: {e}")
             return False
             
+    def validate_lot_on_form(self, borough, block, lot):
+        """NEW - Find a lot Genesis accepts, reusing the journal and this block's earlier probes"""
+        logger.info("🔍 Starting lot number validation...")
+        self.lot_validator.probes = 0
+        started = time.monotonic()
+        knowledge = self.lot_knowledge.for_block(locality_key(borough, block))
+        self.lot_validator.rejected_lots = knowledge["rejected"]
+        self.lot_validator.valid_lots = knowledge["valid"]
+        journaled_lot = self.journal.get("lot_search").get("resolved_lot") if self.journal else None
+        if journaled_lot is not None and self.lot_validator.test_lot_number(journaled_lot):
+            logger.info(f"📒 Resumed lot search from journal - lot {journaled_lot}")
+            valid_lot = journaled_lot
+        else:
+            if self.journal:
+                self.lot_validator.rejected_lots.update(self.journal.rejected_lots())
+                self.lot_validator.on_rejected = self.journal.record_rejected_lot
+            valid_lot = self.lot_validator.find_valid_lot(int(lot))
+            if self.journal:
+                self.journal.complete("lot_search", resolved_lot=valid_lot)
+        self.resolved_lot = valid_lot
+        metrics.lot_probes.observe(self.lot_validator.probes)
+        metrics.stage_seconds.observe(time.monotonic() - started, "lot_search")
+        logger.info(f"🔍 LOT VALIDATION COMPLETE - Using lot: {valid_lot}")
+        return valid_lot
+        
+    def setup_form_for_neighbour(self, borough, block, lot):
+        """NEW - Form already filled for this borough/block: only the lot and tax class change"""
+        logger.info(f"🏘️ Same borough/block as the previous job - keeping borough and block, updating lot {lot}")
+        try:
+            self.validate_lot_on_form(borough, block, lot)
+            if not self.smart_form_filler.set_field_value("TaxClassSelect", self.resolve_tax_class_value(), "Tax Class"):
+                return False
+            self.form_initialized = True
+            return True
+        except JobPreempted:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ Neighbour form update failed: {e}")
+            return False
+            
+    def is_on_genesis_form(self):
+        """NEW - True if the first tab still shows the logged-in Genesis comparison form"""
+        try:
+            return ("comparison/main" in self.driver.current_url
+                    and bool(self.driver.find_elements(By.ID, "TargetLot"))
+                    and not self.driver.find_elements(By.ID, "email-input"))
+        except Exception:
+            return False
+            
+    def resolve_tax_class_value(self):
+        """NEW - Genesis TaxClassSelect value whose label matches the property's tax class"""
+        if self.search_params is GENESIS_SEARCH_PARAMS:
+            return GENESIS_SEARCH_PARAMS["tax_class"]  # no known tax class for this property
+        tax_class = self.search_params["tax_class"]
+        for value, text in self.smart_form_filler.get_select_options("TaxClassSelect"):
+            if re.search(rf'(^|\bclass\s*){tax_class}\b', text, re.IGNORECASE):
+                logger.info(f"🏷️ Tax class {tax_class} -> Genesis option '{text}' (value {value})")
+                return value
+        logger.warning(f"⚠️ No Genesis tax class option for class {tax_class} - using default")
+        # The search runs with the default class, so cache the result under it, not the portal's class
+        self.search_params = dict(self.search_params, tax_class=GENESIS_SEARCH_PARAMS["tax_class"])
+        return GENESIS_SEARCH_PARAMS["tax_class"]
+            
     def update_distance_only(self, distance):
         """PRESERVED - Update only the distance field (optimized) - NO CHANGES"""
         logger.info(f"🔧 UPDATING DISTANCE ONLY: {distance} miles")
@@ -996,16 +2899,113 @@ class InfiniteGenesisAutomation:
             logger.error(f"Error clicking {button_name} button: {str(e)}")
             return False
             
+    RECORDS_SELECTED_XPATH = ("//label[@for='RecordsSelected']/../../following-sibling::div"
+                              "[contains(@class, 'text-right')]//span[@class='left-offset-20']")
+    
+    def read_records_selected_text(self):
+        """NEW - Current 'Records Selected' text, or None while it is not on the page"""
+        try:
+            return self.driver.find_element(By.XPATH, self.RECORDS_SELECTED_XPATH).text.strip() or None
+        except Exception:
+            return None
+            
+    # Blank the count before RUN; returns what is left ('' once cleared, null without a results box)
+    CLEAR_RECORDS_SELECTED_SCRIPT = """
+        var span = document.evaluate(arguments[0], document, null,
+                                     XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (!span) { return null; }
+        span.textContent = '';
+        return span.textContent;
+    """
+    
+    def invalidate_records_selected(self):
+        """NEW - Blank the previous search's count so only the new search can fill it in
+        Returns the old text when it could not be blanked (the wait must then see it change)."""
+        try:
+            return self.driver.execute_script(self.CLEAR_RECORDS_SELECTED_SCRIPT, self.RECORDS_SELECTED_XPATH) or None
+        except Exception as e:
+            logger.warning(f"Could not clear the previous Records Selected count: {e}")
+            return self.read_records_selected_text()
+            
+    SEARCH_CROSS_CHECK_SECONDS = 1.0  # how long a captured count waits for the page's to compare
+    
+    def page_record_count(self, stale_text=None):
+        """NEW - This search's Records Selected count on the page, or None while it is not shown
+        (stale_text: the previous search's count, never taken for this one)"""
+        text = self.read_records_selected_text()
+        if not text or text == stale_text:
+            return None
+        numbers = re.findall(r'\d+', text.replace(',', ''))
+        return int(numbers[0]) if numbers else None
+        
+    def cross_check_capture(self, captured, stale_text=None):
+        """NEW - Compare a captured count with the page's once it shows (polled briefly)
+        On a mismatch the page wins: the response was from some other request"""
+        deadline = time.monotonic() + self.SEARCH_CROSS_CHECK_SECONDS
+        page_count = self.page_record_count(stale_text)
+        while page_count is None and time.monotonic() < deadline:
+            time.sleep(0.2)
+            page_count = self.page_record_count(stale_text)
+        if page_count is not None and page_count != captured["record_count"]:
+            logger.warning(f"⚠️ Captured response {captured['url']} says {captured['record_count']} records, "
+                           f"the page says {page_count} - using the page")
+            return dict(captured, record_count=page_count, rows=None)
+        return captured
+        
+    def wait_for_search_results(self, stale_text=None):
+        """NEW - Poll for the record count instead of a fixed 15s sleep
+        The count was blanked before RUN, so any count on the page is this search's
+        (stale_text: the old count if it could not be blanked - it is never accepted).
+        The ceiling comes from the latency model; past it the search has failed.
+        With network capture the search response is watched too and usually wins: it is
+        returned (and its server time observed) as soon as it has loaded, once checked
+        against the page's count if that shows within SEARCH_CROSS_CHECK_SECONDS."""
+        timeout = latency_model.timeout("genesis", "search")
+        capture = self.search_capture if self.search_capture and self.search_capture.available else None
+        started = time.monotonic()
+        while True:
+            elapsed = time.monotonic() - started
+            captured = capture.poll() if capture and capture.available else None
+            if captured:
+                latency_model.observe("genesis", "search", captured["server_seconds"] or elapsed)
+                circuit_breakers["genesis"].record_success()
+                return self.cross_check_capture(captured, stale_text)
+            if self.page_record_count(stale_text) is not None:
+                latency_model.observe("genesis", "search", elapsed)
+                circuit_breakers["genesis"].record_success()
+                return True
+            if elapsed >= timeout:
+                latency_model.observe("genesis", "search", elapsed, timed_out=True)
+                circuit_breakers["genesis"].record_failure("search results timed out")
+                logger.warning(f"Search results did not appear within {timeout:.0f}s")
+                return False
+            time.sleep(0.2 if capture else 0.5)
+            
     def run_search_and_check_results(self):
-        """PRESERVED - STEP 4: Run search and check results - NO CHANGES"""
+        """ENHANCED - STEP 4: Run search and read the record count
+        The previous count is blanked before RUN; a captured search response is used when
+        it agrees with the page, otherwise the count is read from the Records Selected box."""
         logger.info("STEP 4: Running search with navigation bar fix")
         
         try:
+            rate_governor.acquire("genesis")
+            stale_count_text = self.invalidate_records_selected()
+            self.last_search_rows = None
+            self.record_count_known = False
+            if self.search_capture:
+                self.search_capture.clear()
             if not self.click_button_with_nav_fix("btn-run", "RUN"):
                 return 0
                 
             logger.info("Waiting for search results to load...")
-            time.sleep(15)
+            captured = self.wait_for_search_results(stale_count_text)
+            if isinstance(captured, dict):
+                self.last_search_rows = captured["rows"]
+                rows = f", {len(captured['rows'])} rows" if captured["rows"] is not None else ""
+                logger.info(f"📡 NETWORK RESULT: {captured['record_count']} records selected{rows} "
+                            f"(server answered in {captured['server_seconds'] or 0:.1f}s)")
+                self.record_count_known = True
+                return captured["record_count"]
             
             try:
                 logger.info("Looking for 'Records Selected' count in results box...")
@@ -1013,8 +3013,7 @@ class InfiniteGenesisAutomation:
                 records_selected_label = self.driver.find_element(By.XPATH, "//label[@for='RecordsSelected']")
                 logger.info("Found 'Records Selected' label")
                 
-                records_count_span = self.driver.find_element(By.XPATH, 
-                    "//label[@for='RecordsSelected']/../../following-sibling::div[contains(@class, 'text-right')]//span[@class='left-offset-20']")
+                records_count_span = self.driver.find_element(By.XPATH, self.RECORDS_SELECTED_XPATH)
                 
                 records_count_text = records_count_span.text.strip()
                 logger.info(f"Raw Records Selected text: '{records_count_text}'")
@@ -1024,6 +3023,7 @@ class InfiniteGenesisAutomation:
                 if numbers:
                     record_count = int(numbers[0])
                     logger.info(f"PARSED RESULT: {record_count} records selected")
+                    self.record_count_known = True
                     return record_count
                 else:
                     logger.warning(f"Could not parse number from: '{records_count_text}'")
@@ -1056,6 +3056,7 @@ class InfiniteGenesisAutomation:
                 
                 if record_count is not None:
                     logger.info(f"JAVASCRIPT METHOD: {record_count} records selected")
+                    self.record_count_known = True
                     return record_count
                     
             except Exception as e:
@@ -1085,14 +3086,24 @@ class InfiniteGenesisAutomation:
             
     def download_excel_with_custom_name(self, property_address, record_count):
         """ENHANCED - Excel download with custom naming - MINIMAL ADDITION"""
+        future = self.start_excel_download(property_address, record_count)
+        self.last_report_path = future.result() if future else None
+        return self.last_report_path is not None
+        
+    def start_excel_download(self, property_address, record_count, then=None):
+        """NEW - Click Excel on this thread; waiting for the file and renaming it run on the
+        background I/O executor. Returns a Future of then(report path) (report path if no then),
+        or None if the click failed."""
         logger.info("=== EXCEL DOWNLOAD WITH CUSTOM NAMING ===")
         
+        # NEW: The folder is this browser's alone; wait out its previous export so files cannot swap
+        if not self.download_idle.wait(latency_model.timeout("genesis", "download")):
+            logger.warning("⚠️ Previous Excel download still pending - its file may be taken for this one")
+        
         try:
             # Get initial download state
-            download_dir = os.path.join(os.getcwd(), "genesis_reports")
-            initial_files = set()
-            if os.path.exists(download_dir):
-                initial_files = set([f for f in os.listdir(download_dir) if f.endswith(('.xlsx', '.xls'))])
+            download_dir = self.download_dir
+            initial_files = export_files(download_dir)
             
             logger.info(f"Initial Excel files: {len(initial_files)}")
             
@@ -1114,6 +3125,7 @@ class InfiniteGenesisAutomation:
                     time.sleep(2)
                     
                     # Try regular click first, then JavaScript click
+                    rate_governor.acquire("genesis")
                     try:
                         self.wait.until(EC.element_to_be_clickable((By.ID, "btn-excel")))
                         excel_button.click()
@@ -1124,86 +3136,144 @@ class InfiniteGenesisAutomation:
                     
                     # Wait for download with verification
                     logger.info("Waiting for Excel download...")
+                    custom_filename = self.generate_excel_filename(property_address, record_count)
+                    clicked_at = time.monotonic()
                     
-                    for attempt in range(30):  # Wait up to 30 seconds
-                        time.sleep(1)
-                        
-                        if os.path.exists(download_dir):
-                            current_files = set([f for f in os.listdir(download_dir) if f.endswith(('.xlsx', '.xls'))])
-                            new_files = current_files - initial_files
-                            
-                            if new_files:
-                                # Check if files have content and rename
-                                for file in new_files:
-                                    file_path = os.path.join(download_dir, file)
-                                    try:
-                                        if os.path.getsize(file_path) > 0:
-                                            # NEW: Rename file with custom name
-                                            custom_filename = self.generate_excel_filename(property_address, record_count)
-                                            custom_path = os.path.join(download_dir, custom_filename)
-                                            
-                                            # Avoid overwriting existing files
-                                            counter = 1
-                                            while os.path.exists(custom_path):
-                                                name_part = custom_filename.replace('.xlsx', f'_{counter}.xlsx')
-                                                custom_path = os.path.join(download_dir, name_part)
-                                                counter += 1
-                                                
-                                            os.rename(file_path, custom_path)
-                                            logger.info(f"SUCCESS: Downloaded and renamed Excel file: {os.path.basename(custom_path)}")
-                                            return True
-                                    except Exception as e:
-                                        logger.warning(f"Could not rename file {file}: {e}")
-                                        logger.info(f"SUCCESS: Downloaded Excel file: {file}")
-                                        return True
-                                        
-                    logger.error("TIMEOUT: No Excel files downloaded within 30 seconds")
-                    return False
+                    def collect():
+                        try:
+                            report_path = collect_excel_download(download_dir, initial_files, custom_filename,
+                                                                 clicked_at)
+                        finally:
+                            self.download_idle.set()
+                        return then(report_path) if then else report_path
+                    
+                    self.download_idle.clear()
+                    try:
+                        return download_executor.submit(with_log_context(collect),
+                                                        description=f"Excel download for {property_address}")
+                    except ExecutorBusy:
+                        self.download_idle.set()
+                        raise
                         
                 else:
                     logger.error("Excel button found but not clickable")
-                    return False
+                    return None
                     
             except NoSuchElementException:
                 logger.error("Excel button with ID 'btn-excel' not found")
-                return False
+                return None
                 
         except Exception as e:
             logger.error(f"Error in Excel download: {str(e)}")
-            return False
-        
+            return None
+            
     def run_automation(self, borough, block, lot, tax_class, property_address, owner, record_id):
+        """NEW - Run the pipeline and count the outcome; deferred jobs are not counted"""
+        if self.command_accountant:
+            self.command_accountant.reset()
+        profiler = job_profiling.start(record_id)
+        rate_governor.bind_account(self.account_name)
+        try:
+            success = self.run_pipeline(borough, block, lot, tax_class, property_address, owner, record_id)
+        finally:
+            if self.command_accountant:
+                self.command_accountant.write_report(record_id)
+            if profiler:
+                self.finish_profile(profiler, record_id)
+        if self.skipped_stages:
+            logger.warning("⚠️ Not done for this record (redo by hand or rerun): " +
+                           ", ".join(f"{stage} ({reason})" for stage, reason in self.skipped_stages.items()))
+        metrics.record_property("completed" if success else "failed")
+        return success
+        
+    def finish_profile(self, profiler, record_id):
+        """NEW - Stop the job's profiler and write it next to the report
+        A deferred download has no report path yet, so the profile is written once it resolves."""
+        profiler.stop()
+        download = self.pending_download
+        if download is None:
+            job_profiling.write(profiler, record_id, self.last_report_path)
+            return
+        
+        def write_profile(done):
+            report_path = None if done.cancelled() or done.exception() else done.result()
+            job_profiling.write(profiler, record_id, report_path)
+        
+        download.add_done_callback(write_profile)
+        
+    def run_pipeline(self, borough, block, lot, tax_class, property_address, owner, record_id):
         """ENHANCED - Main automation workflow with fixed 0.5 mile radius - EXACT FROM WORKING FILE"""
+        _log_context.record_id = record_id
         logger.info("====== Starting INFINITE Genesis GenPAD Automation ======")
         logger.info(f"Property: {borough}, Block {block}, Lot {lot}, Tax Class {tax_class}")
         logger.info(f"Property Address: {property_address}")
         logger.info(f"Owner: {owner}")
         logger.info(f"Record ID: {record_id}")
         
+        # NEW: Per-job journal - reuse the borough value and lot a crashed or interrupted run found
+        self.journal = JobJournal(record_id, borough, block, lot) if self.resume else None
+        self.skipped_stages = {}
+        
         try:
             # Step 1: Run NYC automation FIRST
-            logger.info("🏢 Running NYC automation FIRST...")
-            run_nyc_first(self.driver, borough, block, lot)
+            if not circuit_breakers["nyc"].allow():
+                logger.warning("🚫 NYC portal circuit open - skipping the NYC stage for this job")
+                self.skipped_stages["nyc"] = "circuit open"
+            else:
+                logger.info("🏢 Running NYC automation FIRST...")
+                with metrics.stage_timer("nyc"):
+                    nyc_ok, nyc_error = run_nyc_first(self.driver, borough, block, lot, self.property_cache)
+                self.record_portal_outcome("nyc", nyc_ok, nyc_error)
+            
+            # The portal's tax class (when known) decides the Genesis tax class filter
+            self.property_record = self.property_cache.lookup(borough, block, lot) if self.property_cache else None
+            self.search_params = effective_search_params(tax_class, self.property_record)
             
             # Step 2: Run Google Maps automation SECOND
-            logger.info("🗺️ Running Google Maps automation SECOND...")
-            maps_automation = GoogleMapsAutomation(self.driver, property_address)
-            maps_automation.run_google_maps_automation()
+            self.stage_checkpoint("maps")
+            if not circuit_breakers["maps"].allow():
+                logger.warning("🚫 Google Maps circuit open - skipping the Maps stage for this job")
+                self.skipped_stages["maps"] = "circuit open"
+            else:
+                logger.info("🗺️ Running Google Maps automation SECOND...")
+                maps_automation = GoogleMapsAutomation(self.driver, property_address)
+                with metrics.stage_timer("maps"):
+                    maps_ok = maps_automation.run_google_maps_automation()
+                self.record_portal_outcome("maps", maps_ok, maps_automation.portal_error)
             
             # Step 3: Now run Genesis automation THIRD
             logger.info("⚡ Starting Genesis automation THIRD...")
             
-            if not self.login_to_genesis():
-                return False
+            # Login is per browser session; a neighbour of the previous job keeps the filled form instead
+            self.stage_checkpoint("login")
+            if not circuit_breakers["genesis"].allow():
+                logger.warning("🚫 Genesis circuit open - deferring this job instead of waiting out timeouts")
+                raise PortalUnavailable("genesis")
+            if self.form_locality == locality_key(borough, block) and self.is_on_genesis_form():
+                logger.info("🏘️ Genesis form already filled for this borough/block - no reload")
+            else:
+                with metrics.stage_timer("login"):
+                    logged_in = self.login_to_genesis()
+                if not logged_in and self.account_hook and self.login_problem in LOGIN_PROBLEM_MARKERS:
+                    # The account, not Genesis, is the problem: hand the job to a session on another account
+                    circuit_breakers["genesis"].release_trial()
+                    raise AccountUnavailable(f"account {self.account_name} {self.login_problem}")
+                if not logged_in:
+                    circuit_breakers["genesis"].record_failure(
+                        "outage page" if self.login_problem == "portal_unavailable" else "login failed")
+                    return False
+                circuit_breakers["genesis"].record_success()
                 
             # NEW: Fixed 0.5 mile radius (as requested)
-            FIXED_RADIUS = 0.5
+            FIXED_RADIUS = self.search_params["radius"]
             MINIMUM_RECORDS_TARGET = 10
             
             logger.info(f"\n===== USING FIXED RADIUS: {FIXED_RADIUS} miles =====")
             
             # Initial form setup with lot validation
             logger.info("🔧 Setting up complete form with lot validation")
+            self.stage_checkpoint("form_setup")
+            self.lot_validator.before_probe = lambda: self.stage_checkpoint("lot_probe")
             if not self.setup_form_initial(borough, block, lot, tax_class, property_address):
                 logger.error(f"Failed to setup initial form")
                 return False
@@ -1213,17 +3283,18 @@ class InfiniteGenesisAutomation:
                 logger.error(f"Failed to update distance to {FIXED_RADIUS}")
                 return False
                 
-            record_count = self.run_search_and_check_results()
+            self.stage_checkpoint("search")
+            with metrics.stage_timer("search"):
+                record_count = self.run_search_and_check_results()
+            metrics.records.observe(record_count)
+            self.last_record_count = record_count
             logger.info(f"Found {record_count} records at {FIXED_RADIUS} miles")
             
             if record_count >= MINIMUM_RECORDS_TARGET:
                 logger.info(f"SUCCESS: Found {record_count} records (>= {MINIMUM_RECORDS_TARGET})")
                 
                 # Enhanced Excel download with custom naming
-                if self.download_excel_with_custom_name(property_address, record_count):
-                    logger.info("Excel download completed successfully")
-                else:
-                    logger.warning("Excel download failed, but continuing")
+                self.download_report(borough, block, lot, record_count, record_id, property_address)
                     
                 logger.info("Keeping results page open for review...")
                 logger.info("INFINITE automation completed successfully!")
@@ -1232,19 +3303,197 @@ class InfiniteGenesisAutomation:
                 logger.warning(f"Only {record_count} records found at {FIXED_RADIUS} miles")
                 
                 # Still download Excel even with fewer records
-                if self.download_excel_with_custom_name(property_address, record_count):
-                    logger.info("Excel download completed successfully")
+                self.download_report(borough, block, lot, record_count, record_id, property_address)
                     
                 logger.info("Keeping results page open for review...")
                 logger.info("INFINITE automation completed!")
                 return True
             
+        except JobPreempted:
+            circuit_breakers["genesis"].release_trial()
+            raise
+        except PortalUnavailable:
+            raise
         except Exception as e:
+            circuit_breakers["genesis"].release_trial()
             logger.error(f"Error in automation: {str(e)}")
             return False
             
+    def record_portal_outcome(self, stage, ok, portal_error):
+        """NEW - Feed a NYC/Maps stage outcome to its circuit breaker
+        Only the site's own failures (timeouts, network errors, error pages) count as
+        outages; a record the site cannot resolve is noted in skipped_stages only."""
+        breaker = circuit_breakers[stage]
+        if ok:
+            breaker.record_success()
+        elif portal_error:
+            breaker.record_failure(portal_error)
+            self.skipped_stages[stage] = portal_error
+        else:
+            breaker.release_trial()
+            self.skipped_stages[stage] = "failed for this record"
+            logger.warning(f"⚠️ {stage} stage failed for this record - not counted as a {stage} outage")
+            
+    def stage_checkpoint(self, stage):
+        """NEW - Stage boundary: give the browser up if the scheduler has a more urgent job"""
+        if self.search_capture:
+            self.search_capture.drain()
+        if self.checkpoint_hook and self.checkpoint_hook(stage):
+            logger.info(f"⏸️ Pre-empted before stage '{stage}' - journal keeps the progress so far")
+            raise JobPreempted(stage)
+            
+    def download_report(self, borough, block, lot, record_count, record_id, property_address):
+        """NEW - Download the report, then cache it and retire the job journal
+        With defer_downloads the browser is free once Excel is clicked: the wait, rename,
+        cache and journal run on the background I/O executor and pending_download
+        resolves to the report path (None if the download failed)."""
+        journal, search_params, result_cache = self.journal, self.search_params, self.result_cache
+        resolved_lot = self.resolved_lot if self.resolved_lot is not None else lot
+        
+        def record_report(report_path):
+            if not report_path:
+                logger.warning("Excel download failed, but continuing")
+                return None
+            logger.info("Excel download completed successfully")
+            if result_cache:
+                result_cache.store(borough, block, lot, resolved_lot, record_count, report_path, record_id,
+                                   search_params)
+            if journal:
+                journal.finish()
+            return report_path
+            
+        future = None
+        if self.page_reports and not self.record_count_known:
+            logger.info("📋 Record count unknown - the page cannot be checked for completeness, using the Excel export")
+        elif self.page_reports and record_count <= self.page_report_max_rows:
+            future = self.start_page_report(property_address, record_count, then=record_report)
+        if future is None:
+            future = self.start_excel_download(property_address, record_count, then=record_report)
+        if future is None:
+            logger.warning("Excel download failed, but continuing")
+        elif self.defer_downloads:
+            self.pending_download = future
+            logger.info("📥 Excel download continues in the background - browser is free")
+        else:
+            self.last_report_path = future.result()
+            
+    def extract_results_table(self, record_count):
+        """NEW - (columns, rows) of the comparables, or None when the page does not hold all of them
+        Rows captured from the search response are used as is; otherwise one script reads the table."""
+        if self.last_search_rows is not None and len(self.last_search_rows) >= record_count:
+            logger.info(f"📋 Using {len(self.last_search_rows)} rows from the captured search response")
+            return rows_from_records(self.last_search_rows)
+        try:
+            table = self.driver.execute_script(RESULTS_TABLE_SCRIPT)
+        except Exception as e:
+            logger.warning(f"Could not read the results table: {e}")
+            return None
+        if not table:
+            logger.info("📋 No results table on the page")
+            return None
+        rows = table["rows"]
+        if table["paginated"] or (table["total"] or 0) > len(rows) or len(rows) < record_count:
+            logger.info(f"📋 Results table shows {len(rows)} of {max(record_count, table['total'] or 0)} records "
+                        f"({'paginated' if table['paginated'] else 'truncated'})")
+            return None
+        return table["columns"], rows
+        
+    def start_page_report(self, property_address, record_count, then=None):
+        """NEW - Read the results table in one script call and write it here, so a failed write can
+        still fall back to Excel; then() runs on the background I/O executor.
+        Returns a Future like start_excel_download, or None when the Excel export is needed."""
+        started = time.monotonic()
+        extracted = self.extract_results_table(record_count)
+        if extracted is None:
+            logger.info("📋 Falling back to the Excel export")
+            return None
+        columns, rows = extracted
+        filename = os.path.splitext(self.generate_excel_filename(property_address, record_count))[0]
+        try:
+            os.makedirs(DEFAULT_REPORT_DIR, exist_ok=True)
+            report_path = write_report(unique_path(DEFAULT_REPORT_DIR, f"{filename}.{self.report_format}"), columns, rows)
+        except Exception as e:
+            logger.error(f"Could not write page report: {e} - falling back to the Excel export")
+            return None
+        metrics.stage_seconds.observe(time.monotonic() - started, "download")
+        logger.info(f"SUCCESS: Wrote {len(rows)} rows from the results page to {os.path.basename(report_path)}")
+        task = functools.partial(then, report_path) if then else (lambda: report_path)
+        return io_executor.submit(with_log_context(task), description=f"page report for {property_address}")
+        
+    def reset_for_next_job(self):
+        """NEW - Prepare a warm, logged-in session for the next property (form_locality is kept)"""
+        self.form_initialized = False
+        self.resolved_lot = None
+        self.last_report_path = None
+        self.last_record_count = None
+        self.pending_download = None
+        self.last_search_rows = None
+        self.record_count_known = False
+        if self.search_capture:
+            self.search_capture.drain()
+        self.journal = None
+        self.property_record = None
+        self.search_params = GENESIS_SEARCH_PARAMS
+        self.lot_validator.rejected_lots = set()
+        self.lot_validator.on_rejected = None
+        self.lot_validator.before_probe = None
+        self.lot_validator.valid_lots = set()
+        self.checkpoint_hook = None
+        
+        # Close the NYC/Maps tabs of the previous property, keep the GENESIS tab
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(handles[0])
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Could not reset browser tabs: {e}")
+            return False
+            
+    def restart_browser(self, restore_tabs=True):
+        """NEW - Replace Chrome with a fresh instance, logged in, with the other tabs reopened"""
+        urls = []
+        try:
+            for handle in self.driver.window_handles[1:]:
+                self.driver.switch_to.window(handle)
+                urls.append(self.driver.current_url)
+        except Exception:
+            pass
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        
+        try:
+            self.setup_driver()
+            self.form_initialized = False
+            if not self.login_to_genesis():
+                logger.error("❌ Recycled browser could not log in to Genesis")
+                return False
+            if restore_tabs:
+                for url in urls:
+                    if url.startswith("http"):
+                        self.driver.execute_script("window.open(arguments[0]);", url)
+                self.driver.switch_to.window(self.driver.window_handles[0])
+            logger.info(f"🧠 Browser recycled ({len(urls)} tabs restored)")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Browser restart failed: {e}")
+            return False
+            
+    def is_browser_alive(self):
+        """NEW - True if the Chrome session still answers WebDriver commands"""
+        try:
+            return self.driver is not None and bool(self.driver.current_url)
+        except Exception:
+            return False
+            
     def keep_alive_forever(self):
-        """PRESERVED - Keep Python script running indefinitely to keep browser alive - NO CHANGES"""
+        """ENHANCED - Keep Python script running indefinitely to keep browser alive
+        Each minute also trims surplus tabs and empties the network log, which would
+        otherwise grow for as long as the browser stays open for review."""
         logger.info("🔄 KEEPING PYTHON SCRIPT ALIVE FOREVER...")
         logger.info("🎉 SUCCESS! Browser will remain open indefinitely")
         logger.info("📊 You can now review the results in the browser")
@@ -1264,32 +3513,226 @@ class InfiniteGenesisAutomation:
                 except:
                     logger.warning("⚠️ Browser may have been closed manually")
                     break
+                
+                # NEW: Trim surplus tabs; never recycle a browser kept open for review
+                if self.memory_governor:
+                    self.memory_governor.check(between_jobs=False)
+                if self.search_capture:
+                    self.search_capture.drain()
                     
         except KeyboardInterrupt:
             logger.info("🛑 User pressed Ctrl+C - stopping keep-alive loop")
             logger.info("💡 Browser should still be open - close it manually when done")
 
+# ============================================================================
+# NEW: Browserless Validation - Checks property inputs in milliseconds each
+# ============================================================================
+
+PROPERTY_FIELDS = ["borough", "block", "lot", "tax_class", "property_address", "owner", "record_id"]
+
+def load_property_jobs(path):
+    """Read properties from a CSV (header row) or JSON-lines file"""
+    def normalize(row):
+        row = {str(key).strip().lower().replace('-', '_').replace(' ', '_'): value for key, value in row.items()}
+        return {name: (str(row[name]).strip() if row.get(name) is not None else None) for name in PROPERTY_FIELDS}
+    
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith(('.jsonl', '.json', '.ndjson')):
+            return [normalize(json.loads(line)) for line in f if line.strip()]
+        return [normalize(row) for row in csv.DictReader(f)]
+
+def validate_property(job, result_cache=None, property_cache=None):
+    """Check one property's inputs without a browser; returns a result dict"""
+    errors = []
+    borough_key, confidence = EnhancedBoroughDetector(None).fuzzy_match_borough(job.get("borough") or "", threshold=0.6)
+    if not borough_key:
+        errors.append(f"borough '{job.get('borough')}' not recognised")
+    
+    block = str(job.get("block") or "").strip()
+    if not block.isdigit():
+        errors.append(f"block '{block}' is not numeric")
+    elif borough_key:
+        block_ranges = EnhancedBoroughDetector.BOROUGH_DATA[borough_key]["block_ranges"]
+        if not any(low <= int(block) <= high for low, high in block_ranges):
+            errors.append(f"block {block} outside {borough_key} block range {block_ranges}")
+    
+    lot = str(job.get("lot") or "").strip()
+    if not lot.isdigit() or int(lot) <= 0:
+        errors.append(f"lot '{lot}' is not a positive number")
+    
+    cached = None
+    if not errors and result_cache:
+        cached = lookup_cached_result(result_cache, property_cache, job["borough"], block, lot, job.get("tax_class"))
+    
+    return {
+        "record_id": job.get("record_id"),
+        "valid": not errors,
+        "errors": errors,
+        "borough": borough_key,
+        "cached_report": cached.get("report_path") if cached else None,
+    }
+
+def run_validation(jobs, args):
+    """--validate: report every property's problems and cache status, exit 2 if any is invalid"""
+    result_cache = None if args.no_cache else ResultCache(ttl_hours=args.cache_ttl_hours)
+    property_cache = None if args.no_cache else PropertyRecordCache(ttl_hours=args.property_cache_ttl_hours)
+    started = time.perf_counter()
+    invalid = 0
+    cached = 0
+    
+    for job in jobs:
+        result = validate_property(job, result_cache, property_cache)
+        if not result["valid"]:
+            invalid += 1
+            logger.error(f"❌ Record {result['record_id']}: {'; '.join(result['errors'])}")
+        elif result["cached_report"]:
+            cached += 1
+            logger.info(f"💾 Record {result['record_id']}: valid, report cached ({result['cached_report']})")
+        else:
+            logger.info(f"✅ Record {result['record_id']}: valid, needs a browser run")
+    
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"📋 VALIDATION COMPLETE: {len(jobs)} properties, {invalid} invalid, {cached} already cached "
+                f"({elapsed_ms / max(len(jobs), 1):.2f} ms each)")
+    return 2 if invalid else 0
+
+def add_logging_arguments(parser):
+    """NEW - Logging options shared by every entry point"""
+    parser.add_argument('--log-file', default='genesis_automation.log', help='Log file path (empty to disable)')
+    parser.add_argument('--log-json', action='store_true', help='Write structured JSON log lines')
+    parser.add_argument('--log-max-mb', type=float, default=10, help='Rotate the log file at this size')
+    parser.add_argument('--log-backups', type=int, default=5, help='Rotated log files to keep')
+    parser.add_argument('--log-rotate-when', default=None, help="Rotate by time instead of size (e.g. 'midnight')")
+    parser.add_argument('--log-level', action='append', metavar='[COMPONENT=]LEVEL',
+                        help='Log level overall or per component: nyc, maps, lot, borough, form, governor, latency, profiler, service, queue, scheduler (repeatable)')
+
+def configure_logging_from_args(args):
+    configure_logging(log_file=args.log_file or None, json_format=args.log_json,
+                      max_bytes=int(args.log_max_mb * 1024 * 1024), backup_count=args.log_backups,
+                      rotate_when=args.log_rotate_when, levels=parse_log_levels(args.log_level))
+
+def add_remote_webdriver_arguments(parser):
+    """NEW - WebDriver options: remote endpoint, command accounting and network capture"""
+    parser.add_argument('--remote-webdriver', metavar='URL',
+                        help='Remote WebDriver / Selenium Grid URL (e.g. http://grid:4444/wd/hub) instead of local Chrome')
+    parser.add_argument('--remote-download-dir',
+                        help="./genesis_reports as seen by the remote node (same storage); each browser downloads "
+                             "into its own downloads/<session> folder under it")
+    parser.add_argument('--account-webdriver', action='store_true',
+                        help='Count and time every WebDriver command per call site; report to genesis_reports/webdriver_calls')
+    parser.add_argument('--no-network-capture', action='store_true',
+                        help='Scrape the Records Selected count from the page instead of reading the search response')
+
+def add_report_arguments(parser):
+    """NEW - Page reports: results table read off the page instead of the Excel download"""
+    parser.add_argument('--page-reports', action='store_true',
+                        help='Write the results table from the page ourselves; Excel export only when it is paginated')
+    parser.add_argument('--report-format', choices=REPORT_FORMATS, default='xlsx',
+                        help='Page report format (xlsx needs openpyxl, parquet needs pyarrow)')
+    parser.add_argument('--page-report-max-rows', type=int, default=500,
+                        help='Larger result sets always use the Excel export')
+
+def report_options_from_args(args):
+    return {"page_reports": args.page_reports, "report_format": args.report_format,
+            "page_report_max_rows": args.page_report_max_rows}
+
+def serve_cached_result(args, result_cache, property_cache):
+    """NEW - Answer a CLI run from the result cache; True if it was served"""
+    cached = lookup_cached_result(result_cache, property_cache, args.borough, args.block, args.lot, args.tax_class)
+    if not cached:
+        return False
+    logger.info(f"💾 CACHE HIT: {cached['record_count']} records for record {args.record_id} "
+                f"(resolved lot {cached['resolved_lot']}) - skipping browser automation")
+    if args.cache_hit_action == 'open' and cached.get("report_path"):
+        open_report_file(cached["report_path"])
+    return True
+
 def main():
-    """100% WORKING MAIN FUNCTION - NO CHANGES"""
+    """ENHANCED - Run one property, or check inputs without Chrome (--validate, optionally --batch)"""
     parser = argparse.ArgumentParser(description='Infinite Genesis GenPAD Automation Script with Lot Validation')
-    parser.add_argument('--username', required=True, help='Genesis username')
-    parser.add_argument('--password', required=True, help='Genesis password')
-    parser.add_argument('--borough', required=True, help='Borough name')
-    parser.add_argument('--block', required=True, help='Block number')
-    parser.add_argument('--lot', required=True, help='Lot number')
-    parser.add_argument('--tax-class', required=True, help='Tax class')
-    parser.add_argument('--property-address', required=True, help='Property address')
-    parser.add_argument('--owner', required=True, help='Owner name')
-    parser.add_argument('--record-id', required=True, help='Record ID')
+    parser.add_argument('--username', help='Genesis username')
+    parser.add_argument('--password', help='Genesis password')
+    parser.add_argument('--borough', help='Borough name')
+    parser.add_argument('--block', help='Block number')
+    parser.add_argument('--lot', help='Lot number')
+    parser.add_argument('--tax-class', help='Tax class')
+    parser.add_argument('--property-address', help='Property address')
+    parser.add_argument('--owner', help='Owner name')
+    parser.add_argument('--record-id', help='Record ID')
+    parser.add_argument('--validate', action='store_true',
+                        help='Check inputs (and whether a report is cached) without launching Chrome')
+    parser.add_argument('--batch', help='CSV or JSONL file of properties (with --validate)')
+    parser.add_argument('--cache-ttl-hours', type=float, default=24, help='Hours a cached search result stays valid')
+    parser.add_argument('--property-cache-ttl-hours', type=float, default=24 * 7,
+                        help='Hours a cached NYC portal property record stays valid')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the result and property caches')
+    parser.add_argument('--rate-limit', action='append', metavar='HOST=RATE', type=rate_limit_option,
+                        help='Override actions per second for genesis, nyc or google (repeatable)')
+    add_logging_arguments(parser)
+    parser.add_argument('--no-resume', action='store_true', help='Ignore the job journal and start from the first stage')
+    parser.add_argument('--cache-hit-action', choices=['open', 'return'], default='open',
+                        help='On a cache hit: reopen the cached report, or just return')
+    parser.add_argument('--single-flight-wait-minutes', type=float, default=30,
+                        help='How long a duplicate trigger waits for the run already processing the property')
+    add_remote_webdriver_arguments(parser)
+    add_report_arguments(parser)
+    add_metrics_arguments(parser)
+    add_profiling_arguments(parser)
     
     args = parser.parse_args()
     
-    # NEW: Launch file search in a separate thread (parallel, non-blocking)
+    # Credentials are only needed when a browser runs; property fields unless a batch file is given
+    required = [] if args.batch else list(PROPERTY_FIELDS)
+    if not args.validate:
+        required = ["username", "password"] + required
+    missing = [f"--{name.replace('_', '-')}" for name in required if getattr(args, name) is None]
+    if missing:
+        parser.error(f"the following arguments are required: {', '.join(missing)}")
+    if args.batch and not args.validate:
+        parser.error("--batch is only supported together with --validate")
+    
+    configure_logging_from_args(args)
+    
+    if args.validate:
+        jobs = load_property_jobs(args.batch) if args.batch else [{name: getattr(args, name) for name in PROPERTY_FIELDS}]
+        return run_validation(jobs, args)
+    
+    global rate_governor
+    if args.rate_limit:
+        rate_governor = RateGovernor(parse_rate_limits(args.rate_limit))
+    start_metrics_from_args(args)
+    configure_profiling_from_args(args)
+    
+    # NEW: Serve repeated triggers from the result cache without launching Chrome
+    result_cache = None
+    property_cache = None
+    flight = None
+    if not args.no_cache:
+        result_cache = ResultCache(ttl_hours=args.cache_ttl_hours)
+        property_cache = PropertyRecordCache(ttl_hours=args.property_cache_ttl_hours)
+        if serve_cached_result(args, result_cache, property_cache):
+            return 0
+        
+        # NEW: A duplicate trigger for a property already in flight waits for that run's result
+        flight = SingleFlight(args.record_id, args.borough, args.block, args.lot)
+        while not flight.acquire():
+            holder = flight.holder or {}
+            logger.info(f"🔗 Record {holder.get('record_id')} for this property is already running "
+                        f"(pid {holder.get('pid')}) - waiting for its result instead of launching Chrome")
+            if not flight.wait(timeout=args.single_flight_wait_minutes * 60):
+                logger.warning("⏰ The other run is still going - starting a separate run")
+                break
+            if serve_cached_result(args, result_cache, property_cache):
+                return 0
+            logger.info("🔗 The other run left no cached result - running the automation here")
+    
+    # NEW: Launch file search on the background I/O executor (parallel, non-blocking)
     logger.info("🔍 Launching file search for property address in parallel...")
     try:
-        threading.Thread(target=open_address_file, args=(args.property_address,), daemon=True).start()
-    except Exception as e:
-        logger.error(f"Failed to launch file search thread: {e}")
+        io_executor.submit(open_address_file, args.property_address, block=False,
+                           description=f"file search for {args.property_address}")
+    except ExecutorBusy as e:
+        logger.error(f"Failed to launch file search: {e}")
     
     automation = None
     
@@ -1300,13 +3743,21 @@ def main():
         logger.info("🚀 Step 3: GENESIS automation (runs THIRD, exactly as before)")
         
         logger.info("Setting up WebDriver")
-        automation = InfiniteGenesisAutomation(args.username, args.password)
+        automation = InfiniteGenesisAutomation(args.username, args.password, result_cache=result_cache,
+                                               resume=not args.no_resume, property_cache=property_cache,
+                                               remote_url=args.remote_webdriver,
+                                               remote_download_dir=args.remote_download_dir,
+                                               account_commands=args.account_webdriver,
+                                               capture_network=not args.no_network_capture,
+                                               **report_options_from_args(args))
         automation.setup_driver()
         
         success = automation.run_automation(
             args.borough, args.block, args.lot, args.tax_class,
             args.property_address, args.owner, args.record_id
         )
+        if flight:
+            flight.release()  # the result is cached now; waiting duplicates can answer from it
         
         if success:
             logger.info("🎉 TRIPLE AUTOMATION COMPLETED SUCCESSFULLY!")
@@ -1335,6 +3786,8 @@ def main():
         
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
+        if flight:
+            flight.release()
         
         # Even on error, try to keep script alive to preserve browser
         if automation and automation.driver:
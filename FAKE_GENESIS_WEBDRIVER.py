@@ -0,0 +1,633 @@
+#!/usr/bin/env python3
+"""
+FAKE GENESIS WEBDRIVER - In-process fake driver and Genesis form for microbenchmarks
+Runs the real LotValidator, EnhancedBoroughDetector, SmartFormFiller and search code
+against a scriptable model of the Genesis comparison form instead of Chrome.
+Sleeps, rate governor waits and search polling run on a virtual clock, so thousands
+of simulated properties per second can be pushed through while measuring what the
+algorithms cost: lot probes, WebDriver round trips and virtual (browser) seconds.
+
+Every fake call goes through driver.execute(), like selenium's, so the
+WebDriverCommandAccountant (--account-webdriver) works on the fake too.
+Selenium must be importable (Select and the expected conditions are the real ones).
+
+Usage:
+    python FAKE_GENESIS_WEBDRIVER.py [--properties 2000] [--block-run 4] [--valid-lot-rate 0.4] [--seed 7]
+                                     [--scenario varying|constant] [--command-latency 0.05] [--account]
+                                     [--no-network-capture]
+
+The varying scenario (default) gives each property its own record count and each
+search and lot validation its own latency, and the report counts searches whose
+returned record count differs from what the site answered (wrong_counts).
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time as real_time
+from collections import Counter
+from contextlib import contextmanager
+
+import DUAL_PROCESS_GENESIS_NYC_AUTOMATION as genesis
+
+GENESIS_FORM_URL = "https://genesisgenpad.com/comparison/main"
+TARGET_PROPERTY_ERROR = "Target property does not exist"
+
+# ============================================================================
+# VIRTUAL TIME
+# ============================================================================
+
+class VirtualClock:
+    """Monotonic clock that only moves when something sleeps or a command costs time"""
+
+    EPOCH = 1_700_000_000.0
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = 0.0
+
+    def sleep(self, seconds):
+        seconds = max(float(seconds), 0.0)
+        self.now += seconds
+        self.slept += seconds
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.EPOCH + self.now
+
+class VirtualTimeModule:
+    """Stands in for the `time` module inside the automation: clock calls are virtual"""
+
+    def __init__(self, clock):
+        self._clock = clock
+        self.sleep = clock.sleep
+        self.monotonic = clock.monotonic
+        self.perf_counter = clock.monotonic
+        self.time = clock.time
+
+    def __getattr__(self, name):
+        return getattr(real_time, name)
+
+class OfflineCircuitBreaker(genesis.CircuitBreaker):
+    """Breaker that never probes the real portal (an open circuit stays open)"""
+
+    def _probe_loop(self):
+        return
+
+@contextmanager
+def isolated_genesis(clock, quiet=True):
+    """Point the automation module at virtual time and throwaway governor/latency/breaker state"""
+    saved = {name: getattr(genesis, name) for name in ("time", "rate_governor", "latency_model", "circuit_breakers")}
+    level = genesis.logger.level
+    genesis.time = VirtualTimeModule(clock)
+    genesis.rate_governor = genesis.RateGovernor()
+    genesis.latency_model = genesis.LatencyModel(state_path=None, save_every=float("inf"))
+    genesis.latency_model.samples = {}
+    genesis.circuit_breakers = {name: OfflineCircuitBreaker(name, None) for name in saved["circuit_breakers"]}
+    if quiet:
+        genesis.logger.setLevel("WARNING")
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(genesis, name, value)
+        genesis.logger.setLevel(level)
+
+# ============================================================================
+# DOM MODEL
+# ============================================================================
+
+class FakeNode:
+    def __init__(self, tag, node_id=None, value="", text="", displayed=True, enabled=True, options=None,
+                 css_class=""):
+        self.tag = tag
+        self.id = node_id
+        self.value = value
+        self.text = text
+        self.displayed = displayed
+        self.enabled = enabled
+        self.css_class = css_class
+        self.options = []  # option FakeNodes for a select
+        self.parent = None
+        self.selected = False
+        for option_value, option_text in options or []:
+            option = FakeNode("option", value=option_value, text=option_text)
+            option.parent = self
+            self.options.append(option)
+        if self.options:
+            self.select(self.options[0].value)
+
+    def select(self, value):
+        for option in self.options:
+            option.selected = option.value == value
+        self.value = value
+
+    def attribute(self, name):
+        if name == "value":
+            return self.value
+        if name == "id":
+            return self.id
+        if name == "class":
+            return self.css_class
+        return None
+
+class FakeGenesisSite:
+    """
+    Scriptable Genesis comparison form
+    lot_exists(borough_name, block, lot) -> bool decides lot validation;
+    records(borough_name, block, lot, form) -> int is the search result;
+    validation_latency and search_latency are seconds, or callables returning them
+    """
+
+    BOROUGH_OPTIONS = [("1", "Brooklyn"), ("2", "Manhattan"), ("3", "Queens"), ("4", "Bronx"), ("5", "Staten Island")]
+    TAX_CLASS_OPTIONS = [("1", "Class 1"), ("2", "Class 2"), ("3", "Class 2A/2B/2C"), ("4", "Class 4")]
+
+    def __init__(self, lot_exists=None, records=None, validation_latency=1.0, search_latency=6.0):
+        self.lot_exists = lot_exists or (lambda borough, block, lot: True)
+        self.records = records or (lambda borough, block, lot, form: 25)
+        self.validation_latency = validation_latency
+        self.search_latency = search_latency
+        self.reset()
+
+    def reset(self):
+        """A freshly loaded, logged-in comparison form"""
+        self.url = GENESIS_FORM_URL
+        self.nodes = {}
+        for node in [
+            FakeNode("select", "curr-comparison-type", options=[("1", "Radius"), ("2", "Distance")]),
+            FakeNode("div", "distance-area", displayed=False),
+            FakeNode("select", "UnitFmSelect", options=[("1", "Kilometers"), ("2", "Miles")]),
+            FakeNode("select", "Borough", options=self.BOROUGH_OPTIONS),
+            FakeNode("input", "TargetBlock"),
+            FakeNode("input", "TargetLot"),
+            FakeNode("select", "TaxClassSelect", options=self.TAX_CLASS_OPTIONS),
+            FakeNode("input", "YearBuiltLow"),
+            FakeNode("input", "YearBuiltHigh"),
+            FakeNode("input", "ActualTotalAsstLow", displayed=False),
+            FakeNode("select", "sort-order-select", options=[("1", "Address"), ("2", "Distance")]),
+            FakeNode("input", "Distance"),
+            FakeNode("button", "btn-run"),
+            FakeNode("button", "btn-excel"),
+        ]:
+            self.nodes[node.id] = node
+        self.assessment_box = FakeNode("input", css_class="format-textbox-class")
+        self.error_span = FakeNode("span", text=TARGET_PROPERTY_ERROR, css_class="text-danger")
+        self.records_label = FakeNode("label", text="Records Selected")
+        self.records_span = FakeNode("span", css_class="left-offset-20")
+        self.lot_error_at = None   # virtual time the error message appears
+        self.validated_lot = None
+        self.results = None        # (ready at, record count) of the last search
+        self.results_shown = False # the last search's count has been written to the page
+        self.network_log = []      # performance log entries not yet read
+        self.pending_response = None  # (request id, ready at, record count) of the running search
+        self.response_bodies = {}
+        self.searches = 0
+        self.validations = 0
+        self.last_count = None     # record count the last search answered with
+
+    def form(self):
+        return {node_id: node.value for node_id, node in self.nodes.items() if node.tag in ("input", "select")}
+
+    def borough_name(self):
+        borough = self.nodes["Borough"]
+        return next((option.text for option in borough.options if option.selected), "")
+
+    def on_change(self, node, now):
+        if node.id == "curr-comparison-type":
+            self.nodes["distance-area"].displayed = node.value == "2"
+        elif node.id == "TargetLot":
+            self.lot_error_at = None  # editing the lot clears the old message
+
+    def on_blur(self, node, now):
+        if node.id != "TargetLot" or not node.value:
+            return
+        self.validations += 1
+        lot = int(node.value)
+        exists = self.lot_exists(self.borough_name(), self.nodes["TargetBlock"].value, lot)
+        self.validated_lot = lot if exists else None
+        self.lot_error_at = None if exists else now + self._seconds(self.validation_latency)
+
+    def on_click(self, node, now):
+        if node.id == "btn-run":
+            self.searches += 1
+            count = self.records(self.borough_name(), self.nodes["TargetBlock"].value,
+                                 self.nodes["TargetLot"].value, self.form())
+            ready_at = now + self._seconds(self.search_latency)
+            self.last_count = count
+            self.results = (ready_at, count)
+            self.results_shown = False
+            request_id = f"search-{self.searches}"
+            self.pending_response = (request_id, ready_at, count)
+            self._log_network("Network.requestWillBeSent", now, requestId=request_id, type="XHR",
+                              request={"url": "https://genesisgenpad.com/comparison/search", "method": "POST"})
+
+    @staticmethod
+    def _seconds(latency):
+        return latency() if callable(latency) else latency
+
+    def _log_network(self, method, now, **params):
+        message = {"message": {"method": method, "params": dict(params, timestamp=now)}, "webview": "genesis"}
+        self.network_log.append({"level": "INFO", "message": json.dumps(message), "timestamp": int(now * 1000)})
+
+    def read_network_log(self, now):
+        """Performance log entries since the last read (the search response once it has landed)"""
+        if self.pending_response and now >= self.pending_response[1]:
+            request_id, ready_at, count = self.pending_response
+            rows = [{"Address": f"{index + 1} Comparable St", "Units": 10 + index % 7} for index in range(count)]
+            self.response_bodies[request_id] = json.dumps({"RecordsSelected": count, "rows": rows})
+            self._log_network("Network.responseReceived", ready_at, requestId=request_id, type="XHR",
+                              response={"status": 200, "mimeType": "application/json"})
+            self._log_network("Network.loadingFinished", ready_at, requestId=request_id)
+            self.pending_response = None
+        entries, self.network_log = self.network_log, []
+        return entries
+
+    def error_visible(self, now):
+        return self.lot_error_at is not None and now >= self.lot_error_at
+
+    def clear_records_text(self):
+        """The automation blanks the count before RUN (a finished search's count stays otherwise)"""
+        if self.results is not None and self.records_span.text:
+            self.records_span.text = ""
+            return ""
+        return None
+
+    def records_text(self, now):
+        """Text of the Records Selected span (stays at the old count until new results land)"""
+        if self.results is None:
+            return None
+        ready_at, count = self.results
+        if not self.results_shown and now >= ready_at:
+            self.records_span.text = f"{count:,}"
+            self.results_shown = True
+        return self.records_span.text or None
+
+# ============================================================================
+# FAKE DRIVER
+# ============================================================================
+
+class FakeWebElement:
+    def __init__(self, driver, node):
+        self.parent = driver
+        self.node = node
+
+    def _execute(self, command, params=None):
+        params = dict(params or {})
+        params["element"] = self
+        return self.parent.execute(command, params)["value"]
+
+    @property
+    def tag_name(self):
+        return self._execute("getElementTagName")
+
+    @property
+    def text(self):
+        return self._execute("getElementText")
+
+    def get_attribute(self, name):
+        return self._execute("getElementAttribute", {"name": name})
+
+    get_dom_attribute = get_attribute
+
+    def get_property(self, name):
+        return self._execute("getElementProperty", {"name": name})
+
+    def is_displayed(self):
+        return self._execute("isElementDisplayed")
+
+    def is_enabled(self):
+        return self._execute("isElementEnabled")
+
+    def is_selected(self):
+        return self._execute("isElementSelected")
+
+    def click(self):
+        self._execute("clickElement")
+
+    def clear(self):
+        self._execute("clearElement")
+
+    def send_keys(self, *value):
+        self._execute("sendKeysToElement", {"text": "".join(str(part) for part in value)})
+
+    def find_element(self, by, value):
+        return self._execute("findChildElement", {"using": by, "value": value})
+
+    def find_elements(self, by, value):
+        return self._execute("findChildElements", {"using": by, "value": value})
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.execute("switchToWindow", {"handle": handle})
+
+class FakeWebDriver:
+    """
+    Just enough of selenium's WebDriver for the Genesis form code
+    Each command costs command_latency virtual seconds; commands counts them by name.
+    """
+
+    def __init__(self, site, clock, command_latency=0.0):
+        genesis.load_selenium()
+        self.site = site
+        self.clock = clock
+        self.command_latency = command_latency
+        self.commands = Counter()
+        self.unknown_scripts = Counter()
+        self.window_handles = ["genesis"]
+        self.current_window_handle = "genesis"
+        self.switch_to = FakeSwitchTo(self)
+
+    # --- selenium-facing API ---
+
+    def find_element(self, by, value):
+        return self.execute("findElement", {"using": by, "value": value})["value"]
+
+    def find_elements(self, by, value):
+        return self.execute("findElements", {"using": by, "value": value})["value"]
+
+    def execute_script(self, script, *args):
+        return self.execute("w3cExecuteScript", {"script": script, "args": list(args)})["value"]
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+
+    def get_log(self, log_type):
+        return self.execute("getLog", {"type": log_type})["value"]
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    @property
+    def current_url(self):
+        return self.execute("getCurrentUrl")["value"]
+
+    def quit(self):
+        pass
+
+    def execute(self, driver_command, params=None):
+        self.commands[driver_command] += 1
+        self.clock.advance(self.command_latency)
+        handler = getattr(self, "_cmd_" + driver_command)
+        return {"value": handler(params or {})}
+
+    # --- command handlers ---
+
+    def _lookup(self, by, value):
+        """Nodes matching a locator, covering the IDs, XPaths and CSS the automation uses"""
+        site, now = self.site, self.clock.now
+        if by == "id":
+            node = site.nodes.get(value)
+            return [node] if node is not None else []
+        if by == "css selector" and "format-textbox-class" in value:
+            return [site.assessment_box]
+        if by == "xpath":
+            if TARGET_PROPERTY_ERROR in value:
+                return [site.error_span] if site.error_visible(now) else []
+            if "RecordsSelected" in value:
+                if site.records_text(now) is None:
+                    return []
+                return [site.records_span] if "left-offset-20" in value else [site.records_label]
+        return []
+
+    def _find(self, params):
+        nodes = self._lookup(params["using"], params["value"])
+        if not nodes:
+            raise genesis.NoSuchElementException(f"fake Genesis has no element {params['using']}={params['value']}")
+        return FakeWebElement(self, nodes[0])
+
+    def _cmd_findElement(self, params):
+        return self._find(params)
+
+    def _cmd_findElements(self, params):
+        return [FakeWebElement(self, node) for node in self._lookup(params["using"], params["value"])]
+
+    def _cmd_findChildElement(self, params):
+        elements = self._cmd_findChildElements(params)
+        if not elements:
+            raise genesis.NoSuchElementException(f"fake Genesis has no child {params['value']}")
+        return elements[0]
+
+    def _cmd_findChildElements(self, params):
+        node = params["element"].node
+        if params["using"] == "tag name" and params["value"] == "option":
+            return [FakeWebElement(self, option) for option in node.options]
+        if params["using"] == "css selector" and params["value"].startswith("option"):
+            match = re.search(r'value\s*=\s*["\']?([^"\'\]]*)', params["value"])
+            wanted = match.group(1) if match else None
+            return [FakeWebElement(self, option) for option in node.options if option.value == wanted]
+        return []
+
+    def _cmd_getElementTagName(self, params):
+        return params["element"].node.tag
+
+    def _cmd_getElementText(self, params):
+        node = params["element"].node
+        if node is self.site.records_span:
+            return self.site.records_text(self.clock.now) or ""
+        return node.text
+
+    def _cmd_getElementAttribute(self, params):
+        return params["element"].node.attribute(params["name"])
+
+    _cmd_getElementProperty = _cmd_getElementAttribute
+
+    def _cmd_isElementDisplayed(self, params):
+        return params["element"].node.displayed
+
+    def _cmd_isElementEnabled(self, params):
+        return params["element"].node.enabled
+
+    def _cmd_isElementSelected(self, params):
+        return params["element"].node.selected
+
+    def _cmd_clickElement(self, params):
+        node = params["element"].node
+        if node.tag == "option":
+            node.parent.select(node.value)
+            self.site.on_change(node.parent, self.clock.now)
+        else:
+            self.site.on_click(node, self.clock.now)
+
+    def _cmd_clearElement(self, params):
+        node = params["element"].node
+        node.value = ""
+        self.site.on_change(node, self.clock.now)
+
+    def _cmd_sendKeysToElement(self, params):
+        node = params["element"].node
+        node.value += params["text"]
+        self.site.on_change(node, self.clock.now)
+
+    def _cmd_getCurrentUrl(self, params):
+        return self.site.url
+
+    def _cmd_get(self, params):
+        self.site.url = params["url"]
+
+    def _cmd_getLog(self, params):
+        return self.site.read_network_log(self.clock.now) if params["type"] == "performance" else []
+
+    def _cmd_executeCdpCommand(self, params):
+        if params["cmd"] == "Network.getResponseBody":
+            return {"body": self.site.response_bodies.pop(params["params"]["requestId"], ""), "base64Encoded": False}
+        return {}
+
+    def _cmd_switchToWindow(self, params):
+        self.current_window_handle = params["handle"]
+
+    def _cmd_w3cExecuteScript(self, params):
+        """The execute_script patterns the automation sends, matched by their text"""
+        script, args = params["script"], params["args"]
+        node = args[0].node if args and isinstance(args[0], FakeWebElement) else None
+        now = self.clock.now
+        if "blur()" in script and node is not None:
+            self.site.on_blur(node, now)
+        elif "select.options" in script:
+            select = self.site.nodes.get(args[0])
+            return [[option.value, option.text] for option in select.options] if select else []
+        elif "span.textContent = ''" in script:
+            return self.site.clear_records_text()
+        elif "RecordsSelected" in script:
+            text = self.site.records_text(now)
+            return int(text.replace(",", "")) if text else None
+        elif "arguments[0].click()" in script and node is not None:
+            self.site.on_click(node, now)
+        elif "previousElementSibling" in script:
+            return None  # Genesis' visible assessment box is found by the CSS fallback
+        elif "document.body.click()" in script or "scrollTo" in script or "dispatchEvent" in script:
+            pass
+        else:
+            self.unknown_scripts[script.strip().splitlines()[0][:60]] += 1
+        return None
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def attach_fake_driver(automation, driver):
+    """Wire the automation's helpers to a fake driver the way setup_driver does for Chrome"""
+    automation.driver = driver
+    if automation.command_accountant:
+        automation.command_accountant.install(driver)
+    if automation.capture_network:
+        automation.search_capture = genesis.SearchResponseCapture.for_driver(driver)
+    automation.wait = genesis.AdaptiveWait(driver, "genesis")
+    automation.borough_detector = genesis.EnhancedBoroughDetector(driver)
+    automation.smart_form_filler = genesis.SmartFormFiller(driver)
+    automation.lot_validator = genesis.LotValidator(driver, automation.smart_form_filler)
+    return automation
+
+def simulated_properties(count, block_run=1, seed=0):
+    """Properties in runs of block_run neighbours on the same borough/block"""
+    rng = random.Random(seed)
+    boroughs = [name for _, name in FakeGenesisSite.BOROUGH_OPTIONS]
+    properties = []
+    while len(properties) < count:
+        borough, block = rng.choice(boroughs), str(rng.randint(1, 9000))
+        for _ in range(min(block_run, count - len(properties))):
+            properties.append({"borough": borough, "block": block, "lot": str(rng.randint(1, 120))})
+    return properties
+
+def random_lot_rule(valid_lot_rate, seed=0):
+    """lot_exists callback: each (borough, block, lot) is valid with the given probability, stably"""
+    def lot_exists(borough, block, lot):
+        return random.Random(f"{seed}/{borough}/{block}/{lot}").random() < valid_lot_rate
+    return lot_exists
+
+def varying_records(seed=0, maximum=150):
+    """records callback: a stable pseudo-random count per property, 0..maximum"""
+    def records(borough, block, lot, form):
+        return random.Random(f"{seed}/records/{borough}/{block}/{lot}").randint(0, maximum)
+    return records
+
+def varying_latency(choices, seed=0):
+    """Latency callable drawing each call's seconds from choices"""
+    rng = random.Random(f"{seed}/latency/{choices}")
+    return lambda: rng.choice(choices)
+
+def make_site(scenario, valid_lot_rate=0.4, seed=0):
+    """constant: 25 records, 1 s validations and 6 s searches; varying: per-property
+    counts, validations of 0.5-2.5 s and searches of 4, 6 or 12 s"""
+    lot_exists = random_lot_rule(valid_lot_rate, seed)
+    if scenario == "constant":
+        return FakeGenesisSite(lot_exists=lot_exists)
+    return FakeGenesisSite(lot_exists=lot_exists, records=varying_records(seed),
+                           validation_latency=varying_latency((0.5, 1.0, 1.5, 2.5), seed),
+                           search_latency=varying_latency((4.0, 6.0, 12.0), seed))
+
+def run_benchmark(properties, site, command_latency=0.0, account=False, capture_network=True):
+    """Form setup, distance and search for each property on one warm fake session"""
+    clock = VirtualClock()
+    with isolated_genesis(clock):
+        driver = FakeWebDriver(site, clock, command_latency)
+        automation = genesis.InfiniteGenesisAutomation("fake", "fake", resume=False, account_commands=account,
+                                                       capture_network=capture_network)
+        attach_fake_driver(automation, driver)
+        probes = []
+        records = []
+        failures = 0
+        wrong_counts = 0
+        started = real_time.perf_counter()
+        for prop in properties:
+            automation.reset_for_next_job()
+            if not automation.setup_form_initial(prop["borough"], prop["block"], prop["lot"], "2", ""):
+                failures += 1
+                continue
+            probes.append(automation.lot_validator.probes)
+            automation.update_distance_only(genesis.GENESIS_SEARCH_PARAMS["radius"])
+            records.append(automation.run_search_and_check_results())
+            wrong_counts += records[-1] != site.last_count
+        wall = real_time.perf_counter() - started
+    done = len(properties) - failures
+    report = {
+        "properties": len(properties),
+        "failures": failures,
+        "wrong_counts": wrong_counts,
+        "wall_seconds": round(wall, 3),
+        "properties_per_second": round(len(properties) / wall, 1) if wall else None,
+        "avg_lot_probes": round(sum(probes) / done, 2) if done else None,
+        "avg_webdriver_commands": round(sum(driver.commands.values()) / len(properties), 1),
+        "avg_virtual_seconds": round(clock.now / len(properties), 2),
+        "genesis_validations": site.validations,
+        "searches": site.searches,
+        "commands": dict(driver.commands.most_common()),
+        "unknown_scripts": dict(driver.unknown_scripts),
+    }
+    if automation.command_accountant:
+        report["top_sites"] = automation.command_accountant.report(top=10)["top_sites"]
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmark the Genesis form logic on a fake WebDriver')
+    parser.add_argument('--properties', type=int, default=2000, help='Simulated properties')
+    parser.add_argument('--block-run', type=int, default=1, help='Consecutive properties on the same borough/block')
+    parser.add_argument('--valid-lot-rate', type=float, default=0.4, help='Chance a probed lot exists')
+    parser.add_argument('--seed', type=int, default=7, help='Random seed')
+    parser.add_argument('--scenario', choices=['varying', 'constant'], default='varying',
+                        help='Per-property counts and varying latencies, or a constant 25 records')
+    parser.add_argument('--command-latency', type=float, default=0.0,
+                        help='Virtual seconds charged per WebDriver command')
+    parser.add_argument('--account', action='store_true', help='Also report WebDriver call sites')
+    parser.add_argument('--no-network-capture', action='store_true',
+                        help='Read search results from the page instead of the captured response')
+    args = parser.parse_args()
+
+    site = make_site(args.scenario, args.valid_lot_rate, args.seed)
+    properties = simulated_properties(args.properties, args.block_run, args.seed)
+    report = run_benchmark(properties, site, args.command_latency, args.account, not args.no_network_capture)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
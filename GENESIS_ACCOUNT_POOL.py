@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+GENESIS ACCOUNT POOL - Several Genesis accounts behind one warm session pool
+Each account has its own concurrent-session limit and its own rate governor bucket,
+so total throughput grows with the number of accounts held. The pool assigns new
+browser sessions to the least-loaded healthy account and rotates around accounts
+whose health went bad:
+  * healthy          - usable up to max_sessions browsers
+  * rate_limited     - cooling down (doubling each strike, up to an hour)
+  * session_expired  - sessions were logged out mid-use, usually another login on
+                       the same account; briefly paused and its session limit lowered
+  * locked_out       - Genesis locked the account; cooling down for lockout_minutes
+  * bad_credentials  - login rejected; disabled until the process restarts
+  * login_failed     - unexplained login failures; paused after 3 in a row
+
+Accounts file (JSON list; password_env reads the password from the environment):
+    [{"name": "ops1", "username": "ops1@example.com", "password_env": "GENESIS_PW_OPS1", "max_sessions": 2},
+     {"name": "ops2", "username": "ops2@example.com", "password": "...", "max_sessions": 1}]
+
+Workers on several hosts should each get their own accounts file: the session
+limits are enforced per process.
+"""
+
+import json
+import os
+import threading
+import time
+
+import DUAL_PROCESS_GENESIS_NYC_AUTOMATION as genesis
+
+account_logger = genesis.logger.getChild("accounts")
+
+DEFAULT_ACCOUNTS_PATH = os.path.join(os.getcwd(), "genesis_accounts.json")
+
+class GenesisAccount:
+    """Credentials, session limit and health of one Genesis login"""
+
+    def __init__(self, name, username, password, max_sessions=1):
+        self.name = name
+        self.username = username
+        self.password = password
+        self.max_sessions = max_sessions
+        self.limit = max_sessions  # lowered when sessions keep expiring
+        self.sessions = 0
+        self.state = "healthy"
+        self.reason = None
+        self.available_at = 0.0  # None = disabled
+        self.strikes = 0
+        self.jobs = 0
+
+    def usable(self, now):
+        return self.available_at is not None and now >= self.available_at
+
+    def status(self, now):
+        return {
+            "username": self.username,
+            "state": self.state,
+            "reason": self.reason,
+            "sessions": self.sessions,
+            "limit": self.limit,
+            "max_sessions": self.max_sessions,
+            "jobs": self.jobs,
+            "available_in": None if self.available_at is None else max(0, round(self.available_at - now)),
+        }
+
+class AccountPool:
+    """Assigns browser sessions to accounts and tracks account health"""
+
+    RATE_LIMIT_COOLDOWN = 300.0
+    SESSION_EXPIRED_PAUSE = 30.0
+    LOGIN_FAILURE_PAUSE = 300.0
+    LOGIN_FAILURE_STRIKES = 3
+    MAX_COOLDOWN = 3600.0
+
+    def __init__(self, accounts, lockout_minutes=60):
+        if not accounts:
+            raise ValueError("at least one Genesis account is required")
+        names = [account.name for account in accounts]
+        if len(set(names)) != len(names):
+            raise ValueError(f"duplicate Genesis account names in {names}")
+        self.accounts = {account.name: account for account in accounts}
+        self.lockout_seconds = lockout_minutes * 60
+        self.lock = threading.Lock()
+        genesis.metrics.add_gauge("genesis_account_sessions", "Browser sessions per Genesis account",
+                                  ["account", "state"], self._session_gauge)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        accounts = []
+        for index, entry in enumerate(entries):
+            password = entry.get("password")
+            if password is None and entry.get("password_env"):
+                password = os.environ.get(entry["password_env"])
+            if not entry.get("username") or password is None:
+                raise ValueError(f"account {index + 1} in {path} needs a username and a password or password_env")
+            accounts.append(GenesisAccount(entry.get("name") or entry["username"], entry["username"], password,
+                                           int(entry.get("max_sessions", 1))))
+        return cls(accounts, **kwargs)
+
+    def capacity(self):
+        """Browser sessions the healthy accounts allow right now"""
+        now = time.time()
+        with self.lock:
+            return sum(account.limit for account in self.accounts.values() if account.usable(now))
+
+    def any_available(self):
+        now = time.time()
+        with self.lock:
+            return any(account.usable(now) for account in self.accounts.values())
+
+    def usable(self, account):
+        with self.lock:
+            return account.usable(time.time())
+
+    def assign(self):
+        """Take a session slot on the least-loaded healthy account; None if all are full or cooling down"""
+        now = time.time()
+        with self.lock:
+            candidates = [account for account in self.accounts.values()
+                          if account.usable(now) and account.sessions < account.limit]
+            if not candidates:
+                return None
+            account = min(candidates, key=lambda account: (account.sessions / account.limit, account.jobs))
+            account.sessions += 1
+            return account
+
+    def unassign(self, account):
+        """A session of this account was closed"""
+        with self.lock:
+            account.sessions = max(0, account.sessions - 1)
+
+    def job_started(self, account):
+        with self.lock:
+            account.jobs += 1
+
+    def report(self, account, state, reason=None):
+        """Health signal from a session logged in with this account"""
+        now = time.time()
+        with self.lock:
+            previous = account.state
+            if state == "healthy":
+                account.strikes = 0
+                account.state, account.reason = "healthy", None
+                return
+            account.reason = reason or state
+            if state == "rate_limited":
+                account.strikes += 1
+                pause = min(self.MAX_COOLDOWN, self.RATE_LIMIT_COOLDOWN * 2 ** (account.strikes - 1))
+            elif state == "locked_out":
+                pause = self.lockout_seconds
+            elif state == "bad_credentials":
+                pause = None
+            elif state == "session_expired":
+                if account.sessions > 1 and account.limit > 1:
+                    account.limit -= 1
+                    account_logger.warning(f"🔑 Account {account.name}: sessions keep expiring - "
+                                           f"lowering its session limit to {account.limit}")
+                pause = self.SESSION_EXPIRED_PAUSE
+            else:
+                account.strikes += 1
+                if account.strikes < self.LOGIN_FAILURE_STRIKES:
+                    return
+                pause = self.LOGIN_FAILURE_PAUSE
+            account.state = state
+            account.available_at = None if pause is None else max(account.available_at or 0, now + pause)
+        if pause is None:
+            account_logger.error(f"🔒 Account {account.name} disabled: {account.reason}")
+        elif not state == previous == "session_expired":
+            detail = f" ({reason})" if reason else ""
+            account_logger.warning(f"🔑 Account {account.name} {state}{detail} - "
+                                   f"rotating to other accounts for {pause:.0f}s")
+
+    def _session_gauge(self):
+        with self.lock:
+            return {(account.name, account.state): account.sessions for account in self.accounts.values()}
+
+    def status(self):
+        now = time.time()
+        with self.lock:
+            return {name: account.status(now) for name, account in self.accounts.items()}
+
+def add_account_arguments(parser):
+    """--username/--password for one account, or --accounts for several"""
+    parser.add_argument('--username', help='Genesis username (single account)')
+    parser.add_argument('--password', help='Genesis password (single account)')
+    parser.add_argument('--max-sessions', type=int, default=None,
+                        help='Concurrent browser sessions for the single account (default: the browser cap)')
+    parser.add_argument('--accounts', help=f'JSON file of Genesis accounts (e.g. {os.path.basename(DEFAULT_ACCOUNTS_PATH)})')
+    parser.add_argument('--lockout-minutes', type=float, default=60,
+                        help='How long a locked-out account is left alone before it is tried again')
+
+def accounts_from_args(args, default_sessions):
+    """AccountPool from --accounts, or a one-account pool from --username/--password"""
+    if args.accounts:
+        return AccountPool.load(args.accounts, lockout_minutes=args.lockout_minutes)
+    if not args.username or args.password is None:
+        raise ValueError("either --accounts or both --username and --password are required")
+    return AccountPool([GenesisAccount(args.username, args.username, args.password,
+                                       args.max_sessions or default_sessions)],
+                       lockout_minutes=args.lockout_minutes)
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+GENESIS JOB QUEUE - Lease-based property job queue for workers on several hosts
+Jobs live in a SQLite file on shared storage. A worker claims a job with a lease
+(visibility timeout), heartbeats while the browser runs, and completes or fails it.
+If a worker dies its lease expires and the next worker to poll picks the job up
+again; the job journal (also under genesis_reports/) lets it resume mid-pipeline.
+
+Usage:
+    python GENESIS_JOB_QUEUE.py enqueue --borough ... --block ... --lot ... --tax-class ...
+                                        --property-address ... --owner ... --record-id ...
+    python GENESIS_JOB_QUEUE.py enqueue --batch month_end.csv
+    python GENESIS_JOB_QUEUE.py work --username ... --password ... [--workers 2] [--remote-webdriver URL]
+    python GENESIS_JOB_QUEUE.py work --accounts genesis_accounts.json   (workers: one per account session)
+    python GENESIS_JOB_QUEUE.py status
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import DUAL_PROCESS_GENESIS_NYC_AUTOMATION as genesis
+from GENESIS_ACCOUNT_POOL import accounts_from_args, add_account_arguments
+from GENESIS_JOB_SERVICE import (WarmSessionPool, add_browser_arguments, driver_options_from_args,
+                                 memory_limits_from_args)
+
+queue_logger = genesis.logger.getChild("queue")
+
+DEFAULT_QUEUE_PATH = os.path.join(os.getcwd(), "genesis_reports", "genesis_job_queue.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    record_id TEXT,
+    locality TEXT,
+    bbl TEXT,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, available_at, job_id);
+CREATE INDEX IF NOT EXISTS jobs_record ON jobs (record_id);
+"""
+
+# ============================================================================
+# LEASE QUEUE
+# ============================================================================
+
+class LeaseQueue:
+    """
+    SQLite job table with visibility-timeout leases
+    Every claim issues a fresh lease token, so a worker whose lease expired
+    cannot heartbeat, complete or fail a job that another worker now owns
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH, visibility_timeout=300, max_attempts=3):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column in ("locality", "bbl"):  # queue files created by earlier versions
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # Rollback journal rather than WAL: WAL needs shared memory and does not work on network shares
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def locality_text(locality):
+        return "|".join(locality)
+
+    def enqueue(self, params, max_attempts=None):
+        """Add a job; returns (job_id, created). A record or BBL already pending or leased
+        is not queued twice - the existing job_id comes back with created=False"""
+        now = time.time()
+        params = {field: str(params[field]) for field in genesis.PROPERTY_FIELDS}
+        locality = self.locality_text(genesis.locality_key(params["borough"], params["block"]))
+        bbl = genesis.PropertyRecordCache.bbl_key(params["borough"], params["block"], params["lot"])
+        with self._transaction() as conn:
+            existing = conn.execute("SELECT job_id FROM jobs WHERE status IN ('pending', 'leased') "
+                                    "AND (record_id = ? OR bbl = ?) ORDER BY job_id LIMIT 1",
+                                    (params["record_id"], bbl)).fetchone()
+            if existing is not None:
+                return existing["job_id"], False
+            cursor = conn.execute(
+                "INSERT INTO jobs (record_id, locality, bbl, params, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (params["record_id"], locality, bbl, json.dumps(params), max_attempts or self.max_attempts,
+                 now, now, now))
+            return cursor.lastrowid, True
+
+    def _expire_leases(self, conn, now):
+        """Requeue jobs whose worker stopped heartbeating; give up once attempts are used"""
+        expired = conn.execute("SELECT job_id, attempts, max_attempts, lease_owner FROM jobs "
+                               "WHERE status = 'leased' AND lease_expires < ?", (now,)).fetchall()
+        for row in expired:
+            if row["attempts"] >= row["max_attempts"]:
+                conn.execute("UPDATE jobs SET status = 'failed', lease_token = NULL, error = ?, updated_at = ? "
+                             "WHERE job_id = ?", (f"lease expired on {row['lease_owner']}", now, row["job_id"]))
+                queue_logger.warning(f"⚠️ Job {row['job_id']} failed: lease expired on its last attempt")
+            else:
+                conn.execute("UPDATE jobs SET status = 'pending', lease_token = NULL, available_at = ?, "
+                             "updated_at = ? WHERE job_id = ?", (now, now, row["job_id"]))
+                queue_logger.warning(f"♻️ Requeued job {row['job_id']}: lease on {row['lease_owner']} expired")
+        return len(expired)
+
+    def claim(self, worker_id, prefer=()):
+        """Lease the oldest available job, preferring the borough/block pairs in `prefer`
+        (forms already filled on this host's idle browsers); returns a dict with params
+        and lease_token, or None"""
+        now = time.time()
+        preferred = [self.locality_text(locality) for locality in prefer]
+        placeholders = ", ".join("?" * len(preferred)) or "NULL"
+        with self._transaction() as conn:
+            self._expire_leases(conn, now)
+            row = conn.execute("SELECT job_id, params, attempts FROM jobs WHERE status = 'pending' "
+                               f"AND available_at <= ? ORDER BY locality IN ({placeholders}) DESC, job_id LIMIT 1",
+                               (now, *preferred)).fetchone()
+            if row is None:
+                return None
+            token = uuid.uuid4().hex
+            conn.execute("UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                         "lease_token = ?, lease_expires = ?, updated_at = ? WHERE job_id = ?",
+                         (worker_id, token, now + self.visibility_timeout, now, row["job_id"]))
+        return {"job_id": row["job_id"], "params": json.loads(row["params"]),
+                "attempt": row["attempts"] + 1, "lease_token": token}
+
+    def heartbeat(self, job_id, lease_token):
+        """Extend the lease; False means it was lost and the job may be running elsewhere"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute("UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE job_id = ? "
+                                  "AND lease_token = ? AND status = 'leased'",
+                                  (now + self.visibility_timeout, now, job_id, lease_token))
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, lease_token, result):
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute("UPDATE jobs SET status = 'done', lease_token = NULL, result = ?, updated_at = ? "
+                                  "WHERE job_id = ? AND lease_token = ?",
+                                  (json.dumps(result), now, job_id, lease_token))
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, lease_token, error, retry_delay=60):
+        """Release a failed job for retry after retry_delay seconds, or mark it failed when out of attempts"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE job_id = ? AND lease_token = ?",
+                               (job_id, lease_token)).fetchone()
+            if row is None:
+                return None
+            status = "pending" if row["attempts"] < row["max_attempts"] else "failed"
+            conn.execute("UPDATE jobs SET status = ?, lease_token = NULL, error = ?, available_at = ?, updated_at = ? "
+                         "WHERE job_id = ?", (status, str(error), now + retry_delay, now, job_id))
+            return status
+
+    def release(self, job_id, lease_token, delay=60):
+        """Hand a job back without using up an attempt (e.g. its portal is down)"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute("UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), "
+                                  "lease_token = NULL, available_at = ?, updated_at = ? "
+                                  "WHERE job_id = ? AND lease_token = ?", (now + delay, now, job_id, lease_token))
+            return cursor.rowcount == 1
+
+    def status(self):
+        now = time.time()
+        with self._transaction() as conn:
+            self._expire_leases(conn, now)
+            counts = {row["status"]: row["n"] for row in
+                      conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")}
+            leases = [{"job_id": row["job_id"], "record_id": row["record_id"], "worker": row["lease_owner"],
+                       "attempt": row["attempts"], "expires_in": round(row["lease_expires"] - now, 1)}
+                      for row in conn.execute("SELECT job_id, record_id, lease_owner, attempts, lease_expires "
+                                              "FROM jobs WHERE status = 'leased' ORDER BY job_id")]
+        return {"queue": self.path, "jobs": counts, "leases": leases}
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+class LeaseHeartbeat:
+    """Background thread that keeps a job's lease alive while the browser works"""
+
+    def __init__(self, lease_queue, job, interval):
+        self.lease_queue = lease_queue
+        self.job = job
+        self.interval = interval
+        self.lost = False
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f"Heartbeat-{job['job_id']}", daemon=True)
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                if not self.lease_queue.heartbeat(self.job["job_id"], self.job["lease_token"]):
+                    self.lost = True
+                    queue_logger.error(f"❌ Lost lease on job {self.job['job_id']} - another worker may rerun it")
+                    return
+            except sqlite3.Error as e:
+                queue_logger.warning(f"⚠️ Heartbeat for job {self.job['job_id']} failed: {e}")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join(timeout=5)
+
+class QueueWorker:
+    """Claims jobs from the lease queue and runs them on warm browser sessions"""
+
+    def __init__(self, lease_queue, pool, worker_id, heartbeat_interval=30, poll_interval=5, retry_delay=60):
+        self.lease_queue = lease_queue
+        self.pool = pool
+        self.worker_id = worker_id
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+
+    def run(self, stopping, exit_when_empty=False):
+        queue_logger.info(f"👷 Worker {self.worker_id} polling {self.lease_queue.path}")
+        while not stopping.is_set():
+            if genesis.circuit_breakers["genesis"].is_open() or not self.pool.accounts.any_available():
+                stopping.wait(self.poll_interval)  # leave jobs for hosts that can still reach Genesis
+                continue
+            try:
+                job = self.lease_queue.claim(self.worker_id, prefer=self.pool.idle_localities())
+            except sqlite3.Error as e:
+                queue_logger.warning(f"⚠️ Could not claim from queue: {e}")
+                job = None
+            if job is None:
+                if exit_when_empty:
+                    return
+                stopping.wait(self.poll_interval)
+                continue
+            self._run_job(job)
+
+    def _run_job(self, job):
+        p = job["params"]
+        genesis.set_log_context(job_id=f"queue-{job['job_id']}", record_id=p["record_id"])
+        queue_logger.info(f"📤 {self.worker_id} claimed job {job['job_id']} (record {p['record_id']}, "
+                          f"attempt {job['attempt']})")
+        session = None
+        try:
+            cached = self.pool.result_cache and genesis.lookup_cached_result(
+                self.pool.result_cache, self.pool.property_cache, p["borough"], p["block"], p["lot"], p["tax_class"])
+            if cached:
+                queue_logger.info(f"💾 CACHE HIT for record {p['record_id']} - no browser needed")
+                self.lease_queue.complete(job["job_id"], job["lease_token"], dict(cached, success=True, cached=True))
+                return
+
+            with LeaseHeartbeat(self.lease_queue, job, self.heartbeat_interval) as heartbeat:
+                session = self.pool.acquire(genesis.locality_key(p["borough"], p["block"]))
+                success = session.run_automation(p["borough"], p["block"], p["lot"], p["tax_class"],
+                                                 p["property_address"], p["owner"], p["record_id"])
+            if heartbeat.lost:
+                queue_logger.warning(f"⚠️ Result for job {job['job_id']} discarded - lease was lost")
+            elif success:
+                self.lease_queue.complete(job["job_id"], job["lease_token"], {
+                    "success": True,
+                    "record_count": session.last_record_count,
+                    "report_path": session.last_report_path,
+                    "resolved_lot": session.resolved_lot,
+                    "worker": self.worker_id,
+                    "skipped_stages": session.skipped_stages,
+                })
+                queue_logger.info(f"✅ Job {job['job_id']} done on {self.worker_id}")
+            else:
+                status = self.lease_queue.fail(job["job_id"], job["lease_token"], "automation failed", self.retry_delay)
+                queue_logger.warning(f"⚠️ Job {job['job_id']} failed on {self.worker_id} -> {status}")
+        except genesis.AccountUnavailable as e:
+            queue_logger.warning(f"🔑 Job {job['job_id']} handed back for another Genesis account - {e}")
+            self.lease_queue.release(job["job_id"], job["lease_token"], 0)
+        except genesis.PortalUnavailable as e:
+            queue_logger.warning(f"🚫 Job {job['job_id']} handed back - {e} circuit is open")
+            self.lease_queue.release(job["job_id"], job["lease_token"], self.retry_delay)
+        except Exception as e:
+            queue_logger.error(f"❌ Job {job['job_id']} crashed on {self.worker_id}: {e}")
+            try:
+                self.lease_queue.fail(job["job_id"], job["lease_token"], e, self.retry_delay)
+            except sqlite3.Error as db_error:
+                queue_logger.error(f"❌ Could not record failure (lease will expire instead): {db_error}")
+        finally:
+            genesis.set_log_context()
+            if session is not None:
+                self.pool.release(session)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def enqueue(args):
+    lease_queue = LeaseQueue(args.queue, max_attempts=args.max_attempts)
+    if args.batch:
+        jobs = genesis.load_property_jobs(args.batch)
+    else:
+        jobs = [{field: getattr(args, field) for field in genesis.PROPERTY_FIELDS}]
+    for job in jobs:
+        problems = genesis.validate_property(job)["errors"]
+        if problems:
+            print(f"❌ Skipping record {job.get('record_id')}: {'; '.join(problems)}")
+            continue
+        job_id, created = lease_queue.enqueue(job)
+        if created:
+            print(f"📥 Queued job {job_id} for record {job['record_id']}")
+        else:
+            print(f"🔗 Record {job['record_id']} is already queued or running as job {job_id}")
+    return 0
+
+def work(args):
+    genesis.configure_logging_from_args(args)
+    if args.rate_limit:
+        genesis.rate_governor = genesis.RateGovernor(genesis.parse_rate_limits(args.rate_limit))
+    lease_queue = LeaseQueue(args.queue, visibility_timeout=args.visibility_timeout)
+    genesis.metrics.add_gauge("genesis_queue_depth", "Shared queue jobs by status", ["state"],
+                              lambda: {(state,): count for state, count in lease_queue.status()["jobs"].items()})
+    genesis.start_metrics_from_args(args)
+    genesis.configure_profiling_from_args(args)
+    accounts = accounts_from_args(args, args.workers or 1)
+    workers = args.workers or (accounts.capacity() if args.accounts else 1)
+    pool = WarmSessionPool(accounts, workers,
+                           genesis.ResultCache(ttl_hours=args.cache_ttl_hours), genesis.PropertyRecordCache(),
+                           memory_limits_from_args(args), driver_options_from_args(args))
+    host_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    stopping = threading.Event()
+    threads = []
+    for index in range(workers):
+        worker = QueueWorker(lease_queue, pool, f"{host_id}-{index + 1}", heartbeat_interval=args.heartbeat_interval,
+                             poll_interval=args.poll_interval)
+        thread = threading.Thread(target=worker.run, args=(stopping, args.exit_when_empty),
+                                  name=f"QueueWorker-{index + 1}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        # Leased jobs are not failed here: their leases expire and another worker takes them over
+        queue_logger.info("🛑 Ctrl+C - stopping queue workers")
+        stopping.set()
+    finally:
+        pool.shutdown()
+    return 0
+
+def status(args):
+    print(json.dumps(LeaseQueue(args.queue).status(), indent=2))
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Lease-based Genesis job queue for multi-host workers')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Add property jobs to the queue')
+    for field in genesis.PROPERTY_FIELDS:
+        enqueue_parser.add_argument(f"--{field.replace('_', '-')}", dest=field)
+    enqueue_parser.add_argument('--batch', help='CSV or JSONL file of properties')
+    enqueue_parser.add_argument('--max-attempts', type=int, default=3, help='Attempts before a job is marked failed')
+
+    work_parser = subparsers.add_parser('work', help='Claim and run jobs on this host')
+    add_account_arguments(work_parser)
+    work_parser.add_argument('--workers', type=int, default=None,
+                             help='Concurrent jobs (one browser each) on this host '
+                                  '(default: 1, or the total session limit of --accounts)')
+    work_parser.add_argument('--worker-id', help='Worker name prefix (default: hostname-pid)')
+    work_parser.add_argument('--visibility-timeout', type=float, default=300,
+                             help='Seconds a lease lasts without a heartbeat before the job is requeued')
+    work_parser.add_argument('--heartbeat-interval', type=float, default=30, help='Seconds between lease heartbeats')
+    work_parser.add_argument('--poll-interval', type=float, default=5, help='Seconds between polls of an empty queue')
+    work_parser.add_argument('--exit-when-empty', action='store_true', help='Stop once no job is available')
+    work_parser.add_argument('--cache-ttl-hours', type=float, default=24, help='Hours a cached search result stays valid')
+    work_parser.add_argument('--rate-limit', action='append', metavar='HOST=RATE',
+                             type=genesis.rate_limit_option,
+                             help='Override actions per second for genesis, nyc or google (repeatable)')
+    add_browser_arguments(work_parser)
+    genesis.add_metrics_arguments(work_parser)
+    genesis.add_profiling_arguments(work_parser)
+    genesis.add_logging_arguments(work_parser)
+
+    status_parser = subparsers.add_parser('status', help='Show job counts and active leases')
+
+    for sub in (enqueue_parser, work_parser, status_parser):
+        sub.add_argument('--queue', default=DEFAULT_QUEUE_PATH, help='SQLite queue file (on shared storage)')
+
+    args = parser.parse_args()
+    if args.command == 'work' and not args.accounts and not (args.username and args.password is not None):
+        work_parser.error("either --accounts or both --username and --password are required")
+    if args.command == 'enqueue':
+        missing = [f"--{name.replace('_', '-')}" for name in genesis.PROPERTY_FIELDS if getattr(args, name) is None]
+        if missing and not args.batch:
+            enqueue_parser.error(f"the following arguments are required: {', '.join(missing)}")
+    return {"enqueue": enqueue, "work": work, "status": status}[args.command](args)
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+GENESIS JOB SCHEDULER - Priority, deadline and fair-share ordering of property jobs
+Sits between job submission and run_automation in the job service:
+  * priority classes (urgent > normal > backfill) always run first
+  * within a class, jobs about to miss their deadline go first (earliest deadline),
+    then the source that used the least browser time recently (fair share), then FIFO
+  * within the chosen class, a job on the same borough/block as an idle session's
+    filled Genesis form runs next, so neighbouring properties go back-to-back
+  * a running job is pre-empted at its next stage boundary when a higher class
+    is waiting and every worker is busy; the job journal lets it resume later
+  * runtime estimates (seeded from genesis_automation.log, updated as jobs finish)
+    project start/finish times and flag deadlines at risk
+"""
+
+import heapq
+import math
+import threading
+import time
+from datetime import datetime
+
+import DUAL_PROCESS_GENESIS_NYC_AUTOMATION as genesis
+
+scheduler_logger = genesis.logger.getChild("scheduler")
+
+PRIORITIES = {"urgent": 0, "normal": 1, "backfill": 2}
+PRIORITY_NAMES = {value: name for name, value in PRIORITIES.items()}
+
+def parse_priority(value):
+    """Priority name or number -> class number (lower runs first)"""
+    if value is None or value == "":
+        return PRIORITIES["normal"]
+    if str(value).lower() in PRIORITIES:
+        return PRIORITIES[str(value).lower()]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"unknown priority '{value}' (use {', '.join(PRIORITIES)} or a number)")
+
+def parse_deadline(deadline=None, deadline_minutes=None):
+    """Absolute deadline (epoch seconds or ISO 8601) or minutes from now -> epoch seconds or None"""
+    if deadline_minutes not in (None, ""):
+        return time.time() + float(deadline_minutes) * 60
+    if deadline in (None, ""):
+        return None
+    try:
+        return float(deadline)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(deadline)).timestamp()
+    except ValueError:
+        raise ValueError(f"deadline '{deadline}' is neither epoch seconds nor ISO 8601")
+
+# ============================================================================
+# RUNTIME ESTIMATES
+# ============================================================================
+
+class RuntimeEstimator:
+    """EWMA of full-pipeline job runtime in seconds"""
+
+    def __init__(self, initial_seconds=180.0, alpha=0.2):
+        self.estimate = initial_seconds
+        self.alpha = alpha
+        self.samples = 0
+        self.lock = threading.Lock()
+
+    def seed_from_logs(self, paths):
+        """Start from the mean run time the log analyzer finds in past automation logs"""
+        import GENESIS_LOG_ANALYZER
+
+        try:
+            report = GENESIS_LOG_ANALYZER.analyze(paths)
+        except FileNotFoundError:
+            return False
+        total = report.by_stage.get("total")
+        if not total or not total.count:
+            return False
+        with self.lock:
+            self.estimate = total.total / total.count
+        scheduler_logger.info(f"⏱️ Runtime estimate {self.estimate:.0f}s from {total.count} logged runs")
+        return True
+
+    def observe(self, seconds):
+        with self.lock:
+            self.samples += 1
+            self.estimate += self.alpha * (seconds - self.estimate)
+
+    def remaining(self, elapsed):
+        """Expected seconds left for a job that has run for `elapsed` seconds"""
+        return max(self.estimate - elapsed, 0.1 * self.estimate)
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class JobScheduler:
+    """
+    Replacement for the service's FIFO queue
+    Jobs need: priority, deadline (epoch or None), source, seq, preemptions, started_at, locality
+    """
+
+    def __init__(self, workers, estimator=None, deadline_margin=1.5, fair_share_half_life=3600,
+                 max_preemptions=3):
+        self.workers = workers
+        self.estimator = estimator or RuntimeEstimator()
+        self.deadline_margin = deadline_margin
+        self.half_life = fair_share_half_life
+        self.max_preemptions = max_preemptions
+        self.pending = []
+        self.running = {}
+        self.usage = {}  # source -> (decayed browser seconds, as of time)
+        self.waiting = 0
+        self.lock = threading.Condition()
+
+    def _usage(self, source, now):
+        value, stamp = self.usage.get(source, (0.0, now))
+        return value * math.pow(0.5, (now - stamp) / self.half_life)
+
+    def _tight(self, job, now):
+        return job.deadline is not None and job.deadline - now <= self.estimator.estimate * self.deadline_margin
+
+    def _key(self, job, now):
+        tight = self._tight(job, now)
+        return (job.priority,
+                0 if tight else 1,
+                0.0 if tight else self._usage(job.source, now),
+                job.deadline if job.deadline is not None else math.inf,
+                job.seq)
+
+    def put(self, job):
+        with self.lock:
+            self.pending.append(job)
+            self.lock.notify()
+
+    def get(self, timeout=None, prefer=()):
+        """Remove and return the best pending job, or None after timeout
+        prefer: localities whose form is already filled on an idle session"""
+        with self.lock:
+            self.waiting += 1
+            try:
+                if not self.pending:
+                    self.lock.wait(timeout)
+                if not self.pending:
+                    return None
+                now = time.time()
+                job = min(self.pending, key=lambda candidate: self._key(candidate, now))
+                if prefer and job.locality not in prefer and not self._tight(job, now):
+                    neighbours = [candidate for candidate in self.pending
+                                  if candidate.locality in prefer and candidate.priority == job.priority]
+                    if neighbours:
+                        job = min(neighbours, key=lambda candidate: self._key(candidate, now))
+                self.pending.remove(job)
+                self.running[job.job_id] = job
+                return job
+            finally:
+                self.waiting -= 1
+
+    def qsize(self):
+        with self.lock:
+            return len(self.pending)
+
+    def finished(self, job, seconds, completed=True):
+        """Charge browser time to the job's source; completed runs also update the runtime estimate"""
+        now = time.time()
+        with self.lock:
+            self.running.pop(job.job_id, None)
+            self.usage[job.source] = (self._usage(job.source, now) + seconds, now)
+        if completed:
+            self.estimator.observe(seconds)
+
+    def should_preempt(self, job):
+        """True when a higher priority class waits and no worker is free to take it"""
+        with self.lock:
+            if self.waiting or not self.pending or job.preemptions >= self.max_preemptions:
+                return False
+            best = min(candidate.priority for candidate in self.pending)
+            return best < job.priority
+
+    def requeue(self, job, seconds):
+        """Put an interrupted job back; it keeps its place (seq) within its class"""
+        self.finished(job, seconds, completed=False)
+        self.put(job)
+
+    def preempted(self, job, seconds):
+        job.preemptions += 1
+        self.requeue(job, seconds)
+
+    def at_risk(self, now=None):
+        """Jobs projected to miss their deadline, simulating the current order on the worker pool"""
+        now = now or time.time()
+        estimate = self.estimator.estimate
+        with self.lock:
+            running = list(self.running.values())
+            pending = sorted(self.pending, key=lambda candidate: self._key(candidate, now))
+        # When each worker becomes free: running jobs' expected remainder, idle workers now
+        free_at = [self.estimator.remaining(now - (job.started_at or now)) for job in running]
+        free_at += [0.0] * max(self.workers - len(free_at), 0)
+        heapq.heapify(free_at)
+
+        risks = []
+        for job in running:
+            finish = self.estimator.remaining(now - (job.started_at or now))
+            if job.deadline is not None and now + finish > job.deadline:
+                risks.append(self._risk(job, "running", finish, now))
+        for job in pending:
+            finish = heapq.heappop(free_at) + estimate
+            heapq.heappush(free_at, finish)
+            if job.deadline is not None and now + finish > job.deadline:
+                risks.append(self._risk(job, "queued", finish, now))
+        return risks
+
+    @staticmethod
+    def _risk(job, state, finish, now):
+        return {
+            "job_id": job.job_id,
+            "record_id": job.params["record_id"],
+            "state": state,
+            "priority": PRIORITY_NAMES.get(job.priority, job.priority),
+            "deadline_in": round(job.deadline - now),
+            "projected_finish_in": round(finish),
+        }
+
+    def status(self):
+        now = time.time()
+        with self.lock:
+            sources = {source: round(self._usage(source, now)) for source in self.usage}
+            by_priority = {}
+            for job in self.pending:
+                name = PRIORITY_NAMES.get(job.priority, str(job.priority))
+                by_priority[name] = by_priority.get(name, 0) + 1
+        return {
+            "pending_by_priority": by_priority,
+            "runtime_estimate_seconds": round(self.estimator.estimate),
+            "source_usage_seconds": sources,
+            "at_risk": self.at_risk(now),
+        }
@@ -0,0 +1,701 @@
+#!/usr/bin/env python3
+"""
+GENESIS JOB SERVICE - Resident service with a pool of warm Genesis browsers
+Accepts property jobs over a local HTTP API instead of one CLI process per record
+Browsers stay logged in between jobs; only jobs marked for review keep a browser open
+
+Usage:
+    python GENESIS_JOB_SERVICE.py serve --username ... --password ... [--workers 2] [--port 8765]
+    python GENESIS_JOB_SERVICE.py serve --accounts genesis_accounts.json   (workers: one per account session)
+    python GENESIS_JOB_SERVICE.py submit --borough ... --block ... --lot ... --tax-class ...
+                                         --property-address ... --owner ... --record-id ... [--review]
+                                         [--priority urgent|normal|backfill] [--deadline-minutes N] [--source airtable]
+
+GET /status returns JSON service state; GET /metrics the same counters in Prometheus text format
+POST /profile {"record_id": ..., "rate": 0.02, "mode": "sample"} profiles upcoming jobs (GET /profile shows requests)
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import threading
+import time
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import DUAL_PROCESS_GENESIS_NYC_AUTOMATION as genesis
+from GENESIS_ACCOUNT_POOL import accounts_from_args, add_account_arguments
+from GENESIS_JOB_SCHEDULER import PRIORITY_NAMES, JobScheduler, RuntimeEstimator, parse_deadline, parse_priority
+
+# Job service logs go through the automation's queue-backed handlers (level: --log-level service=...)
+service_logger = genesis.logger.getChild("service")
+
+JOB_FIELDS = genesis.PROPERTY_FIELDS
+
+# ============================================================================
+# JOBS AND PROGRESS CAPTURE
+# ============================================================================
+
+class PropertyJob:
+    """One property to run through the NYC -> Maps -> Genesis pipeline
+    Only the last MAX_EVENTS progress lines are kept; event_count counts them all"""
+
+    _ids = itertools.count(1)
+    MAX_EVENTS = 500
+
+    def __init__(self, params, review=False, priority=1, deadline=None, source="default"):
+        self.seq = next(self._ids)
+        self.job_id = f"job-{self.seq}"
+        self.params = {field: str(params[field]) for field in JOB_FIELDS}
+        self.review = review
+        self.priority = priority
+        self.deadline = deadline
+        self.source = source
+        self.locality = genesis.locality_key(self.params["borough"], self.params["block"])
+        self.coalesced = 0
+        self.inflight_keys = []
+        self.preemptions = 0
+        self.status = "queued"
+        self.result = None
+        self.events = deque(maxlen=self.MAX_EVENTS)
+        self.event_count = 0
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.changed = threading.Condition()
+
+    def add_event(self, event):
+        with self.changed:
+            self.events.append(event)
+            self.event_count += 1
+            self.changed.notify_all()
+
+    def events_since(self, seen):
+        """Events after the first `seen` (call holding self.changed); older ones may have been dropped"""
+        return list(self.events)[max(len(self.events) - (self.event_count - seen), 0):]
+
+    def finish(self, status, result):
+        with self.changed:
+            self.status = status
+            self.result = result
+            self.finished_at = time.time()
+            self.changed.notify_all()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "record_id": self.params["record_id"],
+            "status": self.status,
+            "review": self.review,
+            "priority": PRIORITY_NAMES.get(self.priority, self.priority),
+            "deadline": self.deadline,
+            "source": self.source,
+            "preemptions": self.preemptions,
+            "coalesced": self.coalesced,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "event_count": self.event_count,
+        }
+
+class JobProgressHandler(logging.Handler):
+    """Routes automation log lines to the job running on the emitting thread"""
+
+    def __init__(self):
+        super().__init__(level=logging.INFO)
+        self.jobs_by_thread = {}
+
+    def bind(self, job):
+        self.jobs_by_thread[threading.get_ident()] = job
+
+    def unbind(self):
+        self.jobs_by_thread.pop(threading.get_ident(), None)
+
+    def emit(self, record):
+        job = self.jobs_by_thread.get(record.thread)
+        if job is None:
+            return
+        try:
+            job.add_event({
+                "time": record.created,
+                "level": record.levelname,
+                "message": record.getMessage(),
+            })
+        except Exception:
+            self.handleError(record)
+
+# ============================================================================
+# WARM SESSION POOL
+# ============================================================================
+
+class WarmSessionPool:
+    """
+    Pool of logged-in InfiniteGenesisAutomation sessions
+    Caps the number of Chrome instances; sessions held for review count against the cap
+    Each session is logged in with an account from the AccountPool, within that account's
+    session limit; sessions of accounts that went unhealthy are skipped or closed
+    """
+
+    def __init__(self, accounts, max_browsers, result_cache=None, property_cache=None,
+                 memory_limits=None, driver_options=None):
+        self.accounts = accounts
+        self.max_browsers = max_browsers
+        self.memory_limits = memory_limits or {}
+        self.driver_options = driver_options or {}
+        self.result_cache = result_cache
+        self.property_cache = property_cache
+        self.idle = []
+        self.held = {}
+        self.total = 0
+        self.lock = threading.Condition()
+
+    def _create_session(self, account):
+        service_logger.info(f"🌐 Launching warm Genesis browser session on account {account.name}")
+        session = genesis.InfiniteGenesisAutomation(account.username, account.password, result_cache=self.result_cache,
+                                                    property_cache=self.property_cache, **self.driver_options)
+        session.account = account
+        session.account_name = account.name
+        session.account_hook = lambda state, reason=None: self.accounts.report(account, state, reason)
+        session.memory_governor = genesis.BrowserMemoryGovernor(session, **self.memory_limits)
+        session.setup_driver()
+        if not session.login_to_genesis():
+            service_logger.warning(f"⚠️ Warm session could not log in to account {account.name} "
+                                   f"({session.login_problem}) - will retry on first job")
+        return session
+
+    def acquire(self, locality=None):
+        """Return an idle session (one whose form is filled for `locality` first) on a healthy
+        account, launching one if under the browser cap and an account has room, else wait
+        Raises AccountUnavailable when every account is cooling down or disabled"""
+        stale = []
+        try:
+            with self.lock:
+                while True:
+                    for session in [idle for idle in self.idle if not self.accounts.usable(idle.account)
+                                    and idle.account.state != "session_expired"]:
+                        # Locked out or rate limited account: free the browser slot for a healthy account
+                        self.idle.remove(session)
+                        stale.append(session)
+                        self.total -= 1
+                    usable = [idle for idle in self.idle if self.accounts.usable(idle.account)]
+                    while usable:
+                        matching = [idle for idle in usable if idle.form_locality == locality]
+                        session = matching[-1] if matching and locality else usable[-1]
+                        usable.remove(session)
+                        self.idle.remove(session)
+                        if session.is_browser_alive():
+                            self.accounts.job_started(session.account)
+                            return session
+                        service_logger.warning("⚠️ Discarding dead browser session")
+                        stale.append(session)
+                        self.total -= 1
+                    if self.total < self.max_browsers:
+                        account = self.accounts.assign()
+                        if account is not None:
+                            self.total += 1
+                            break
+                    if not self.accounts.any_available():
+                        raise genesis.AccountUnavailable("no Genesis account is healthy")
+                    self.lock.wait(timeout=5)  # cooldowns expire without a notify
+        finally:
+            for session in stale:
+                self._close(session)
+
+        try:
+            session = self._create_session(account)
+        except Exception:
+            self.accounts.unassign(account)
+            with self.lock:
+                self.total -= 1
+                self.lock.notify()
+            raise
+        self.accounts.job_started(account)
+        return session
+
+    def _close(self, session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+        self.accounts.unassign(session.account)
+
+    def idle_localities(self):
+        """Borough/block pairs whose Genesis form is filled on an idle session"""
+        with self.lock:
+            return {session.form_locality for session in self.idle if session.form_locality}
+
+    def release(self, session):
+        """Reset a session and make it available to the next job"""
+        if not session.is_browser_alive() or session.account.state in ("locked_out", "bad_credentials"):
+            self.discard(session)
+            return
+        session.reset_for_next_job()
+        if session.memory_governor:
+            session.memory_governor.check(between_jobs=True)
+        with self.lock:
+            self.idle.append(session)
+            self.lock.notify()
+
+    def discard(self, session):
+        """Drop a broken session and free its slot"""
+        self._close(session)
+        with self.lock:
+            self.total -= 1
+            self.lock.notify()
+
+    def hold_for_review(self, job_id, session):
+        """Keep a session's browser open for the operator until released"""
+        with self.lock:
+            self.held[job_id] = session
+        service_logger.info(f"👀 Browser held for review of {job_id} - POST /jobs/{job_id}/release when done")
+
+    def release_review(self, job_id):
+        with self.lock:
+            session = self.held.pop(job_id, None)
+        if session is None:
+            return False
+        self.release(session)
+        service_logger.info(f"✅ Review browser for {job_id} returned to the pool")
+        return True
+
+    def status(self):
+        with self.lock:
+            return {
+                "max_browsers": self.max_browsers,
+                "browsers": self.total,
+                "idle": len(self.idle),
+                "held_for_review": sorted(self.held),
+                "accounts": self.accounts.status(),
+            }
+
+    def shutdown(self):
+        with self.lock:
+            sessions = self.idle + list(self.held.values())
+            self.idle, self.held = [], {}
+        for session in sessions:
+            self._close(session)
+
+# ============================================================================
+# JOB SERVICE
+# ============================================================================
+
+class GenesisJobService:
+    """Runs submitted property jobs on the warm session pool
+    Finished jobs stay queryable for finished_job_ttl seconds, and at most max_finished_jobs
+    of them are kept (oldest dropped first); jobs held for review stay until released"""
+
+    def __init__(self, accounts, workers=2, max_browsers=None, cache_ttl_hours=24, memory_limits=None,
+                 driver_options=None, estimator=None, finished_job_ttl=3600, max_finished_jobs=1000):
+        self.result_cache = genesis.ResultCache(ttl_hours=cache_ttl_hours)
+        self.property_cache = genesis.PropertyRecordCache()
+        self.pool = WarmSessionPool(accounts, max_browsers or workers, self.result_cache,
+                                    self.property_cache, memory_limits, driver_options)
+        self.workers = workers
+        self.jobs = {}
+        self.finished_job_ttl = finished_job_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self.inflight = {}  # ("record", id) / ("bbl", key) -> queued or running job
+        self.lock = threading.Lock()
+        self.pending = JobScheduler(workers, estimator)
+        genesis.metrics.add_gauge("genesis_queue_depth", "Service jobs waiting or running", ["state"],
+                                  lambda: {("queued",): self.pending.qsize(), ("running",): len(self.pending.running)})
+        self.progress = JobProgressHandler()
+        self.stopping = threading.Event()
+        genesis.logger.addHandler(self.progress)
+
+    def submit(self, params, review=False, priority=None, deadline=None, deadline_minutes=None, source=None):
+        """Queue a property job, answering from the result cache when possible
+        A request for a record or BBL already queued or running attaches to that job"""
+        priority, deadline = parse_priority(priority), parse_deadline(deadline, deadline_minutes)
+        keys = [("record", str(params["record_id"])),
+                ("bbl", genesis.PropertyRecordCache.bbl_key(params["borough"], params["block"], params["lot"]))]
+        with self.lock:
+            existing = next((self.inflight[key] for key in keys if key in self.inflight), None)
+            if existing is not None:
+                existing.coalesced += 1
+                if review and existing.status == "queued":
+                    existing.review = True
+                service_logger.info(f"🔗 Record {params['record_id']} is already in flight as {existing.job_id} "
+                                    f"- attaching instead of starting new browser work")
+                existing.add_event({"time": time.time(), "level": "INFO",
+                                    "message": f"Duplicate request for record {params['record_id']} attached"})
+                return existing
+
+            self._evict_finished_jobs()
+            job = PropertyJob(params, review, priority, deadline, source or "default")
+            self.jobs[job.job_id] = job
+
+            p = job.params
+            cached = genesis.lookup_cached_result(self.result_cache, self.property_cache,
+                                                  p["borough"], p["block"], p["lot"], p["tax_class"])
+            if cached and not review:
+                service_logger.info(f"💾 CACHE HIT for record {job.params['record_id']} - no browser needed")
+                job.add_event({"time": time.time(), "level": "INFO", "message": "Served from result cache"})
+                job.finish("done", dict(cached, success=True, cached=True))
+                return job
+
+            job.inflight_keys = keys
+            for key in keys:
+                self.inflight[key] = job
+
+        self.pending.put(job)
+        service_logger.info(f"📥 Queued {job.job_id} for record {job.params['record_id']} "
+                            f"[{PRIORITY_NAMES.get(job.priority, job.priority)}, source {job.source}] "
+                            f"({self.pending.qsize()} pending)")
+        if job.deadline is not None:
+            for risk in self.pending.at_risk():
+                if risk["job_id"] == job.job_id:
+                    service_logger.warning(f"⏰ {job.job_id} deadline at risk: due in {risk['deadline_in']}s, "
+                                           f"projected to finish in {risk['projected_finish_in']}s")
+        return job
+
+    def start(self):
+        for index in range(self.workers):
+            threading.Thread(target=self._worker_loop, name=f"GenesisWorker-{index + 1}", daemon=True).start()
+        service_logger.info(f"🚀 Started {self.workers} workers (max {self.pool.max_browsers} browsers)")
+
+    def _worker_loop(self):
+        while not self.stopping.is_set():
+            # Jobs wait in the queue while Genesis is down instead of each burning its timeouts
+            if genesis.circuit_breakers["genesis"].is_open() or not self.pool.accounts.any_available():
+                self.stopping.wait(1)
+                continue
+            job = self.pending.get(timeout=1, prefer=self.pool.idle_localities())
+            if job is not None:
+                self._run_job(job)
+
+    def _run_job(self, job):
+        job.status = "running"
+        job.started_at = time.time()
+        genesis.set_log_context(job_id=job.job_id, record_id=job.params["record_id"])
+        self.progress.bind(job)
+        session = None
+        download = None
+        try:
+            session = self.pool.acquire(job.locality)
+            # Urgent work waiting with every worker busy -> yield at the next stage boundary
+            session.checkpoint_hook = lambda stage: self.pending.should_preempt(job)
+            if job.review and not job.preemptions:
+                try:
+                    genesis.io_executor.submit(genesis.open_address_file, job.params["property_address"], block=False,
+                                               description=f"file search for {job.job_id}")
+                except genesis.ExecutorBusy as e:
+                    service_logger.warning(f"⚠️ {job.job_id}: skipping file search - {e}")
+            # Review jobs keep their browser anyway; others hand it back while the report downloads
+            session.defer_downloads = not job.review
+            p = job.params
+            success = session.run_automation(p["borough"], p["block"], p["lot"], p["tax_class"],
+                                             p["property_address"], p["owner"], p["record_id"])
+            download = session.pending_download
+            status, result = ("done" if success else "failed"), {
+                "success": success,
+                "record_count": session.last_record_count,
+                "report_path": session.last_report_path,
+                "resolved_lot": session.resolved_lot,
+                "cached": False,
+                "skipped_stages": session.skipped_stages,
+            }
+        except genesis.JobPreempted as e:
+            status, result = "preempted", None
+            service_logger.info(f"⏸️ {job.job_id} pre-empted before '{e}' - requeued")
+        except genesis.AccountUnavailable as e:
+            status, result = "deferred", None
+            service_logger.warning(f"🔑 {job.job_id} requeued for another Genesis account - {e}")
+        except genesis.PortalUnavailable as e:
+            status, result = "deferred", None
+            service_logger.warning(f"🚫 {job.job_id} deferred - {e} circuit is open")
+        except Exception as e:
+            service_logger.error(f"❌ {job.job_id} crashed: {e}")
+            status, result = "failed", {"success": False, "error": str(e)}
+        finally:
+            self.progress.unbind()
+            genesis.set_log_context()
+
+        if session is not None:
+            if job.review and status not in ("preempted", "deferred"):
+                self.pool.hold_for_review(job.job_id, session)
+            else:
+                self.pool.release(session)
+        if status in ("preempted", "deferred"):
+            job.status = "queued"
+            if status == "preempted":
+                self.pending.preempted(job, time.time() - job.started_at)
+            else:
+                self.pending.requeue(job, time.time() - job.started_at)
+            return
+        if download is not None and status == "done":
+            service_logger.info(f"📥 {job.job_id}: browser released - report download finishing in the background")
+            download.add_done_callback(lambda done: self._download_finished(job, result, done))
+            return
+        self._complete_job(job, status, result)
+
+    def _download_finished(self, job, result, done):
+        """Background download of a finished job landed (or failed): report the job"""
+        if done.cancelled() or done.exception() is not None:
+            result["report_path"] = None
+        else:
+            result["report_path"] = done.result()
+        self._complete_job(job, "done", result)
+
+    def _complete_job(self, job, status, result):
+        self.pending.finished(job, time.time() - job.started_at, completed=status == "done")
+        with self.lock:
+            for key in job.inflight_keys:
+                if self.inflight.get(key) is job:
+                    del self.inflight[key]
+        job.finish(status, result)
+        with self.lock:
+            self._evict_finished_jobs()
+
+    def _evict_finished_jobs(self):
+        """Forget finished jobs past their TTL, then the oldest beyond max_finished_jobs (hold self.lock)"""
+        now = time.time()
+        finished = sorted((job for job in self.jobs.values() if job.done and job.job_id not in self.pool.held),
+                          key=lambda job: job.finished_at)
+        expired = [job for job in finished if now - job.finished_at > self.finished_job_ttl]
+        surplus = finished[len(expired):][:max(len(finished) - len(expired) - self.max_finished_jobs, 0)]
+        for job in expired + surplus:
+            del self.jobs[job.job_id]
+
+    def status(self):
+        counts = {}
+        for job in list(self.jobs.values()):
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"pending": self.pending.qsize(), "jobs": counts, "pool": self.pool.status(),
+                "scheduler": self.pending.status(), "latency": genesis.latency_model.status(),
+                "circuits": {name: breaker.status() for name, breaker in genesis.circuit_breakers.items()},
+                "background_io": genesis.io_executor.status(), "downloads": genesis.download_executor.status()}
+
+    def shutdown(self):
+        self.stopping.set()
+        genesis.logger.removeHandler(self.progress)
+        self.pool.shutdown()
+
+# ============================================================================
+# HTTP API
+# ============================================================================
+
+def make_request_handler(service):
+    """Build the request handler class bound to a service instance"""
+
+    class JobRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            service_logger.debug(format % args)
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def _job_from_path(self):
+            parts = self.path.strip("/").split("/")
+            return service.jobs.get(parts[1]) if len(parts) >= 2 else None
+
+        def do_GET(self):
+            if self.path == "/status":
+                return self._send_json(200, service.status())
+            if self.path == "/metrics":
+                body = genesis.metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if self.path == "/profile":
+                return self._send_json(200, genesis.job_profiling.status())
+            job = self._job_from_path()
+            if job is None:
+                return self._send_json(404, {"error": "unknown job"})
+            if self.path.endswith("/events"):
+                return self._stream_events(job)
+            return self._send_json(200, job.to_dict())
+
+        def do_POST(self):
+            if self.path == "/jobs":
+                try:
+                    payload = self._read_json()
+                    missing = [field for field in JOB_FIELDS if field not in payload]
+                    if missing:
+                        return self._send_json(400, {"error": f"missing fields: {', '.join(missing)}"})
+                    job = service.submit(payload, review=bool(payload.get("review")),
+                                         priority=payload.get("priority"), deadline=payload.get("deadline"),
+                                         deadline_minutes=payload.get("deadline_minutes"),
+                                         source=payload.get("source"))
+                    return self._send_json(202, job.to_dict())
+                except ValueError as e:
+                    return self._send_json(400, {"error": str(e)})
+            if self.path == "/profile":
+                try:
+                    payload = self._read_json()
+                    genesis.job_profiling.request(record_id=payload.get("record_id"), rate=payload.get("rate"),
+                                                  mode=payload.get("mode"))
+                    return self._send_json(200, genesis.job_profiling.status())
+                except ValueError as e:
+                    return self._send_json(400, {"error": str(e)})
+            job = self._job_from_path()
+            if job is not None and self.path.endswith("/release"):
+                return self._send_json(200, {"released": service.pool.release_review(job.job_id)})
+            return self._send_json(404, {"error": "not found"})
+
+        def _stream_events(self, job):
+            """Stream progress as newline-delimited JSON until the job finishes"""
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            sent = 0
+            while True:
+                with job.changed:
+                    while sent == job.event_count and not job.done:
+                        job.changed.wait(timeout=15)
+                    events = job.events_since(sent)
+                    sent = job.event_count
+                    finished = job.done
+                lines = [json.dumps(event) for event in events]
+                if finished:
+                    lines.append(json.dumps({"final": job.to_dict()}))
+                if lines:
+                    chunk = ("\n".join(lines) + "\n").encode('utf-8')
+                    self.wfile.write(f"{len(chunk):X}\r\n".encode('ascii') + chunk + b"\r\n")
+                    self.wfile.flush()
+                if finished:
+                    self.wfile.write(b"0\r\n\r\n")
+                    return
+
+    return JobRequestHandler
+
+def memory_limits_from_args(args):
+    return {"max_rss_mb": args.max_chrome_mb, "max_tabs": args.max_tabs,
+            "max_jobs_per_browser": args.max_jobs_per_browser}
+
+def driver_options_from_args(args):
+    return {"remote_url": args.remote_webdriver, "remote_download_dir": args.remote_download_dir,
+            "account_commands": args.account_webdriver, "capture_network": not args.no_network_capture,
+            **genesis.report_options_from_args(args)}
+
+def add_browser_arguments(parser):
+    """Browser memory limits, remote WebDriver and report options shared by the service and queue workers"""
+    parser.add_argument('--max-chrome-mb', type=float, default=1500,
+                        help='Recycle a browser between jobs above this Chrome memory (needs psutil)')
+    parser.add_argument('--max-tabs', type=int, default=6, help='Tabs kept open per browser')
+    parser.add_argument('--max-jobs-per-browser', type=int, default=200,
+                        help='Recycle a browser after this many jobs (0 = never)')
+    genesis.add_remote_webdriver_arguments(parser)
+    genesis.add_report_arguments(parser)
+
+def serve(args):
+    genesis.configure_logging_from_args(args)
+    if args.rate_limit:
+        genesis.rate_governor = genesis.RateGovernor(genesis.parse_rate_limits(args.rate_limit))
+    genesis.configure_profiling_from_args(args)
+    memory_limits = memory_limits_from_args(args)
+    estimator = RuntimeEstimator()
+    if args.estimate_from_log:
+        estimator.seed_from_logs(args.estimate_from_log)
+    accounts = accounts_from_args(args, args.max_browsers or args.workers or 2)
+    # One worker per account session slot unless told otherwise: throughput scales with accounts
+    workers = args.workers or (accounts.capacity() if args.accounts else 2)
+    service = GenesisJobService(accounts, workers=workers, max_browsers=args.max_browsers,
+                                cache_ttl_hours=args.cache_ttl_hours,
+                                memory_limits=memory_limits, driver_options=driver_options_from_args(args),
+                                estimator=estimator, finished_job_ttl=args.finished_job_ttl,
+                                max_finished_jobs=args.max_finished_jobs)
+    service.start()
+    server = ThreadingHTTPServer((args.host, args.port), make_request_handler(service))
+    server.daemon_threads = True
+    service_logger.info(f"🛰️ Genesis job service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        service_logger.info("🛑 Ctrl+C - shutting down job service")
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+def submit(args):
+    """Client mode for n8n: submit one job and stream its progress to stdout"""
+    payload = {field: getattr(args, field) for field in JOB_FIELDS}
+    payload.update(review=args.review, priority=args.priority, deadline_minutes=args.deadline_minutes,
+                   source=args.source)
+    base_url = f"http://{args.host}:{args.port}"
+
+    request = urllib.request.Request(f"{base_url}/jobs", data=json.dumps(payload).encode('utf-8'),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(request) as response:
+        job = json.loads(response.read())
+    print(json.dumps(job), flush=True)
+    if args.no_wait:
+        return 0
+
+    final = job
+    with urllib.request.urlopen(f"{base_url}/jobs/{job['job_id']}/events") as response:
+        for line in response:
+            print(line.decode('utf-8').rstrip(), flush=True)
+            event = json.loads(line)
+            if "final" in event:
+                final = event["final"]
+    return 0 if final.get("status") == "done" else 1
+
+def main():
+    parser = argparse.ArgumentParser(description='Genesis job service with warm browser sessions')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run the resident job service')
+    add_account_arguments(serve_parser)
+    serve_parser.add_argument('--workers', type=int, default=None,
+                              help='Concurrent jobs (default: 2, or the total session limit of --accounts)')
+    serve_parser.add_argument('--max-browsers', type=int, default=None,
+                              help='Chrome cap including review browsers (default: workers)')
+    serve_parser.add_argument('--cache-ttl-hours', type=float, default=24, help='Hours a cached search result stays valid')
+    serve_parser.add_argument('--finished-job-ttl', type=float, default=3600,
+                              help='Seconds a finished job stays queryable over the API')
+    serve_parser.add_argument('--max-finished-jobs', type=int, default=1000,
+                              help='Finished jobs kept for the API at most (oldest forgotten first)')
+    serve_parser.add_argument('--rate-limit', action='append', metavar='HOST=RATE',
+                              type=genesis.rate_limit_option,
+                              help='Override actions per second for genesis, nyc or google (repeatable)')
+    add_browser_arguments(serve_parser)
+    serve_parser.add_argument('--estimate-from-log', nargs='*', default=['genesis_automation.log'],
+                              help='Seed the job runtime estimate from these automation logs')
+    genesis.add_profiling_arguments(serve_parser)
+    genesis.add_logging_arguments(serve_parser)
+
+    submit_parser = subparsers.add_parser('submit', help='Submit a property job and stream progress')
+    for field in JOB_FIELDS:
+        submit_parser.add_argument(f"--{field.replace('_', '-')}", dest=field, required=True)
+    submit_parser.add_argument('--review', action='store_true', help='Keep the browser open for operator review')
+    submit_parser.add_argument('--no-wait', action='store_true', help='Return after queueing the job')
+    submit_parser.add_argument('--priority', default='normal', help='urgent, normal or backfill')
+    submit_parser.add_argument('--deadline-minutes', type=float, help='Minutes until the result is needed')
+    submit_parser.add_argument('--source', default='default', help='Submitting source, for fair sharing (e.g. airtable)')
+
+    for sub in (serve_parser, submit_parser):
+        sub.add_argument('--host', default='127.0.0.1', help='Service address')
+        sub.add_argument('--port', type=int, default=8765, help='Service port')
+
+    args = parser.parse_args()
+    if args.command == 'serve' and not args.accounts and not (args.username and args.password is not None):
+        serve_parser.error("either --accounts or both --username and --password are required")
+    return serve(args) if args.command == 'serve' else submit(args)
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+GENESIS LOG ANALYZER - Latency baseline from existing genesis_automation.log files
+Stream-parses the log in one pass, rebuilds each run's stage boundaries from
+the lines the automation already writes, and reports latency distributions
+per stage and per day (lot probes, the RUN wait, the download wait, ...)
+
+Memory stays bounded: only the runs being parsed are held (one per job when
+several workers share a log), and each stage keeps exact count/mean/min/max
+plus a fixed-size reservoir sample for percentiles.
+
+Usage:
+    python GENESIS_LOG_ANALYZER.py genesis_automation.log [genesis_automation.log.1 ...] [--json] [--runs-csv runs.csv]
+"""
+
+import argparse
+import csv
+import glob
+import json
+import random
+import re
+import sys
+from datetime import datetime
+
+LINE_PATTERN = re.compile(r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) - (\w+) - (.*)$')
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S,%f'
+
+# A new run starts at the first of these markers
+RUN_START_MARKERS = ["===== DUAL AUTOMATION STARTING =====", "====== Starting INFINITE Genesis GenPAD Automation ======"]
+RUN_END_MARKERS = ["INFINITE automation completed", "Automation failed", "KEEPING PYTHON SCRIPT ALIVE FOREVER"]
+
+# stage name: (start markers, end markers)
+STAGE_MARKERS = {
+    "driver_setup": (["====== WebDriver manager ======"], ["Chrome driver initialized successfully"]),
+    "nyc": (["NYC PROPERTY PORTAL AUTOMATION STARTING"], ["NYC AUTOMATION COMPLETED", "NYC automation failed"]),
+    "maps": (["GOOGLE MAPS AUTOMATION STARTING"], ["GOOGLE MAPS AUTOMATION COMPLETED", "Google Maps automation failed"]),
+    "login": (["Navigating to Genesis GenPAD and logging in"],
+              ["Successfully on comparison page", "Failed to reach comparison page", "Already logged in (warm session)"]),
+    "form_setup": (["INITIAL FORM SETUP"], ["Initial form setup completed", "Initial form setup failed"]),
+    "lot_search": (["STARTING SMART CHUNKED LOT SEARCH"],
+                   ["SMART CHUNKED SEARCH COMPLETE", "STOPPING SEARCH - Original lot"]),
+    "search": (["STEP 4: Running search"],
+               ["NETWORK RESULT:", "PARSED RESULT:", "JAVASCRIPT METHOD:", "Could not determine record count",
+                "Error running search"]),
+    # With network capture the count comes from the search response instead of the results box
+    "run_wait": (["Successfully clicked RUN button"], ["Looking for 'Records Selected' count", "NETWORK RESULT:"]),
+    "download_wait": (["Waiting for Excel download..."],
+                      ["SUCCESS: Downloaded", "TIMEOUT: No Excel files downloaded"]),
+}
+
+PROBE_MARKER = "Testing lot number:"
+RECORD_COUNT_PATTERN = re.compile(r'Found (\d+) records at')
+
+# ============================================================================
+# BOUNDED STATISTICS
+# ============================================================================
+
+class StreamingStats:
+    """Exact count/mean/min/max plus a reservoir sample for percentiles"""
+
+    def __init__(self, reservoir_size=2048, seed=0):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.reservoir_size = reservoir_size
+        self.sample = []
+        self.random = random.Random(seed)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        if len(self.sample) < self.reservoir_size:
+            self.sample.append(value)
+        else:
+            slot = self.random.randrange(self.count)
+            if slot < self.reservoir_size:
+                self.sample[slot] = value
+
+    def percentile(self, fraction):
+        if not self.sample:
+            return None
+        ordered = sorted(self.sample)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2),
+            "min": round(self.minimum, 2),
+            "p50": round(self.percentile(0.50), 2),
+            "p90": round(self.percentile(0.90), 2),
+            "p99": round(self.percentile(0.99), 2),
+            "max": round(self.maximum, 2),
+        }
+
+# ============================================================================
+# RUN RECONSTRUCTION
+# ============================================================================
+
+class LogRunParser:
+    """
+    Feeds log lines one at a time and returns each run once it is complete
+    JSON lines from the job service and queue workers carry a job_id; their runs
+    are tracked per job so interleaved workers are not stitched together. Lines
+    without one (plain text, single CLI runs) form a single stream as before.
+    """
+
+    def __init__(self, max_open_runs=256):
+        self.runs = {}  # job_id (None for unkeyed lines) -> run being parsed
+        self.max_open_runs = max_open_runs
+
+    @staticmethod
+    def parse_line(line):
+        """Return (timestamp, message, job_id) for a plain or JSON log line, else None"""
+        if line.startswith('{'):
+            try:
+                entry = json.loads(line)
+                return datetime.strptime(entry["time"], TIME_FORMAT), entry["message"], entry.get("job_id")
+            except (ValueError, KeyError):
+                return None
+        match = LINE_PATTERN.match(line)
+        if not match:
+            return None  # stack traces and other continuation lines
+        return datetime.strptime(match.group(1), TIME_FORMAT), match.group(3), None
+
+    def _new_run(self, timestamp, job_id):
+        return {"start": timestamp, "end": None, "job_id": job_id, "stages": {}, "open": {}, "probes": 0,
+                "record_count": None, "outcome": "incomplete", "markers": set()}
+
+    def feed(self, line):
+        """Process one line; returns the list of runs it finished (usually empty)"""
+        parsed = self.parse_line(line.rstrip('\n'))
+        if parsed is None:
+            return []
+        timestamp, message, job_id = parsed
+        finished = []
+
+        for marker in RUN_START_MARKERS:
+            if marker in message:
+                # The second marker belongs to the same run unless this run already saw it
+                run = self.runs.get(job_id)
+                if run is None or marker in run["markers"] or run["end"] is not None:
+                    finished += self.close(job_id)
+                    finished += self._evict()
+                    self.runs[job_id] = self._new_run(timestamp, job_id)
+                self.runs[job_id]["markers"].add(marker)
+
+        run = self.runs.get(job_id)
+        if run is None:
+            return finished
+
+        for stage, (starts, ends) in STAGE_MARKERS.items():
+            if any(marker in message for marker in starts):
+                run["open"][stage] = timestamp
+            elif stage in run["open"] and any(marker in message for marker in ends):
+                started = run["open"].pop(stage)
+                run["stages"][stage] = run["stages"].get(stage, 0.0) + (timestamp - started).total_seconds()
+
+        if PROBE_MARKER in message:
+            run["probes"] += 1
+        count_match = RECORD_COUNT_PATTERN.search(message)
+        if count_match:
+            run["record_count"] = int(count_match.group(1))
+
+        if run["end"] is None and any(marker in message for marker in RUN_END_MARKERS):
+            run["end"] = timestamp
+            run["outcome"] = "failed" if "Automation failed" in message else "completed"
+
+        return finished
+
+    def _evict(self):
+        """Keep memory bounded: a job's run stays open for late lines (background downloads)
+        until too many jobs are open, then the oldest ended (else oldest) run is finished"""
+        if len(self.runs) < self.max_open_runs:
+            return []
+        ended = [job_id for job_id, run in self.runs.items() if run["end"] is not None]
+        oldest = min(ended or self.runs, key=lambda job_id: self.runs[job_id]["start"])
+        return self.close(oldest)
+
+    def close(self, job_id=None):
+        """Finish one job's run in progress (next run of that job); returns [] or [run]"""
+        run = self.runs.pop(job_id, None)
+        if run is None:
+            return []
+        run.pop("open")
+        run.pop("markers")
+        if run["end"] is not None:
+            run["stages"]["total"] = (run["end"] - run["start"]).total_seconds()
+        return [run]
+
+    def close_all(self):
+        """Finish every run still open (end of input), oldest first"""
+        finished = []
+        for job_id in sorted(self.runs, key=lambda job_id: self.runs[job_id]["start"]):
+            finished += self.close(job_id)
+        return finished
+
+# ============================================================================
+# AGGREGATION AND REPORTING
+# ============================================================================
+
+class LatencyReport:
+    """Per-stage and per-day latency distributions over all runs"""
+
+    def __init__(self):
+        self.runs = 0
+        self.outcomes = {}
+        self.by_stage = {}
+        self.by_day = {}
+        self.probes = StreamingStats()
+        self.record_counts = StreamingStats()
+
+    def add_run(self, run):
+        self.runs += 1
+        self.outcomes[run["outcome"]] = self.outcomes.get(run["outcome"], 0) + 1
+        day = run["start"].strftime('%Y-%m-%d')
+        day_stats = self.by_day.setdefault(day, {})
+        for stage, seconds in run["stages"].items():
+            self.by_stage.setdefault(stage, StreamingStats()).add(seconds)
+            day_stats.setdefault(stage, StreamingStats(reservoir_size=256)).add(seconds)
+        if run["probes"]:
+            self.probes.add(run["probes"])
+        if run["record_count"] is not None:
+            self.record_counts.add(run["record_count"])
+
+    def to_dict(self):
+        return {
+            "runs": self.runs,
+            "outcomes": self.outcomes,
+            "stages": {stage: stats.summary() for stage, stats in self.by_stage.items()},
+            "lot_probes_per_run": self.probes.summary(),
+            "records_per_search": self.record_counts.summary(),
+            "days": {day: {stage: stats.summary() for stage, stats in stages.items()}
+                     for day, stages in sorted(self.by_day.items())},
+        }
+
+    def _table(self, stats_by_stage):
+        lines = [f"  {'stage':<14}{'n':>6}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"]
+        ordered = [stage for stage in list(STAGE_MARKERS) + ["total"] if stage in stats_by_stage]
+        for stage in ordered:
+            summary = stats_by_stage[stage].summary()
+            lines.append(f"  {stage:<14}{summary['count']:>6}{summary['mean']:>9.1f}{summary['p50']:>9.1f}"
+                         f"{summary['p90']:>9.1f}{summary['p99']:>9.1f}{summary['max']:>9.1f}")
+        return lines
+
+    def format_text(self):
+        lines = [f"📊 Runs analysed: {self.runs} ({', '.join(f'{k}: {v}' for k, v in sorted(self.outcomes.items()))})",
+                 "", "Stage latency (seconds), all days:"]
+        lines += self._table(self.by_stage)
+        for label, stats in (("Lot probes per run", self.probes), ("Records per search", self.record_counts)):
+            summary = stats.summary()
+            if summary["count"]:
+                lines.append(f"\n{label}: mean {summary['mean']}, p50 {summary['p50']}, "
+                             f"p90 {summary['p90']}, max {summary['max']} (n={summary['count']})")
+        for day, stages in sorted(self.by_day.items()):
+            lines += ["", f"📅 {day}:"] + self._table(stages)
+        return "\n".join(lines)
+
+RUN_CSV_FIELDS = ["start", "end", "job_id", "outcome", "probes", "record_count"] + list(STAGE_MARKERS) + ["total"]
+
+def analyze(paths, runs_csv=None):
+    """Single pass over the log files; optionally writes one CSV row per run as it completes"""
+    parser = LogRunParser()
+    report = LatencyReport()
+    writer = None
+    csv_file = None
+    if runs_csv:
+        csv_file = open(runs_csv, 'w', newline='', encoding='utf-8')
+        writer = csv.DictWriter(csv_file, fieldnames=RUN_CSV_FIELDS)
+        writer.writeheader()
+
+    def handle(runs):
+        for run in runs:
+            report.add_run(run)
+            if writer:
+                row = {field: run.get(field) for field in RUN_CSV_FIELDS[:6]}
+                row.update({stage: round(seconds, 3) for stage, seconds in run["stages"].items()})
+                writer.writerow(row)
+
+    try:
+        for path in paths:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    handle(parser.feed(line))
+        handle(parser.close_all())
+    finally:
+        if csv_file:
+            csv_file.close()
+    return report
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Stage latency baseline from Genesis automation logs')
+    arg_parser.add_argument('logs', nargs='*', default=['genesis_automation.log'],
+                            help='Log files or glob patterns, oldest first')
+    arg_parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    arg_parser.add_argument('--runs-csv', help='Also write one row per run to this CSV file')
+    args = arg_parser.parse_args()
+
+    paths = []
+    for pattern in args.logs:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+
+    try:
+        report = analyze(paths, args.runs_csv)
+    except FileNotFoundError as e:
+        print(f"❌ Log file not found: {e.filename}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.format_text())
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+GENESIS METRICS - Live counters, gauges and histograms in Prometheus text format
+The automation updates the shared registry as it runs; serve it with
+start_metrics_server(port) (CLI/queue workers) or the job service's GET /metrics.
+No prometheus_client dependency: the text exposition format is written directly.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STAGE_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120, 300, 600)
+PROBE_BUCKETS = (0, 1, 2, 5, 10, 20, 40)
+RECORD_BUCKETS = (0, 5, 10, 25, 50, 100, 250, 500)
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{str(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name, self.help, self.label_names = name, help_text, tuple(label_names)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1.0, *labels):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+class Gauge:
+    """Value read from a callback at scrape time: fn() -> number or {label tuple: number}
+    kind="counter" for running totals kept elsewhere (e.g. rate governor wait)"""
+
+    def __init__(self, name, help_text, label_names=(), fn=None, kind="gauge"):
+        self.name, self.help, self.label_names = name, help_text, tuple(label_names)
+        self.fn = fn
+        self.kind = kind
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            value = self.fn() if self.fn else None
+        except Exception:
+            value = None
+        if isinstance(value, dict):
+            for labels, item in sorted(value.items()):
+                if item is not None:
+                    lines.append(f"{self.name}{_labels(self.label_names, labels)} {item}")
+        elif value is not None:
+            lines.append(f"{self.name} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, help_text, buckets, label_names=()):
+        self.name, self.help, self.label_names = name, help_text, tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.series = {}  # labels -> [bucket counts..., sum, count]
+        self.lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self.lock:
+            series = self.series.setdefault(labels, [0] * len(self.buckets) + [0.0, 0])
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for labels, series in sorted(self.series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    bucket_labels = _labels(self.label_names + ("le",), labels + (bound,))
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{self.name}_bucket{_labels(self.label_names + ('le',), labels + ('+Inf',))} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {round(series[-2], 3)}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {series[-1]}")
+        return lines
+
+class MetricsRegistry:
+    """All Genesis automation metrics; gauges are wired up by whoever owns the browsers"""
+
+    def __init__(self):
+        self.properties = Counter("genesis_properties_total", "Properties finished, by outcome", ["outcome"])
+        self.stage_seconds = Histogram("genesis_stage_seconds", "Stage latency in seconds", STAGE_BUCKETS, ["stage"])
+        self.lot_probes = Histogram("genesis_lot_probes_per_property", "Genesis lot probes per property", PROBE_BUCKETS)
+        self.records = Histogram("genesis_records_per_search", "Records Selected per Genesis search", RECORD_BUCKETS)
+        self.recent = deque()  # (time, outcome) over the last minute
+        self.recent_lock = threading.Lock()
+        self.gauges = {}
+        self.add_gauge("genesis_properties_last_minute", "Properties finished in the last 60 seconds",
+                       ["outcome"], self._last_minute)
+
+    def add_gauge(self, name, help_text, label_names=(), fn=None, kind="gauge"):
+        self.gauges[name] = Gauge(name, help_text, label_names, fn, kind)
+
+    def record_property(self, outcome):
+        self.properties.inc(1, outcome)
+        with self.recent_lock:
+            self.recent.append((time.monotonic(), outcome))
+
+    def _last_minute(self):
+        cutoff = time.monotonic() - 60
+        with self.recent_lock:
+            while self.recent and self.recent[0][0] < cutoff:
+                self.recent.popleft()
+            counts = {("completed",): 0, ("failed",): 0}
+            for _, outcome in self.recent:
+                counts[(outcome,)] = counts.get((outcome,), 0) + 1
+        return counts
+
+    @contextmanager
+    def stage_timer(self, stage):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.stage_seconds.observe(time.monotonic() - started, stage)
+
+    def render(self):
+        lines = []
+        for metric in [self.properties, self.stage_seconds, self.lot_probes, self.records] + list(self.gauges.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("", "/metrics"):
+            self.send_error(404)
+            return
+        body = metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve GET /metrics from a daemon thread; returns the server"""
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="MetricsServer", daemon=True).start()
+    return server
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+GENESIS PROFILER - Opt-in per-job profiling for slow outliers
+A job is profiled when its record_id was requested or it falls in the sample rate.
+The sampling profiler reads the job thread's stack every few milliseconds from a
+side thread (no tracing overhead in the job itself) and splits the time into
+Python work, WebDriver round trips and sleeping/waiting. mode "cprofile" runs the
+deterministic profiler on the job thread instead.
+
+Output goes next to the job's report in genesis_reports/:
+    <report>.profile.collapsed   flamegraph.pl / speedscope collapsed stacks (sample mode)
+    <report>.profile.txt         category split and top-N functions
+    <report>.profile.pstats      raw cProfile stats (cprofile mode)
+
+Requests can change while the process runs: the job service takes POST /profile,
+and every process re-reads genesis_reports/profile_requests.json when it changes:
+    {"record_ids": ["rec123"], "rate": 0.02, "mode": "sample"}
+"""
+
+import cProfile
+import io
+import json
+import linecache
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+DEFAULT_PROFILE_REQUESTS_PATH = os.path.join(os.getcwd(), "genesis_reports", "profile_requests.json")
+DEFAULT_PROFILE_DIR = os.path.join(os.getcwd(), "genesis_reports")
+
+# Modules whose frames mean the job is waiting on a WebDriver round trip
+WEBDRIVER_MODULES = ("selenium", "urllib3", "http.client", "socket", "ssl")
+SLEEP_MARKERS = ("sleep(", ".wait(", ".acquire(", "select(")
+
+def frame_category(frames):
+    """'webdriver', 'sleep' or 'python' for a sampled stack (outermost first)"""
+    for module, _, _ in frames:
+        if module.startswith(WEBDRIVER_MODULES):
+            return "webdriver"
+    module, function, line = frames[-1]
+    if any(marker in line for marker in SLEEP_MARKERS):
+        return "sleep"
+    return "python"
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval from a daemon thread"""
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()  # (frame labels..., [category]) -> samples
+        self.categories = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="JobProfiler", daemon=True)
+        self.started = None
+
+    def start(self):
+        self.started = time.monotonic()
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=1)
+        self.elapsed = time.monotonic() - self.started
+
+    def _run(self):
+        last = time.monotonic()
+        while not self.stopped.wait(self.interval):
+            # A busy job thread holds the GIL, delaying this thread; weight by real time elapsed
+            now = time.monotonic()
+            weight = max(1, round((now - last) / self.interval))
+            last = now
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append((frame.f_globals.get("__name__", "?"), code.co_name,
+                               linecache.getline(code.co_filename, frame.f_lineno).strip()))
+                frame = frame.f_back
+            frames.reverse()
+            category = frame_category(frames)
+            labels = tuple(f"{module}:{function}" for module, function, _ in frames)
+            self.stacks[labels + (f"[{category}]",)] += weight
+            self.categories[category] += weight
+            self.samples += weight
+
+    def collapsed(self):
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top=25):
+        own = Counter()
+        inclusive = Counter()
+        for stack, count in self.stacks.items():
+            functions = stack[:-1]
+            if functions:
+                own[functions[-1]] += count
+            for function in set(functions):
+                inclusive[function] += count
+        total = self.samples or 1
+        lines = [f"{self.samples} samples every {self.interval * 1000:.0f} ms over {self.elapsed:.1f}s", "",
+                 "Where the time went:"]
+        for category in ("python", "webdriver", "sleep"):
+            lines.append(f"  {category:<10} {100 * self.categories[category] / total:5.1f}%")
+        lines += ["", f"Top {top} functions by own time:"]
+        lines += [f"  {100 * count / total:5.1f}%  {function}" for function, count in own.most_common(top)]
+        lines += ["", f"Top {top} functions by inclusive time:"]
+        lines += [f"  {100 * count / total:5.1f}%  {function}" for function, count in inclusive.most_common(top)]
+        return "\n".join(lines) + "\n"
+
+class DeterministicProfiler:
+    """cProfile on the job thread (higher overhead, exact call counts)"""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+        return self
+
+    def stop(self):
+        self.profile.disable()
+
+    def summary(self, top=25):
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(top)
+        return out.getvalue()
+
+class JobProfiling:
+    """
+    Decides which jobs get profiled and writes their output
+    record_ids/rate/mode can be changed at runtime (request() or the requests file)
+    """
+
+    def __init__(self, requests_path=DEFAULT_PROFILE_REQUESTS_PATH, profile_dir=DEFAULT_PROFILE_DIR, log=None):
+        self.log = log or logging.getLogger(__name__)
+        self.requests_path = requests_path
+        self.profile_dir = profile_dir
+        self.record_ids = set()
+        self.rate = 0.0
+        self.mode = "sample"
+        self.file_mtime = None
+        self.lock = threading.Lock()
+
+    def request(self, record_id=None, rate=None, mode=None):
+        with self.lock:
+            if record_id:
+                self.record_ids.add(str(record_id))
+            if rate is not None:
+                self.rate = float(rate)
+            if mode:
+                if mode not in ("sample", "cprofile"):
+                    raise ValueError(f"unknown profiling mode '{mode}' (use sample or cprofile)")
+                self.mode = mode
+        self.log.info(f"🔬 Profiling requests: records {sorted(self.record_ids) or '-'}, "
+                      f"rate {self.rate:.0%}, mode {self.mode}")
+
+    def _reload_file(self):
+        try:
+            mtime = os.path.getmtime(self.requests_path)
+        except OSError:
+            return
+        if mtime == self.file_mtime:
+            return
+        self.file_mtime = mtime
+        try:
+            with open(self.requests_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            self.log.warning(f"Could not read {self.requests_path}: {e}")
+            return
+        with self.lock:
+            self.record_ids |= {str(record_id) for record_id in data.get("record_ids", [])}
+        self.request(rate=data.get("rate", 0.0), mode=data.get("mode"))
+
+    def start(self, record_id):
+        """Profiler for this job if it is chosen, else None (call from the job's thread)"""
+        self._reload_file()
+        with self.lock:
+            chosen = str(record_id) in self.record_ids or (self.rate and random.random() < self.rate)
+            mode = self.mode
+        if not chosen:
+            return None
+        self.log.info(f"🔬 Profiling record {record_id} ({mode})")
+        return (DeterministicProfiler() if mode == "cprofile" else SamplingProfiler()).start()
+
+    def finish(self, profiler, record_id, report_path=None, top=25):
+        """Stop the profiler and write its files next to the report; returns the summary path"""
+        profiler.stop()
+        return self.write(profiler, record_id, report_path, top)
+
+    def write(self, profiler, record_id, report_path=None, top=25):
+        """Write a stopped profiler's files next to the report; returns the summary path
+        A write error is logged and gives None - it never replaces the job's own result."""
+        with self.lock:
+            self.record_ids.discard(str(record_id))
+        if report_path:
+            base = os.path.splitext(report_path)[0]
+        else:
+            base = os.path.join(self.profile_dir, f"{record_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        try:
+            os.makedirs(os.path.dirname(base) or ".", exist_ok=True)
+            if isinstance(profiler, SamplingProfiler):
+                with open(base + ".profile.collapsed", 'w', encoding='utf-8') as f:
+                    f.write(profiler.collapsed())
+            else:
+                profiler.profile.dump_stats(base + ".profile.pstats")
+            summary_path = base + ".profile.txt"
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                f.write(f"Record {record_id}\n{profiler.summary(top)}")
+        except OSError as e:
+            self.log.warning(f"⚠️ Could not write the profile for record {record_id}: {e}")
+            return None
+        self.log.info(f"🔬 Profile for record {record_id}: {summary_path}")
+        return summary_path
+
+    def status(self):
+        with self.lock:
+            return {"record_ids": sorted(self.record_ids), "rate": self.rate, "mode": self.mode}
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+GENESIS REPORT WRITER - Comparables rows written to CSV, xlsx or Parquet
+Used when the results table is read straight off the Genesis page (--page-reports)
+instead of waiting for Chrome to download the Excel export.
+CSV needs nothing; xlsx needs openpyxl and Parquet needs pyarrow (both optional).
+"""
+
+import csv
+import os
+import re
+
+try:
+    import openpyxl  # Optional: xlsx page reports
+except ImportError:
+    openpyxl = None
+
+try:
+    import pyarrow  # Optional: Parquet page reports
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+REPORT_FORMATS = ("xlsx", "csv", "parquet")
+FORMAT_DEPENDENCIES = {"xlsx": "openpyxl", "parquet": "pyarrow"}
+
+NUMBER_PATTERN = re.compile(r'^-?\$?\d[\d,]*(\.\d+)?$')
+# Codes made of digits (BBLs, ZIPs, IDs) stay text so leading zeros survive
+CODE_COLUMN_PATTERN = re.compile(r'^(bbl|block|lot|boro(ugh)?( code)?|tax class|zip( ?code)?|postal code|.*\bid)$')
+LEADING_ZERO_PATTERN = re.compile(r'^0\d')
+
+def format_available(report_format):
+    """True if this format can be written with the installed packages"""
+    return {"csv": True, "xlsx": openpyxl is not None, "parquet": pyarrow is not None}.get(report_format, False)
+
+def unique_path(directory, filename):
+    """directory/filename, with _1, _2, ... before the extension if that file already exists"""
+    base, extension = os.path.splitext(filename)
+    path = os.path.join(directory, filename)
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(directory, f"{base}_{counter}{extension}")
+        counter += 1
+    return path
+
+def column_names(columns, width):
+    """Header names for `width` columns: blanks filled in, duplicates numbered"""
+    names = []
+    for index in range(width):
+        name = str(columns[index]).strip() if index < len(columns) and columns[index] is not None else ""
+        name = name or f"Column {index + 1}"
+        candidate, counter = name, 2
+        while candidate in names:
+            candidate = f"{name} {counter}"
+            counter += 1
+        names.append(candidate)
+    return names
+
+def _number(text):
+    cleaned = text.replace('$', '').replace(',', '')
+    return float(cleaned) if '.' in cleaned else int(cleaned)
+
+def typed_columns(rows, names):
+    """Column-wise values; a column whose non-empty cells are all numbers becomes numeric
+    unless it is a code column or a cell has a leading zero"""
+    columns = []
+    for index, name in enumerate(names):
+        values = [row[index] if index < len(row) else None for row in rows]
+        texts = [value.strip() for value in values if isinstance(value, str) and value.strip()]
+        if (texts and not CODE_COLUMN_PATTERN.match(name.strip().lower())
+                and all(NUMBER_PATTERN.match(text) and not LEADING_ZERO_PATTERN.match(text) for text in texts)):
+            values = [_number(value.strip()) if isinstance(value, str) and value.strip() else None
+                      for value in values]
+        else:
+            values = [None if value is None else value if isinstance(value, (int, float)) else str(value)
+                      for value in values]
+        columns.append(values)
+    return columns
+
+def write_report(path, columns, rows):
+    """Write the rows to path; the format comes from its extension. Returns path."""
+    report_format = os.path.splitext(path)[1].lstrip('.').lower()
+    if not format_available(report_format):
+        raise RuntimeError(f"cannot write .{report_format} reports - "
+                           f"{FORMAT_DEPENDENCIES.get(report_format, 'unsupported format')} is not installed")
+    width = max([len(columns)] + [len(row) for row in rows])
+    names = column_names(columns, width)
+    if report_format == "csv":
+        with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            writer.writerows(rows)
+        return path
+    values = typed_columns(rows, names)
+    if report_format == "xlsx":
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet("Genesis Report")
+        sheet.append(names)
+        for row in zip(*values):
+            sheet.append(list(row))
+        workbook.save(path)
+    else:
+        pyarrow.parquet.write_table(pyarrow.table(dict(zip(names, values))), path)
+    return path
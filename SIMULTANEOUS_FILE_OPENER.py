@@ -9,10 +9,11 @@ import os
 import subprocess
 import logging
 import glob
-import threading
 import time
 from pathlib import Path
 
+from BACKGROUND_IO_EXECUTOR import ExecutorBusy, io_executor
+
 # Configure logging for simultaneous file opener
 sim_file_logger = logging.getLogger('simultaneous_file_opener')
 sim_file_logger.setLevel(logging.INFO)
@@ -37,7 +38,7 @@ class SimultaneousFileOpener:
         
     def find_and_open_file_immediately(self, property_address):
         """
-        Find and open file immediately - runs in separate thread
+        Find and open file immediately - runs on the background I/O executor
         Does not wait for any other automation to complete
         """
         try:
@@ -144,7 +145,7 @@ class SimultaneousFileOpener:
 # MAIN FUNCTION FOR SIMULTANEOUS EXECUTION
 def launch_file_opener_immediately(property_address, search_folder="C:\\Users\\MLFLL\\Downloads\\n8ntest\\"):
     """
-    Launch file opener immediately in a separate thread
+    Launch file opener immediately on the shared background I/O executor
     This runs completely independently of main automation
     
     Args:
@@ -152,7 +153,7 @@ def launch_file_opener_immediately(property_address, search_folder="C:\\Users\\M
         search_folder (str): Folder to search in
     
     Returns:
-        threading.Thread: The thread running the file opener
+        concurrent.futures.Future: Resolves to True if a file was opened (None if the executor is full)
     """
     try:
         sim_file_logger.info("🚀 LAUNCHING SIMULTANEOUS FILE OPENER")
@@ -161,22 +162,18 @@ def launch_file_opener_immediately(property_address, search_folder="C:\\Users\\M
         # Create file opener instance
         opener = SimultaneousFileOpener(search_folder)
         
-        # Create and start thread for file opening
-        file_thread = threading.Thread(
-            target=opener.find_and_open_file_immediately,
-            args=(property_address,),
-            name="FileOpenerThread",
-            daemon=True  # Dies when main program exits
-        )
-        
-        # Start the thread immediately
-        file_thread.start()
+        # Bursts of file searches queue on the bounded executor instead of one thread each
+        future = io_executor.submit(opener.find_and_open_file_immediately, property_address, block=False,
+                                    description=f"file opener for {property_address}")
         
-        sim_file_logger.info("✅ File opener thread started successfully")
+        sim_file_logger.info("✅ File opener queued successfully")
         sim_file_logger.info("🔄 Main automation can continue independently")
         
-        return file_thread
+        return future
         
+    except ExecutorBusy as e:
+        sim_file_logger.warning(f"⚠️ Skipping file opener - background I/O is saturated ({e})")
+        return None
     except Exception as e:
         sim_file_logger.error(f"❌ Error launching simultaneous file opener: {e}")
         return None
@@ -195,16 +192,16 @@ def start_file_search_now(property_address):
         sim_file_logger.info("🎯 IMMEDIATE FILE SEARCH REQUESTED")
         sim_file_logger.info(f"🏠 Address: {property_address}")
         
-        # Launch immediately in separate thread
-        thread = launch_file_opener_immediately(property_address)
+        # Launch immediately in the background
+        future = launch_file_opener_immediately(property_address)
         
-        if thread:
+        if future:
             sim_file_logger.info("✅ File search launched successfully")
             sim_file_logger.info("🔄 Continuing with main automation...")
         else:
             sim_file_logger.error("❌ Failed to launch file search")
         
-        return thread
+        return future
         
     except Exception as e:
         sim_file_logger.error(f"❌ Error starting immediate file search: {e}")
@@ -219,9 +216,9 @@ def test_simultaneous_opener():
     print(f"🏠 Test address: {test_address}")
     
     # Start file opener
-    thread = start_file_search_now(test_address)
+    future = start_file_search_now(test_address)
     
-    if thread:
+    if future:
         print("✅ File opener started in background")
         print("🔄 Main program continues...")
         
@@ -234,7 +231,7 @@ def test_simultaneous_opener():
         print("📁 File opener runs independently")
         
         # Wait for file opener to complete (optional)
-        thread.join(timeout=10)
+        print(f"📂 File opened: {future.result(timeout=10)}")
         print("🎉 Test completed")
     else:
         print("❌ Failed to start file opener")
@@ -0,0 +1,34 @@
+import threading
+
+import pytest
+
+from BACKGROUND_IO_EXECUTOR import BoundedExecutor, ExecutorBusy
+
+def test_a_submit_waiting_for_a_slot_is_refused_after_shutdown():
+    executor = BoundedExecutor(max_workers=1, max_pending=0)
+    release = threading.Event()
+    running = executor.submit(release.wait)
+    outcome = []
+
+    def waiting_submit():
+        try:
+            executor.submit(lambda: "ran")
+            outcome.append("submitted")
+        except ExecutorBusy:
+            outcome.append("refused")
+
+    waiter = threading.Thread(target=waiting_submit)
+    waiter.start()
+    executor.shutdown(wait=False)
+    release.set()
+    waiter.join(timeout=5)
+    running.result(timeout=5)
+    assert outcome == ["refused"]
+    assert executor.status()["in_flight"] == 0
+    assert executor.slots.acquire(blocking=False)  # the refused call handed its slot back
+
+def test_submit_after_shutdown_raises():
+    executor = BoundedExecutor()
+    executor.shutdown()
+    with pytest.raises(ExecutorBusy):
+        executor.submit(lambda: None)
@@ -0,0 +1,13 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+from FAKE_GENESIS_WEBDRIVER import make_site, run_benchmark, simulated_properties
+
+@pytest.mark.parametrize("capture_network", [True, False])
+def test_varying_counts_and_latencies_are_never_read_stale(capture_network):
+    site = make_site("varying", seed=3)
+    report = run_benchmark(simulated_properties(60, 1, 3), site, capture_network=capture_network)
+    assert report["failures"] == 0
+    assert report["wrong_counts"] == 0
+    assert not report["unknown_scripts"]
@@ -0,0 +1,59 @@
+import time
+
+from GENESIS_JOB_QUEUE import LeaseQueue
+
+def job_params(record_id, lot="12", block="100"):
+    return {"borough": "Brooklyn", "block": block, "lot": lot, "tax_class": "2",
+            "property_address": "1 Main St", "owner": "Owner LLC", "record_id": record_id}
+
+def test_duplicate_record_or_bbl_is_not_queued_twice(tmp_path):
+    lease_queue = LeaseQueue(str(tmp_path / "queue.db"))
+    job_id, created = lease_queue.enqueue(job_params("rec1"))
+    assert created
+    assert lease_queue.enqueue(job_params("rec1", lot="13")) == (job_id, False)
+    assert lease_queue.enqueue(job_params("rec2")) == (job_id, False)  # same BBL, other record
+    assert lease_queue.enqueue(job_params("rec3", lot="13"))[1]
+
+def test_claim_complete_and_release(tmp_path):
+    lease_queue = LeaseQueue(str(tmp_path / "queue.db"))
+    job_id, _ = lease_queue.enqueue(job_params("rec1"))
+
+    job = lease_queue.claim("worker-a")
+    assert job["job_id"] == job_id and job["attempt"] == 1
+    assert lease_queue.claim("worker-b") is None
+    assert lease_queue.heartbeat(job_id, job["lease_token"])
+    assert not lease_queue.complete(job_id, "not-the-token", {"success": True})
+
+    # A release hands the job back without using up the attempt
+    assert lease_queue.release(job_id, job["lease_token"], delay=0)
+    again = lease_queue.claim("worker-b")
+    assert again["job_id"] == job_id and again["attempt"] == 1
+    assert again["lease_token"] != job["lease_token"]
+    assert not lease_queue.heartbeat(job_id, job["lease_token"])
+
+    assert lease_queue.complete(job_id, again["lease_token"], {"success": True})
+    assert lease_queue.status()["jobs"] == {"done": 1}
+    assert lease_queue.claim("worker-a") is None
+
+def test_expired_lease_is_requeued_and_the_old_token_is_dead(tmp_path):
+    lease_queue = LeaseQueue(str(tmp_path / "queue.db"), visibility_timeout=0.05)
+    job_id, _ = lease_queue.enqueue(job_params("rec1"))
+    first = lease_queue.claim("worker-a")
+    time.sleep(0.1)
+    second = lease_queue.claim("worker-b")
+    assert second["job_id"] == job_id and second["attempt"] == 2
+    assert not lease_queue.complete(job_id, first["lease_token"], {"success": True})
+    assert lease_queue.complete(job_id, second["lease_token"], {"success": True})
+
+def test_failures_retry_until_attempts_run_out(tmp_path):
+    lease_queue = LeaseQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    job_id, _ = lease_queue.enqueue(job_params("rec1"))
+    assert lease_queue.fail(job_id, lease_queue.claim("w")["lease_token"], "boom", retry_delay=0) == "pending"
+    assert lease_queue.fail(job_id, lease_queue.claim("w")["lease_token"], "boom", retry_delay=0) == "failed"
+    assert lease_queue.claim("w") is None
+
+def test_claim_prefers_localities_with_a_filled_form(tmp_path):
+    lease_queue = LeaseQueue(str(tmp_path / "queue.db"))
+    lease_queue.enqueue(job_params("rec1", block="100"))
+    neighbour_id, _ = lease_queue.enqueue(job_params("rec2", block="200"))
+    assert lease_queue.claim("w", prefer=[("brooklyn", "200")])["job_id"] == neighbour_id
@@ -0,0 +1,58 @@
+import itertools
+import time
+from types import SimpleNamespace
+
+from GENESIS_JOB_SCHEDULER import PRIORITIES, JobScheduler, RuntimeEstimator
+
+_seq = itertools.count()
+
+def make_job(job_id, priority="normal", deadline=None, source="airtable", locality=("brooklyn", "100")):
+    return SimpleNamespace(job_id=job_id, priority=PRIORITIES[priority], deadline=deadline, source=source,
+                           seq=next(_seq), preemptions=0, started_at=None, locality=locality,
+                           params={"record_id": job_id})
+
+def drain(scheduler, prefer=()):
+    order = []
+    while scheduler.qsize():
+        order.append(scheduler.get(timeout=0, prefer=prefer).job_id)
+    return order
+
+def test_priority_classes_then_fifo():
+    scheduler = JobScheduler(workers=1)
+    for job in [make_job("backfill", "backfill"), make_job("normal-1"), make_job("urgent", "urgent"),
+                make_job("normal-2")]:
+        scheduler.put(job)
+    assert drain(scheduler) == ["urgent", "normal-1", "normal-2", "backfill"]
+
+def test_tight_deadline_runs_first_then_earliest_deadline():
+    scheduler = JobScheduler(workers=1, estimator=RuntimeEstimator(initial_seconds=100))
+    scheduler.put(make_job("early"))
+    scheduler.put(make_job("due-soon", deadline=time.time() + 60))
+    scheduler.put(make_job("due-later", deadline=time.time() + 3600))
+    assert drain(scheduler) == ["due-soon", "due-later", "early"]
+
+def test_fair_share_prefers_the_least_used_source():
+    scheduler = JobScheduler(workers=1)
+    busy = make_job("busy-1", source="busy")
+    scheduler.finished(busy, seconds=600)
+    scheduler.put(make_job("busy-2", source="busy"))
+    scheduler.put(make_job("quiet-1", source="quiet"))
+    assert drain(scheduler) == ["quiet-1", "busy-2"]
+
+def test_neighbour_of_an_idle_form_runs_next_within_the_same_class():
+    scheduler = JobScheduler(workers=1)
+    scheduler.put(make_job("other-block", locality=("queens", "7")))
+    scheduler.put(make_job("neighbour", locality=("brooklyn", "100")))
+    scheduler.put(make_job("urgent-elsewhere", "urgent", locality=("bronx", "3")))
+    assert drain(scheduler, prefer={("brooklyn", "100")}) == ["urgent-elsewhere", "neighbour", "other-block"]
+
+def test_preempts_only_for_a_higher_class_with_no_free_worker():
+    scheduler = JobScheduler(workers=1, max_preemptions=1)
+    running = make_job("running")
+    assert not scheduler.should_preempt(running)
+    scheduler.put(make_job("same-class"))
+    assert not scheduler.should_preempt(running)
+    scheduler.put(make_job("urgent", "urgent"))
+    assert scheduler.should_preempt(running)
+    scheduler.preempted(running, seconds=10)
+    assert running.preemptions == 1 and not scheduler.should_preempt(running)
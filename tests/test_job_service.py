@@ -0,0 +1,33 @@
+import time
+from types import SimpleNamespace
+
+from GENESIS_JOB_SERVICE import GenesisJobService, PropertyJob
+
+PARAMS = {"borough": "Brooklyn", "block": "100", "lot": "12", "tax_class": "2",
+          "property_address": "1 Main St", "owner": "Owner LLC", "record_id": "rec1"}
+
+def test_job_keeps_only_the_latest_events():
+    job = PropertyJob(PARAMS)
+    for index in range(PropertyJob.MAX_EVENTS + 20):
+        job.add_event({"message": str(index)})
+    assert job.event_count == PropertyJob.MAX_EVENTS + 20
+    assert len(job.events) == PropertyJob.MAX_EVENTS
+    assert [event["message"] for event in job.events_since(job.event_count - 2)] == ["518", "519"]
+    # A reader that fell behind the dropped events gets what is left
+    assert job.events_since(0)[0]["message"] == "20"
+    assert job.events_since(job.event_count) == []
+
+def test_finished_jobs_are_forgotten_after_ttl_or_past_the_cap():
+    now = time.time()
+    jobs = {}
+    for index, (status, finished_ago) in enumerate([("done", 7200), ("failed", 30), ("done", 20), ("done", 10),
+                                                    ("running", None), ("done", 9000)]):
+        job = PropertyJob(PARAMS)
+        job.status, job.finished_at = status, None if finished_ago is None else now - finished_ago
+        jobs[f"job-{index}"] = job
+        job.job_id = f"job-{index}"
+    service = SimpleNamespace(jobs=jobs, finished_job_ttl=3600, max_finished_jobs=2,
+                              pool=SimpleNamespace(held={"job-5": object()}))
+    GenesisJobService._evict_finished_jobs(service)
+    # job-0 expired, job-1 is the oldest beyond the cap, job-4 runs, job-5 is held for review
+    assert sorted(service.jobs) == ["job-2", "job-3", "job-4", "job-5"]
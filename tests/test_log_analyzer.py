@@ -0,0 +1,51 @@
+from GENESIS_LOG_ANALYZER import LogRunParser
+
+def log_lines(entries):
+    return [f"2026-10-19 09:00:{second:02d},000 - INFO - {message}\n" for second, message in entries]
+
+def parse(entries):
+    parser = LogRunParser()
+    runs = []
+    for line in log_lines(entries):
+        runs += parser.feed(line)
+    return runs + parser.close_all()
+
+def test_run_with_a_valid_original_lot_records_every_stage():
+    [run] = parse([
+        (0, "===== DUAL AUTOMATION STARTING ====="),
+        (1, "Navigating to Genesis GenPAD and logging in"),
+        (3, "Already logged in (warm session) - proceeding to form"),
+        (4, "🔍 STARTING SMART CHUNKED LOT SEARCH - Original lot: 12"),
+        (5, "🧪 Testing lot number: 12"),
+        (6, "🛑 STOPPING SEARCH - Original lot 12 is valid"),
+        (7, "STEP 4: Running search with navigation bar fix"),
+        (8, "Successfully clicked RUN button (regular click)"),
+        (11, "Looking for 'Records Selected' count in results box..."),
+        (12, "PARSED RESULT: 25 records selected"),
+        (13, "INFINITE automation completed"),
+    ])
+    assert run["outcome"] == "completed"
+    assert run["probes"] == 1
+    assert run["stages"] == {"login": 2.0, "lot_search": 2.0, "search": 5.0, "run_wait": 3.0, "total": 13.0}
+
+def test_chunked_search_ends_once_at_the_lot_it_uses():
+    [run] = parse([
+        (0, "===== DUAL AUTOMATION STARTING ====="),
+        (1, "🔍 STARTING SMART CHUNKED LOT SEARCH - Original lot: 12"),
+        (4, "🛑 STOPPING SEARCH - Found valid property at lot 31"),
+        (4, "🔍 SMART CHUNKED SEARCH COMPLETE - Using lot: 31"),
+        (5, "INFINITE automation completed"),
+    ])
+    assert run["stages"]["lot_search"] == 3.0
+
+def test_count_from_the_captured_search_response_ends_the_search():
+    [run] = parse([
+        (0, "===== DUAL AUTOMATION STARTING ====="),
+        (1, "🔍 STARTING SMART CHUNKED LOT SEARCH - Original lot: 12"),
+        (2, "🛑 STOPPING SEARCH - Original lot 12 is valid"),
+        (3, "STEP 4: Running search with navigation bar fix"),
+        (4, "Successfully clicked RUN button (regular click)"),
+        (10, "📡 NETWORK RESULT: 25 records selected, 25 rows (server answered in 5.8s)"),
+        (13, "INFINITE automation completed"),
+    ])
+    assert run["stages"] == {"lot_search": 1.0, "search": 7.0, "run_wait": 6.0, "total": 13.0}
@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+from DUAL_PROCESS_GENESIS_NYC_AUTOMATION import RateGovernor, classify_login_problem
+
+def test_account_states_come_from_whole_words():
+    assert classify_login_problem("Your account is locked. Contact support.") == "locked_out"
+    assert classify_login_problem("Pop-ups are blocked in this browser") == "login_failed"
+    assert classify_login_problem("Account unlocked - please sign in") == "login_failed"
+    assert classify_login_problem("Invalid password") == "bad_credentials"
+    assert classify_login_problem("Too many requests, try again later") == "rate_limited"
+    assert classify_login_problem("") == "login_failed"
+
+def test_outage_pages_are_told_apart_from_throttling():
+    governor = RateGovernor()
+    page = SimpleNamespace(execute_script=lambda script: "502 bad gateway nginx")
+    assert governor.page_error(page, "genesis") in RateGovernor.OUTAGE_PAGE_MARKERS
+    page = SimpleNamespace(execute_script=lambda script: "too many requests")
+    assert governor.page_error(page, "genesis") not in RateGovernor.OUTAGE_PAGE_MARKERS
+    page = SimpleNamespace(execute_script=lambda script: "comparison search")
+    assert governor.page_error(page, "genesis") is None
+    assert governor.check_page(page, "genesis")
+
+def test_error_page_markers_match_whole_words_only():
+    governor = RateGovernor()
+    page = SimpleNamespace(execute_script=lambda script: "503 service unavailable")
+    assert governor.page_error(page, "nyc") in RateGovernor.OUTAGE_PAGE_MARKERS
+    page = SimpleNamespace(execute_script=lambda script: "you have been rate limited")
+    assert governor.page_error(page, "nyc") == "rate limited"
+    page = SimpleNamespace(execute_script=lambda script: "loading ratelimited.js and 5040 gateways")
+    assert governor.page_error(page, "nyc") is None
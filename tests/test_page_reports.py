@@ -0,0 +1,56 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import DUAL_PROCESS_GENESIS_NYC_AUTOMATION as genesis
+
+def make_session(**overrides):
+    session = SimpleNamespace(journal=None, search_params=genesis.GENESIS_SEARCH_PARAMS, result_cache=None,
+                              resolved_lot=None, page_reports=True, record_count_known=True,
+                              page_report_max_rows=500, defer_downloads=False, last_report_path=None,
+                              report_format="csv", calls=[])
+    session.extract_results_table = lambda record_count: (["Address"], [["1 Comparable St"]] * record_count)
+    session.generate_excel_filename = lambda address, count: f"Test_Genesis_Report_{count}_records.xlsx"
+
+    def start_page_report(address, count, then=None):
+        session.calls.append("page")
+        return genesis.InfiniteGenesisAutomation.start_page_report(session, address, count, then)
+
+    def start_excel_download(address, count, then=None):
+        session.calls.append("excel")
+        future = Future()
+        future.set_result(then("excel.xlsx"))
+        return future
+
+    session.start_page_report = start_page_report
+    session.start_excel_download = start_excel_download
+    for name, value in overrides.items():
+        setattr(session, name, value)
+    return session
+
+def download(session, record_count=3):
+    genesis.InfiniteGenesisAutomation.download_report(session, "Brooklyn", "100", "12", record_count, "rec1",
+                                                      "1 Main St")
+
+def test_failed_page_report_write_falls_back_to_excel(monkeypatch):
+    def broken_write(path, columns, rows):
+        raise OSError("disk full")
+    monkeypatch.setattr(genesis, "write_report", broken_write)
+    session = make_session()
+    download(session)
+    assert session.calls == ["page", "excel"]
+    assert session.last_report_path == "excel.xlsx"
+
+def test_unknown_record_count_skips_the_page_report():
+    session = make_session(record_count_known=False)
+    download(session, record_count=0)
+    assert session.calls == ["excel"]
+
+def test_page_report_written_before_the_bookkeeping(monkeypatch, tmp_path):
+    written = []
+    monkeypatch.setattr(genesis, "DEFAULT_REPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(genesis, "write_report", lambda path, columns, rows: written.append(path) or path)
+    session = make_session()
+    download(session)
+    assert session.calls == ["page"]
+    assert session.last_report_path == written[0]
+    assert written[0].startswith(str(tmp_path))
@@ -0,0 +1,21 @@
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import DUAL_PROCESS_GENESIS_NYC_AUTOMATION as genesis
+from GENESIS_PROFILER import JobProfiling, SamplingProfiler
+
+def test_a_profile_write_error_is_logged_not_raised(tmp_path):
+    blocked = tmp_path / "not-a-dir"
+    blocked.write_text("")
+    profiling = JobProfiling(requests_path=str(tmp_path / "requests.json"), profile_dir=str(blocked / "profiles"))
+    assert profiling.finish(SamplingProfiler().start(), "rec1") is None
+
+def test_a_deferred_download_names_the_profile_after_its_report(tmp_path, monkeypatch):
+    profiling = JobProfiling(requests_path=str(tmp_path / "requests.json"), profile_dir=str(tmp_path / "profiles"))
+    monkeypatch.setattr(genesis, "job_profiling", profiling)
+    download = Future()
+    session = SimpleNamespace(pending_download=download, last_report_path=None)
+    genesis.InfiniteGenesisAutomation.finish_profile(session, SamplingProfiler().start(), "rec1")
+    assert not list(tmp_path.rglob("*.profile.txt"))
+    download.set_result(str(tmp_path / "Comps_rec1.xlsx"))
+    assert (tmp_path / "Comps_rec1.profile.txt").exists()
@@ -0,0 +1,16 @@
+from GENESIS_REPORT_WRITER import typed_columns
+
+def test_numbers_become_numeric_but_codes_keep_their_leading_zeros():
+    names = ["BBL", "Zip", "Record ID", "Units", "Sale Price", "Account"]
+    rows = [["3001230045", "11201", "42", "12", "$1,250,000", "0012"],
+            ["1000120001", "10001", "43", "8", "$990,500.50", "1234"]]
+    bbl, zip_code, record_id, units, price, account = typed_columns(rows, names)
+    assert bbl == ["3001230045", "1000120001"]
+    assert zip_code == ["11201", "10001"]
+    assert record_id == ["42", "43"]
+    assert units == [12, 8]
+    assert price == [1250000, 990500.5]
+    assert account == ["0012", "1234"]
+
+def test_short_rows_give_empty_cells():
+    assert typed_columns([["1", ""], ["2"]], ["Floors", "Notes"]) == [[1, 2], ["", None]]
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from AMI_SCENARIO_ENGINE import (CHECKS, check_compliance, check_compliance_batch, normalize_requirements,
+                                 search_scenarios, within_sf_rule)
+
+def rent_roll(rng, count, shared_sizes=True):
+    sizes = [450, 600, 800, 1000, 1200]
+    units = []
+    for index in range(count):
+        bed = rng.randint(0, 3)
+        sf = rng.choice(sizes) + bed * 50 if shared_sizes else 400 + index * 13.7
+        units.append({"sf": sf, "bed": bed, "floor": rng.randint(2, 8), "unit": f"{index + 1}",
+                      "hasBalcony": rng.random() < 0.3, "amiLevel": None, "tempIndex": index})
+    return units
+
+@pytest.mark.parametrize("bedroom_test", ["A", "B"])
+@pytest.mark.parametrize("size_test", ["A", "B", "C"])
+def test_batched_compliance_matches_the_per_scenario_checks(bedroom_test, size_test):
+    pytest.importorskip("numpy")
+    rng = random.Random(f"{bedroom_test}{size_test}")
+    for _ in range(10):
+        units = rent_roll(rng, rng.randint(4, 30))
+        if rng.random() < 0.3:
+            units[-1]["unit"] = units[0]["unit"]  # the calculator matches free-market units by unit id
+        requirements = normalize_requirements({"targetSF": sum(u["sf"] for u in units) * rng.uniform(0.1, 0.5),
+                                               "bedroomTest": bedroom_test, "sizeTest": size_test})
+        selections = [rng.sample(range(len(units)), rng.randint(0, len(units))) for _ in range(12)]
+        totals = [sum(units[index]["sf"] for index in indices) for indices in selections]
+        expected = [check_compliance(units, indices, total, requirements)
+                    for indices, total in zip(selections, totals)]
+        assert check_compliance_batch(units, selections, totals, requirements) == expected
+
+def test_sf_rule_allows_at_most_fifteen_percent_over():
+    assert within_sf_rule(1000, 1000)
+    assert within_sf_rule(1150, 1000)
+    assert not within_sf_rule(1150.1, 1000)
+    assert not within_sf_rule(999.9, 1000)
+
+def test_search_returns_ranked_unique_scenarios_inline():
+    units = rent_roll(random.Random(5), 40)
+    target_sf = sum(unit["sf"] for unit in units) * 0.3
+    scenarios, stats = search_scenarios(units, {"targetSF": target_sf}, seeds=8, top=3, workers=1,
+                                        compliant_only=False)
+    assert stats["workers"] == 1 and stats["variants"] == 32
+    assert 0 < len(scenarios) <= 3
+    assert len({frozenset(unit["unit"] for unit in s["units"]) for s in scenarios}) == len(scenarios)
+    for scenario in scenarios:
+        assert within_sf_rule(scenario["total_sf"], target_sf)
+        assert set(scenario["compliance"]) == set(CHECKS)
+    failed = [len(s["failed_checks"]) for s in scenarios]
+    assert failed == sorted(failed)
+
+def test_seeds_only_add_scenarios_when_unit_sizes_repeat():
+    distinct = rent_roll(random.Random(9), 40, shared_sizes=False)
+    target_sf = sum(unit["sf"] for unit in distinct) * 0.3
+    _, stats = search_scenarios(distinct, {"targetSF": target_sf}, seeds=16, workers=1, compliant_only=False)
+    assert stats["scenarios"] <= 4  # one per strategy at most, whatever the seed
+
+    shared = rent_roll(random.Random(9), 40)
+    target_sf = sum(unit["sf"] for unit in shared) * 0.3
+    _, stats = search_scenarios(shared, {"targetSF": target_sf}, seeds=16, workers=1, compliant_only=False)
+    assert stats["scenarios"] > 4
@@ -0,0 +1,37 @@
+import json
+from types import SimpleNamespace
+
+from DUAL_PROCESS_GENESIS_NYC_AUTOMATION import InfiniteGenesisAutomation, parse_search_response
+
+def test_json_records_selected_count_and_rows():
+    body = json.dumps({"result": {"RecordsSelected": "1,204", "rows": [{"bbl": "3001000012"}]}})
+    count, rows = parse_search_response(body)
+    assert count == 1204
+    assert rows == [{"bbl": "3001000012"}]
+
+def test_html_records_selected_box():
+    body = ('<div id="RecordsSelected"><span class="label">Records Selected</span>'
+            '<span class="left-offset-20 bold"> 37 </span></div>')
+    assert parse_search_response(body) == (37, None)
+
+def test_bodies_that_are_not_search_results():
+    assert parse_search_response("") == (None, None)
+    assert parse_search_response("{not json") == (None, None)
+    assert parse_search_response(json.dumps({"session": "ok", "expires": 1800})) == (None, None)
+    assert parse_search_response("<html><body>Comparison Search</body></html>") == (None, None)
+
+def test_boolean_is_not_a_count():
+    assert parse_search_response(json.dumps({"recordCount": True})) == (None, None)
+
+def test_row_lists_and_generic_totals_are_not_a_record_count():
+    assert parse_search_response(json.dumps({"total": 12, "rows": [{"id": 1}, {"id": 2}]})) == (None, None)
+    assert parse_search_response(json.dumps([{"id": 1}, {"id": 2}])) == (None, None)
+
+def test_the_page_count_wins_over_a_disagreeing_capture():
+    captured = {"record_count": 12, "rows": [{}] * 12, "server_seconds": 1.0, "url": "https://genesisgenpad.com/x"}
+    page = SimpleNamespace(SEARCH_CROSS_CHECK_SECONDS=0, page_record_count=lambda stale_text=None: 40)
+    assert InfiniteGenesisAutomation.cross_check_capture(page, captured) == dict(captured, record_count=40, rows=None)
+    page.page_record_count = lambda stale_text=None: 12
+    assert InfiniteGenesisAutomation.cross_check_capture(page, captured) is captured
+    page.page_record_count = lambda stale_text=None: None
+    assert InfiniteGenesisAutomation.cross_check_capture(page, captured) is captured
@@ -0,0 +1,19 @@
+from types import SimpleNamespace
+
+import DUAL_PROCESS_GENESIS_NYC_AUTOMATION as genesis
+
+OPTIONS = [("1", "Class 1"), ("3", "Class 3"), ("4", "Class 4")]
+
+def session_for(tax_class):
+    return SimpleNamespace(search_params=genesis.effective_search_params(tax_class),
+                           smart_form_filler=SimpleNamespace(get_select_options=lambda select_id: OPTIONS))
+
+def test_matching_option_keeps_the_portal_class():
+    session = session_for("4")
+    assert genesis.InfiniteGenesisAutomation.resolve_tax_class_value(session) == "4"
+    assert session.search_params["tax_class"] == "4"
+
+def test_default_option_is_what_gets_cached():
+    session = session_for("2A")
+    assert genesis.InfiniteGenesisAutomation.resolve_tax_class_value(session) == genesis.GENESIS_SEARCH_PARAMS["tax_class"]
+    assert session.search_params == genesis.GENESIS_SEARCH_PARAMS
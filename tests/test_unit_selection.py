@@ -0,0 +1,56 @@
+import math
+import random
+
+import pytest
+
+from AMI_UNIT_SELECTION_ENGINE import select_units
+
+def select_units_with_dp(units, target_sf):
+    """Line-for-line port of selectUnitsWithDP in fixed_local_gemini_ami_calculator.html"""
+    scale = 10
+    scaled_target = math.floor(target_sf * scale)
+    n = len(units)
+    max_sum = sum(math.floor(unit["sf"] * scale) for unit in units)
+    dp = [False] * (max_sum + 1)
+    dp[0] = True
+    prev = [[None] * (max_sum + 1) for _ in range(n + 1)]
+
+    for i in range(1, n + 1):
+        unit_sf = math.floor(units[i - 1]["sf"] * scale)
+        for j in range(max_sum, unit_sf - 1, -1):
+            if dp[j - unit_sf]:
+                dp[j] = True
+                prev[i][j] = j - unit_sf
+
+    min_sum = math.inf
+    for j in range(scaled_target, max_sum + 1):
+        if dp[j] and j < min_sum:
+            min_sum = j
+    if min_sum == math.inf:
+        return []
+
+    selected = []
+    current_sum = min_sum
+    for i in range(n, 0, -1):
+        if prev[i][current_sum] is not None:
+            selected.append(units[i - 1])
+            current_sum = prev[i][current_sum]
+    return selected
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_the_calculator_on_random_rent_rolls(seed):
+    rng = random.Random(seed)
+    units = [{"unit": f"{index + 1}", "sf": round(rng.uniform(350, 1400), rng.choice([0, 1, 2]))}
+             for index in range(rng.randint(1, 14))]
+    total = sum(unit["sf"] for unit in units)
+    target_sf = round(rng.uniform(0.05, 1.1) * total, 1)
+    expected = [unit["unit"] for unit in select_units_with_dp(units, target_sf)]
+    assert [unit["unit"] for unit in select_units(units, target_sf)] == expected
+
+def test_repeated_sizes_tie_break_like_the_calculator():
+    units = [{"unit": str(index), "sf": sf} for index, sf in enumerate([500, 500, 700, 500, 700, 300])]
+    for target_sf in (300, 800, 1000, 1199.9, 1700, 3200):
+        assert select_units(units, target_sf) == select_units_with_dp(units, target_sf)
+
+def test_unreachable_target_selects_nothing():
+    assert select_units([{"sf": 400}, {"sf": 500}], 901) == []